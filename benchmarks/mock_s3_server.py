@@ -0,0 +1,279 @@
+"""
+Lokaler Ersatz für die S3-Download-Server von Amazon (nur HEAD/GET-Header).
+
+Liefert 200 für die konfigurierten Firmware-Dateien und 403 für alles andere
+(wie S3 bei privaten Buckets). Der Inhalt einer Datei ist aus ihrem Namen abgeleitet,
+der ETag ist wie bei S3 (Upload in einem Stück) dessen MD5; Range-Anfragen ergeben 206. Latenz, Fehlerquote und Drosselung lassen sich
+einstellen, damit die Suchmodi offline und reproduzierbar gemessen werden können.
+Mit `listing` beantwortet der Server zusätzlich ListObjectsV2 (GET /BUCKET/?list-type=2),
+sonst wie S3 mit 403 AccessDenied.
+
+Eigenständig starten (z.B. für manuelle Tests mit dem Checker):
+    python benchmarks/mock_s3_server.py --port 8080 --latency 0.03 --existing update_kindle_scribe_5.16.8.bin
+"""
+import argparse
+import hashlib
+import random
+import re
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+from xml.sax.saxutils import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+XML_QUOTE = {'"': '&quot;'} # ETags enthalten Anführungszeichen
+
+
+class MockS3Stats:
+    """Zähler des Servers (threadsicher)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.found = 0
+        self.listings = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.dropped = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def add(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+            if name == 'in_flight':
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: value for name, value in vars(self).items() if not name.startswith('_')}
+
+
+class _MockS3Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # Keep-Alive wie bei S3
+    disable_nagle_algorithm = True # Antworten sofort senden (sonst bremst Nagle + Delayed ACK das Pipelining)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def _respond(self, send_body):
+        server = self.server
+        stats = server.stats
+        stats.add('requests')
+        stats.add('in_flight')
+        try:
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            if query.get('list-type') == ['2']:
+                stats.add('listings')
+                self._list_objects(query, send_body)
+                return
+            name = url.path.rsplit('/', 1)[-1]
+            if server.redirect_to:
+                self._send(301, send_body=False, headers={'Location': server.redirect_to + name})
+                return
+            # Zufall je (Datei, Versuch): gleiche Fehler/Latenzen unabhängig von der Reihenfolge der Anfragen
+            with server.attempts_lock:
+                attempt = server.attempts[name] = server.attempts.get(name, 0) + 1
+            rng = random.Random(f"{server.seed}/{name}/{attempt}")
+            roll = rng.random()
+            delay = server.latency + (rng.uniform(0, server.jitter) if server.jitter else 0.0)
+            over_limit = server.max_in_flight and stats.in_flight > server.max_in_flight
+            if delay > 0:
+                time.sleep(delay)
+            if over_limit or roll < server.throttle_rate:
+                stats.add('throttled')
+                self._send(503, send_body=False)
+                return
+            if roll < server.throttle_rate + server.error_rate:
+                # Hälfte der Fehler als 500, Hälfte als abgebrochene Verbindung
+                if roll < server.throttle_rate + server.error_rate / 2:
+                    stats.add('server_errors')
+                    self._send(500, send_body=False)
+                else:
+                    stats.add('dropped')
+                    self.close_connection = True
+                return
+            if name in server.existing:
+                stats.add('found')
+                self._send_file(name, send_body)
+            else:
+                self._send(403, send_body=False)
+        finally:
+            stats.add('in_flight', -1)
+
+    def _list_objects(self, query, send_body):
+        """ListObjectsV2 über die vorhandenen Dateien (Schlüssel = Dateiname), seitenweise."""
+        server = self.server
+        if not server.listing:
+            body = b'<?xml version="1.0" encoding="UTF-8"?><Error><Code>AccessDenied</Code><Message>Access Denied</Message></Error>'
+            self._send(403, send_body, body=body)
+            return
+        prefix = query.get('prefix', [''])[0]
+        page_size = min(int(query.get('max-keys', ['1000'])[0]), server.listing_page_size)
+        after = query.get('continuation-token', [''])[0]
+        keys = [key for key in sorted(server.existing) if key.startswith(prefix) and key > after]
+        page, truncated = keys[:page_size], len(keys) > page_size
+        contents = "".join(
+            f"<Contents><Key>{escape(key)}</Key><LastModified>2024-01-01T00:00:00.000Z</LastModified>"
+            f"<ETag>{escape(server.etag(key), XML_QUOTE)}</ETag><Size>{server.file_size}</Size>"
+            f"<StorageClass>STANDARD</StorageClass></Contents>"
+            for key in page
+        )
+        token = f"<NextContinuationToken>{escape(page[-1])}</NextContinuationToken>" if truncated else ""
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>bucket</Name><Prefix>{escape(prefix)}</Prefix><KeyCount>{len(page)}</KeyCount>"
+            f"<MaxKeys>{page_size}</MaxKeys><IsTruncated>{'true' if truncated else 'false'}</IsTruncated>"
+            f"{contents}{token}</ListBucketResult>"
+        ).encode('utf-8')
+        self._send(200, send_body, body=body)
+
+    def _send_file(self, name, send_body):
+        """Datei vollständig (200) oder den angefragten Bereich (Range: bytes=a-b, 206)."""
+        content = self.server.content(name)
+        match = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        if match is None:
+            self._send(200, send_body, etag=self.server.etag(name), body=content)
+            return
+        start = int(match.group(1))
+        end = min(int(match.group(2)) if match.group(2) else len(content) - 1, len(content) - 1)
+        self._send(206, send_body, etag=self.server.etag(name), body=content[start:end + 1],
+                   headers={'Content-Range': f"bytes {start}-{end}/{len(content)}"})
+
+    def _send(self, status, send_body, content_length=0, etag=None, body=None, headers=None):
+        if body is not None:
+            content_length = len(body)
+        self.send_response(status)
+        self.send_header('Content-Length', str(content_length))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', 'Mon, 01 Jan 2024 00:00:00 GMT')
+            self.send_header('Accept-Ranges', 'bytes')
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.end_headers()
+        if send_body and content_length:
+            self.wfile.write(body if body is not None else b'\0' * content_length)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _MockS3HTTPServer(ThreadingHTTPServer):
+    request_queue_size = 1024 # Kein SYN-Verlust bei vielen gleichzeitigen Verbindungen
+    daemon_threads = True
+
+    def content(self, name):
+        """Inhalt der Datei `name` (`file_size` Bytes, aus dem Namen abgeleitet)."""
+        with self.attempts_lock:
+            if name not in self.contents:
+                seed = name.encode() + b'\n'
+                self.contents[name] = (seed * (self.file_size // len(seed) + 1))[:self.file_size]
+            return self.contents[name]
+
+    def etag(self, name):
+        return self.etags.get(name) or f'"{hashlib.md5(self.content(name)).hexdigest()}"'
+
+
+class MockS3Server:
+    """
+    Startet den Mock-Server in einem Hintergrund-Thread.
+
+    existing       Menge der Dateinamen, die mit 200 beantwortet werden
+    latency        Feste Antwortzeit in Sekunden, zuzüglich gleichverteiltem `jitter`
+    error_rate     Anteil der Anfragen mit 500 oder abgebrochener Verbindung
+    throttle_rate  Anteil der Anfragen mit 503 (SlowDown)
+    max_in_flight  Mehr gleichzeitige Anfragen werden mit 503 beantwortet (0 = unbegrenzt)
+    file_size      Größe jeder Datei in Bytes
+    seed           Startwert für Latenz/Fehler, damit Läufe reproduzierbar sind
+    listing        ListObjectsV2 erlauben (sonst 403), höchstens `listing_page_size` Schlüssel pro Seite
+    etags          Feste ETags je Dateiname statt des MD5 (z.B. für Prüfsummenfehler)
+    redirect_to    Basis-URL, auf die jede Datei mit 301 umgeleitet wird (wie ein anderer S3-Endpunkt)
+    """
+
+    def __init__(self, existing=(), host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, throttle_rate=0.0, max_in_flight=0, file_size=1024, seed=0,
+                 listing=False, listing_page_size=1000, etags=None, redirect_to=None):
+        self.httpd = _MockS3HTTPServer((host, port), _MockS3Handler)
+        self.httpd.existing = set(existing)
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self.httpd.error_rate = error_rate
+        self.httpd.throttle_rate = throttle_rate
+        self.httpd.max_in_flight = max_in_flight
+        self.httpd.file_size = file_size
+        self.httpd.seed = seed
+        self.httpd.listing = listing
+        self.httpd.listing_page_size = listing_page_size
+        self.httpd.attempts = {} # Dateiname -> Anzahl Anfragen
+        self.httpd.attempts_lock = threading.Lock()
+        self.httpd.contents = {}
+        self.httpd.etags = dict(etags or {})
+        self.httpd.redirect_to = redirect_to
+        self.httpd.stats = MockS3Stats()
+        self._thread = None
+
+    @property
+    def stats(self):
+        return self.httpd.stats
+
+    def base_url(self, bucket='firmwaredownloads'):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/{bucket}/"
+
+    def reset_stats(self):
+        """Setzt Zähler und Versuchsnummern zurück (gleiche Ausgangslage für den nächsten Lauf)."""
+        self.httpd.stats = MockS3Stats()
+        with self.httpd.attempts_lock:
+            self.httpd.attempts.clear()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Mock der S3-Firmware-Downloads")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--existing', nargs='*', default=[], help="Dateinamen, die existieren (200)")
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--max-in-flight', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--listing', action='store_true', help="ListObjectsV2 erlauben")
+    args = parser.parse_args()
+    server = MockS3Server(args.existing, args.host, args.port, args.latency, args.jitter,
+                          args.error_rate, args.throttle_rate, args.max_in_flight, seed=args.seed, listing=args.listing)
+    print(f"Mock-S3 läuft unter {server.base_url()} (Strg+C beendet)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(server.stats.snapshot())
+
+
+if __name__ == '__main__':
+    main()
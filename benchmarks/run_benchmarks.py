@@ -0,0 +1,314 @@
+"""
+Reproduzierbarer Benchmark der Suchmodi gegen den lokalen Mock-S3-Server
+(benchmarks/mock_s3_server.py) - ohne eine einzige Anfrage an Amazon.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scenarios narrow,major --engines threaded,async --repeat 3
+    python benchmarks/run_benchmarks.py --json before.json
+    python benchmarks/run_benchmarks.py --baseline before.json --tolerance 0.1
+
+Jeder Lauf startet einen eigenen Prozess, damit CPU-Zeit und Speicher (max. RSS) nur den
+Checker messen; der Mock-Server läuft im aufrufenden Prozess. Gemessen werden Anfragen
+pro Sekunde, p50/p99-Latenz, CPU-Zeit und Speicher. Mit --baseline wird gegen eine
+frühere --json-Datei verglichen; ein Einbruch der Anfragen pro Sekunde um mehr als
+--tolerance ergibt Exit-Code 1.
+"""
+import argparse
+import contextlib
+import glob
+import importlib.util
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+try:
+    import resource # Nur Unix: CPU-Zeit und max. RSS des Kindprozesses
+except ImportError:
+    resource = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from mock_s3_server import MockS3Server # noqa: E402
+
+# Szenario -> Modelle und (optional) Versionsbereich; ohne Bereich gilt der Standardbereich des Modells
+SCENARIOS = {
+    'narrow': {'models': ['Scribe'], 'version_range': ((5, 16, 0), (5, 17, 25))},
+    'major': {'models': ['PW5'], 'version_range': ((5, 0, 0), (5, 99, 25))},
+    'all-models': {'models': 'all', 'version_range': None},
+}
+# Suchmodus -> Funktion für die Einzelmodell-Szenarien; neuere Modi laufen über check_firmware_batch
+SINGLE_MODEL_FUNCTIONS = {
+    'sequential': 'check_firmware_version',
+    'threaded': 'check_firmware_version_threaded',
+    'async': 'check_firmware_version_async',
+}
+
+
+def load_checker():
+    """Lädt das Checker-Skript (Dateiname mit Versionsnummer) als Modul."""
+    paths = sorted(glob.glob(os.path.join(REPO_DIR, 'kindle_checker_v*.py')))
+    if not paths:
+        raise SystemExit(f"Kein kindle_checker_v*.py in {REPO_DIR} gefunden")
+    spec = importlib.util.spec_from_file_location('kindle_checker', paths[-1])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def scenario_models(checker, scenario):
+    """Modellschlüssel und Versionsbereiche (Modell -> Bereich) eines Szenarios."""
+    models = SCENARIOS[scenario]['models']
+    model_keys = list(checker.KINDLE_MODELS) if models == 'all' else list(models)
+    ranges = {}
+    for model_key in model_keys:
+        model = checker.KINDLE_MODELS[model_key]
+        if model.get('default_version_range') and not model.get('static_version'):
+            ranges[model_key] = SCENARIOS[scenario]['version_range'] or model['default_version_range']
+    return model_keys, ranges
+
+
+def build_catalogue(checker, model_keys, ranges, hit_rate, seed):
+    """
+    Dateinamen, die der Mock-Server als vorhanden meldet: Beispiel- und statische Dateien
+    der Modelle sowie zufällig (aber reproduzierbar) gewählte Versionen aus deren Bereich,
+    teils mit einer vierten Versionsstelle.
+    """
+    rng = random.Random(seed)
+    existing = set()
+    for model_key in model_keys:
+        model = checker.KINDLE_MODELS[model_key]
+        if model.get('static_version'):
+            existing.add(model['static_version'])
+            continue
+        existing.add(model['example_filename'])
+        pattern = checker.get_filename_pattern_simple(model['example_filename'], 'en', quiet=True)
+        for major, minor, patch in checker.VersionSpace(ranges[model_key]):
+            if rng.random() < hit_rate:
+                version = f"{major}.{minor}.{patch}"
+                existing.add(pattern.replace('*', version))
+                if rng.random() < 0.3:
+                    existing.add(pattern.replace('*', f"{version}.1"))
+    return existing
+
+
+def mock_models(checker, model_keys, server):
+    """Kopie der Modelldefinitionen, deren Basis-URLs auf den Mock-Server zeigen (gleicher Bucket)."""
+    models = {}
+    for model_key in model_keys:
+        model = dict(checker.KINDLE_MODELS[model_key])
+        model['base_url'] = server.base_url(urlparse(model['base_url']).path.strip('/'))
+        models[model_key] = model
+    return models
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_child(spec):
+    """Führt einen einzelnen Lauf im Kindprozess aus und gibt das Ergebnis als Dictionary zurück."""
+    checker = load_checker()
+    latencies = []
+
+    class RecordingMetrics(checker.ProbeMetrics):
+        def finish(self, probe):
+            super().finish(probe)
+            latencies.append(probe.latency)
+
+    checker.ProbeMetrics = RecordingMetrics # SearchContext legt seine Metriken über diesen Namen an
+    settings = checker.default_settings(
+        language='en', rate_limit=0, quiet=True, # Ohne Ratenlimit: gemessen wird die Engine, nicht der Token-Bucket
+        search_mode=spec['engine'], search_strategy=spec['strategy'], timeout=spec['timeout'],
+        discovery=spec['discovery'], http_engine=spec['http_engine'],
+        max_version_depth=4, # Der Katalog enthält vierstellige Versionen unter Treffern (siehe build_catalogue)
+    )
+    if spec['concurrency']:
+        settings['max_threads'] = settings['max_concurrency'] = spec['concurrency']
+    models = spec['models']
+    ranges = {key: tuple(tuple(v) for v in value) for key, value in spec['ranges'].items()}
+    function_name = SINGLE_MODEL_FUNCTIONS.get(spec['engine'])
+
+    usage_before = resource.getrusage(resource.RUSAGE_SELF) if resource else None
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if len(models) == 1 and function_name and ranges:
+            model_key, model = next(iter(models.items()))
+            pattern = checker.get_filename_pattern_simple(model['example_filename'], 'en', quiet=True)
+            found = getattr(checker, function_name)(model['base_url'], pattern, ranges[model_key], settings,
+                                                    build_hints=checker.get_build_hints(model['example_filename']),
+                                                    anchors=checker.get_version_anchors(model['example_filename']))
+        else:
+            results = checker.check_firmware_batch(list(models), models, settings, ranges)
+            found = [name for names in results.values() for name in names]
+    elapsed = time.perf_counter() - start
+
+    result = {'elapsed': elapsed, 'probes': len(latencies), 'found': sorted(set(found))}
+    latencies.sort()
+    result['p50_ms'] = _quantile(latencies, 0.5) * 1000 if latencies else None
+    result['p99_ms'] = _quantile(latencies, 0.99) * 1000 if latencies else None
+    if usage_before is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        result['cpu_s'] = (usage.ru_utime - usage_before.ru_utime) + (usage.ru_stime - usage_before.ru_stime)
+        # ru_maxrss: KiB unter Linux, Bytes unter macOS
+        result['max_rss_mb'] = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return result
+
+
+def run_once(spec):
+    """Startet einen Kindprozess für `spec` und liest sein Ergebnis (letzte Zeile der Ausgabe)."""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', json.dumps(spec)],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Lauf {spec['scenario']}/{spec['engine']} fehlgeschlagen:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs, server_stats, expected):
+    """Fasst Wiederholungen zusammen (Median) und ergänzt Serverzähler und Trefferquote."""
+    def median(key):
+        values = [run[key] for run in runs if run.get(key) is not None]
+        return statistics.median(values) if values else None
+
+    elapsed = median('elapsed')
+    probes = runs[0]['probes']
+    return {
+        'probes': probes,
+        'found': len(runs[0]['found']),
+        'expected': len(expected),
+        'missed': sorted(expected - set(runs[0]['found'])),
+        'elapsed_s': elapsed,
+        'probes_per_s': probes / elapsed if elapsed else None,
+        'p50_ms': median('p50_ms'),
+        'p99_ms': median('p99_ms'),
+        'cpu_s': median('cpu_s'),
+        'max_rss_mb': median('max_rss_mb'),
+        'server': server_stats,
+    }
+
+
+def _fmt(value, digits=1):
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def print_table(results):
+    header = f"{'Szenario':<11} {'Modus':<10} {'Anfragen':>8} {'Treffer':>9} {'Anfr./s':>8} {'p50 ms':>7} {'p99 ms':>7} {'CPU s':>6} {'RSS MB':>7} {'503':>5}"
+    print(header)
+    print("-" * len(header))
+    for entry in results:
+        hits = f"{entry['found']}/{entry['expected']}"
+        print(f"{entry['scenario']:<11} {entry['engine']:<10} {entry['probes']:>8} {hits:>9} {_fmt(entry['probes_per_s']):>8} "
+              f"{_fmt(entry['p50_ms']):>7} {_fmt(entry['p99_ms']):>7} {_fmt(entry['cpu_s'], 2):>6} {_fmt(entry['max_rss_mb']):>7} "
+              f"{entry['server']['throttled']:>5}")
+
+
+def compare_with_baseline(results, baseline_path, tolerance):
+    """Meldet Läufe, deren Anfragen pro Sekunde um mehr als `tolerance` unter der Baseline liegen."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(entry['scenario'], entry['engine']): entry for entry in json.load(f)['results']}
+    regressions = []
+    print(f"\nVergleich mit {baseline_path}:")
+    for entry in results:
+        before = baseline.get((entry['scenario'], entry['engine']))
+        if before is None or not before.get('probes_per_s') or entry['probes_per_s'] is None:
+            continue
+        change = entry['probes_per_s'] / before['probes_per_s'] - 1
+        marker = ""
+        if change < -tolerance:
+            regressions.append(entry)
+            marker = "  <-- Regression"
+        print(f"  {entry['scenario']:<11} {entry['engine']:<10} {before['probes_per_s']:8.1f} -> {entry['probes_per_s']:8.1f} Anfr./s ({change:+.1%}){marker}")
+    return regressions
+
+
+def build_parser(checker):
+    parser = argparse.ArgumentParser(description="Benchmark der Suchmodi gegen einen lokalen Mock-S3-Server")
+    parser.add_argument('--scenarios', default=",".join(SCENARIOS), help=f"Kommagetrennt aus: {', '.join(SCENARIOS)}")
+    parser.add_argument('--engines', default=",".join(checker.SEARCH_MODES), help=f"Kommagetrennt aus: {', '.join(checker.SEARCH_MODES)}")
+    parser.add_argument('--repeat', type=int, default=1, help="Wiederholungen pro Lauf (Median)")
+    parser.add_argument('--strategy', choices=checker.SEARCH_STRATEGIES, default='full')
+    parser.add_argument('--discovery', choices=checker.DISCOVERY_MODES, default='probe',
+                        help="Standard 'probe' misst die Prüf-Engines; 'auto' mit --listing misst das Bucket-Listing")
+    parser.add_argument('--listing', action='store_true', help="Mock-Server erlaubt ListObjectsV2")
+    parser.add_argument('--http-engine', choices=checker.HTTP_ENGINES, default=checker.DEFAULT_HTTP_ENGINE,
+                        help="HTTP-Engine der sequenziellen/Thread-Suche (pipelined = HEADs im Pipelining über http.client)")
+    parser.add_argument('--concurrency', type=int, help="Threads bzw. gleichzeitige Anfragen (Standard: Checker-Standard)")
+    parser.add_argument('--timeout', type=float, default=5.0)
+    parser.add_argument('--latency', type=float, default=0.02, help="Antwortzeit des Servers in Sekunden")
+    parser.add_argument('--jitter', type=float, default=0.01, help="Zusätzliche zufällige Antwortzeit (0 bis JITTER)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Anteil 500/abgebrochener Verbindungen")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Anteil 503 SlowDown")
+    parser.add_argument('--max-in-flight', type=int, default=0, help="503 ab dieser Anzahl gleichzeitiger Anfragen (0 = aus)")
+    parser.add_argument('--hit-rate', type=float, default=0.03, help="Anteil existierender Versionen im Katalog")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='FILE', help="Ergebnisse als JSON speichern")
+    parser.add_argument('--baseline', metavar='FILE', help="Mit früherer --json-Datei vergleichen")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="Erlaubter Rückgang der Anfragen/s (Standard: 0.1 = 10%%)")
+    return parser
+
+
+def main(argv):
+    if argv[:1] == ['--child']:
+        print(json.dumps(run_child(json.loads(argv[1]))))
+        return 0
+
+    checker = load_checker()
+    parser = build_parser(checker)
+    args = parser.parse_args(argv)
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    engines = [name.strip() for name in args.engines.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS] + [name for name in engines if name not in checker.SEARCH_MODES]
+    if unknown:
+        parser.error(f"Unbekannt: {', '.join(unknown)}")
+
+    results = []
+    for scenario in scenarios:
+        model_keys, ranges = scenario_models(checker, scenario)
+        expected = build_catalogue(checker, model_keys, ranges, args.hit_rate, args.seed)
+        server = MockS3Server(expected, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              throttle_rate=args.throttle_rate, max_in_flight=args.max_in_flight, seed=args.seed,
+                              listing=args.listing)
+        with server:
+            models = mock_models(checker, model_keys, server)
+            for engine in engines:
+                spec = {
+                    'scenario': scenario, 'engine': engine, 'strategy': args.strategy, 'timeout': args.timeout,
+                    'discovery': args.discovery, 'http_engine': args.http_engine,
+                    'concurrency': args.concurrency, 'models': models, 'ranges': ranges,
+                }
+                runs = []
+                for _ in range(max(1, args.repeat)):
+                    server.reset_stats()
+                    runs.append(run_once(spec))
+                entry = summarize(runs, server.stats.snapshot(), expected)
+                entry.update(scenario=scenario, engine=engine)
+                results.append(entry)
+                print(f"{scenario}/{engine}: {_fmt(entry['probes_per_s'])} Anfr./s, {entry['found']}/{entry['expected']} Treffer", file=sys.stderr)
+
+    print()
+    print_table(results)
+    for entry in results:
+        if entry['missed']:
+            print(f"\n{entry['scenario']}/{entry['engine']}: nicht gefunden: {', '.join(entry['missed'])}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0],
+                       'options': vars(args), 'results': results}, f, indent=2)
+    if args.baseline:
+        return 1 if compare_with_baseline(results, args.baseline, args.tolerance) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
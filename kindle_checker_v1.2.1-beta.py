@@ -1,20 +1,125 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import random
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import asyncio
+import sqlite3
+import argparse
+import json
+import csv
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from bisect import bisect_left
 import sys
 import math # Hinzugefügt für genauere Fortschrittsberechnung
 import re
 import os # Für os.path.splitext in get_filename_pattern
+import socket
+import subprocess
+import tempfile
+import shutil
+import hashlib
+import heapq
+import itertools
+import http.client
+from urllib.parse import urljoin, urlsplit
+from xml.etree import ElementTree
 from packaging import version as pkg_version # Für robusten Versionsvergleich
+try:
+    import httpx # Optional: nur für den asyncio-Suchmodus benötigt (HTTP/2 zusätzlich mit 'h2')
+except ImportError:
+    httpx = None
 
 # --- Konstanten ---
 DEFAULT_TIMEOUT = 10
 DEFAULT_MAX_THREADS = 5
-DEFAULT_DELAY_PROBABILITY = 0.1
-DEFAULT_DELAYS = [0.5, 1.0, 1.5, 2.0, 2.5]
 DEFAULT_VERBOSE = False
 DEFAULT_LANGUAGE = 'de' # Standardmäßig Deutsch
+DEFAULT_POOL_SIZE = 4 # Verbindungen pro Host und Session
+DEFAULT_HTTP_RETRIES = 2 # Wiederholungen bei Verbindungsfehlern (HTTPAdapter)
+DEFAULT_SEARCH_MODE = 'threaded' # 'sequential', 'threaded' oder 'async'
+DEFAULT_MAX_CONCURRENCY = 200 # Gleichzeitige Anfragen im asyncio-Modus
+DEFAULT_USE_HTTP2 = False
+SEARCH_MODES = ('sequential', 'threaded', 'async')
+DEFAULT_HTTP_ENGINE = 'requests' # 'requests' oder 'pipelined' (schlanke HEADs über http.client, nur sequenziell/Threads)
+HTTP_ENGINES = ('requests', 'pipelined')
+DEFAULT_PIPELINE_CONNECTIONS = 4 # Persistente Verbindungen der Pipelining-Engine im Thread-Modus (sequenziell: 1)
+DEFAULT_PIPELINE_DEPTH = 16 # HEAD-Anfragen, die pro Verbindung gesendet werden, bevor die Antworten gelesen werden
+PIPELINE_RETRIES = 1 # Erneute Sendungen einer Anfrage, an der eine Pipelining-Verbindung abgebrochen ist
+PIPELINE_MAX_REDIRECTS = 10 # Verfolgte Weiterleitungen pro URL in der Pipelining-Engine
+PIPELINE_HEADERS = {b'content-length': 'Content-Length', b'etag': 'ETag', b'last-modified': 'Last-Modified', b'location': 'Location', b'connection': 'Connection'}
+MAX_MINOR = 99 # Höchste geprüfte Minor-Version innerhalb einer Major-Version
+MAX_PATCH = 25 # Höchste geprüfte Patch-Version innerhalb einer Minor-Version
+THREAD_QUEUE_FACTOR = 2 # Offene Anfragen pro Thread (begrenztes Fenster im Thread-Modus)
+PROGRESS_INTERVAL = 0.1 # Sekunden zwischen zwei Aktualisierungen der Fortschrittsanzeige (10 Hz)
+PROGRESS_RATE_WINDOW = 5.0 # Zeitfenster in Sekunden für Rate und Restzeit der Fortschrittsanzeige
+DEFAULT_SEARCH_STRATEGY = 'full' # 'full' (vollständiges Raster), 'pruned' (ausgedünnt) oder 'likely' (wahrscheinlichste zuerst)
+SEARCH_STRATEGIES = ('full', 'pruned', 'likely')
+LIKELY_MINOR_WEIGHT = 1.5 # Strategie 'likely': Gewicht einer Minor Abstand gegenüber einem Patch
+LIKELY_MAJOR_WEIGHT = 10.0 # Strategie 'likely': Gewicht einer Major Abstand
+LIKELY_BUILD_WEIGHT = 8.0 # Strategie 'likely': Bewertung je Schritt einer zusätzlichen Versionsstelle (.0 = 3, .1 = 6, ...)
+DEFAULT_PROBE_BUDGET = 0 # Max. Kandidaten pro Modell und Suche (0 = unbegrenzt)
+DEFAULT_TIME_BUDGET = 0 # Sekunden, nach denen keine neuen Kandidaten mehr geprüft werden (0 = unbegrenzt)
+DEFAULT_DISCOVERY = 'auto' # 'auto' (erst Bucket-Listing, sonst Raten per HEAD) oder 'probe' (nur Raten)
+DISCOVERY_MODES = ('auto', 'probe')
+LISTING_PAGE_SIZE = 1000 # Schlüssel pro ListObjectsV2-Seite (S3-Maximum)
+DEFAULT_PRUNE_PROBE_PATCHES = 4 # Pro Minor zuerst nur Patch .0 - .3 prüfen
+DEFAULT_PRUNE_MAX_MISSES = 4 # Fehlende Patches in Folge nach dem letzten Treffer
+DEFAULT_PRUNE_MAX_EMPTY_MINORS = 3 # Leere Minors in Folge, nach denen die Major beendet wird
+DEFAULT_MAX_VERSION_DEPTH = 3 # Versionsstellen, bis zu denen Treffer aufgeklappt werden (4 für 5.6.1.1; Build-Hinweise immer)
+DEFAULT_MAX_BUILD = 9 # Höchster Wert einer zusätzlichen Versionsstelle (.0 - .9)
+DEFAULT_CACHE_FILE = None # Pfad zur SQLite-Datei des Ergebnis-Caches (None = deaktiviert)
+DEFAULT_CACHE_HIT_TTL = 30 * 24 * 3600 # Gültigkeit gefundener Dateien in Sekunden
+DEFAULT_CACHE_MISS_TTL = 3 * 24 * 3600 # Gültigkeit von 403/404-Antworten in Sekunden
+DEFAULT_REVALIDATE = False # Gecachte Treffer immer per bedingter Anfrage (If-None-Match) bestätigen
+DEFAULT_RATE_LIMIT = 20 # Max. Anfragen pro Sekunde über alle Worker (0 = unbegrenzt); entspricht den früheren zufälligen Pausen (10 % × Ø 1,5 s) bei 5 Threads und ~0,1 s Antwortzeit
+DEFAULT_RATE_BURST = 0 # Größe des Token-Buckets (0 = Anfragen einer Sekunde)
+DEFAULT_ADAPTIVE_CONCURRENCY = True # Parallelität anhand von Latenz und Drosselung regeln (AIMD)
+ADAPTIVE_INITIAL_CONCURRENCY = 16 # Startwert des Reglers (höchstens das eingestellte Maximum)
+DEFAULT_THROTTLE_RETRIES = 5 # Wiederholungen pro URL bei 429/503 (SlowDown), danach zählt die Antwort
+THROTTLE_STATUSES = (429, 503) # Antworten, mit denen S3 drosselt
+MISS_STATUSES = (403, 404) # Endgültige Fehlanzeigen von S3 (403 ohne Listing-Recht), nur diese werden gecacht
+TIMEOUT_STATUSES = (408,) # Request Timeout: vorübergehend, wird wie ein Timeout wiederholt
+ERROR_RETRY_LIMITS = { # Wiederholungen pro Fehlerklasse, bevor eine URL als ungeklärt gilt
+    'dns': 2, # Namensauflösung fehlgeschlagen
+    'connect': 3, # Verbindungsaufbau/-abbruch
+    'timeout': 3, # Lese-/Schreib-Timeout
+    'server': 3, # 5xx (außer Drosselung)
+    'other': 1, # Unerwartete Fehler
+}
+DNS_ERROR_MARKERS = ('NameResolutionError', 'getaddrinfo', 'Name or service not known', 'nodename nor servname', 'Temporary failure in name resolution')
+DEFAULT_CHECKPOINT_FILE = None # SQLite-Datei zum Fortsetzen abgebrochener Suchen, None = aus
+DEFAULT_OUTPUT_FILE = None # Ergebnisdatei (JSONL/CSV) für jede Prüfung, None = aus
+OUTPUT_FORMATS = ('jsonl', 'csv')
+DEFAULT_METRICS_LISTEN = None # [HOST:]PORT für den Prometheus-Endpunkt /metrics, None = aus
+DEFAULT_METRICS_FILE = None # Datei für den periodischen Metrik-Export (Prometheus-Textformat), None = aus
+DEFAULT_METRICS_INTERVAL = 10.0 # Sekunden zwischen zwei Exporten in die Metrik-Datei
+SHARD_MINORS = 4 # Minor-Versionen pro Shard der verteilten Suche
+SHARD_LEASE_SECONDS = 600 # Nach dieser Zeit ohne Abschluss oder Fortschritt wird ein Shard erneut vergeben
+SHARD_RENEW_SECONDS = 60 # Worker verlängern den Lease ihres Shards bei Fortschritt höchstens so oft
+SHARD_POLL_SECONDS = 1.0 # Wartezeit, wenn gerade kein Shard frei ist
+SHARD_LOCAL_SETTINGS = ('cache_file', 'checkpoint_file', 'resume', 'output_file', 'metrics_listen', 'metrics_file', 'download_dir') # Nicht an Worker weitergegeben
+DISTRIBUTED_UNSUPPORTED_SETTINGS = {'cache_file': '--cache', 'checkpoint_file': '--checkpoint', 'output_file': '--output',
+                                    'metrics_listen': '--metrics-listen', 'metrics_file': '--metrics-file'} # Verteilt abgelehnt (Einstellung -> Option)
+DEFAULT_WATCH_STATE_FILE = 'kindle_watch_state.json' # Zuletzt bekannte Versionen des Watch-Modus
+DEFAULT_WATCH_INTERVAL = 600 # Sekunden zwischen zwei Prüfrunden im Watch-Modus
+WATCH_PATCHES = 5 # Geprüfte Patches oberhalb der neuesten Version bzw. ab .0 in neuen Minors/Majors
+WATCH_MINORS = 2 # Geprüfte Minor-Versionen oberhalb der neuesten Version
+WATCH_LOCAL_SETTINGS = ('cache_file', 'checkpoint_file', 'output_file') # Im Watch-Modus ungenutzt (Cache würde neue Dateien verdecken)
+LATEST_TOLERANCE = 4 # Neueste Version: direkt geprüfte Lücke bzw. geprüfte Patches (.0 - .3) je Minor
+LATEST_GAP_PROBES = 12 # Neueste Version: Anfragen, um Lücken zwischen den exponentiellen Sprüngen aufzufüllen
+LATEST_LOCAL_SETTINGS = ('cache_file', 'checkpoint_file') # Bei der Suche nach der neuesten Version ungenutzt (gecachte 403 würden neue Dateien verdecken)
+DEFAULT_DOWNLOAD_DIR = None # Zielverzeichnis für gefundene Firmware, None = kein Download
+DEFAULT_DOWNLOAD_CONNECTIONS = 4 # Gleichzeitige Range-Anfragen über alle Dateien
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024 # Größe eines Range-Abschnitts in Bytes
+DEFAULT_DOWNLOAD_BANDWIDTH = 0 # Max. Bytes pro Sekunde über alle Verbindungen (0 = unbegrenzt)
+DOWNLOAD_BLOCK_SIZE = 64 * 1024 # Block beim Streamen und Prüfsummen-Berechnen
+DOWNLOAD_CHUNK_RETRIES = 3 # Wiederholungen pro Abschnitt nach Abbruch oder Fehler
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0) # Obergrenzen in Sekunden
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 
 # --- Übersetzungen ---
 TRANSLATIONS = {
@@ -31,32 +136,98 @@ TRANSLATIONS = {
         'script_exiting': "Skript wird beendet.",
         # Einstellungen
         'settings_menu_title': "--- Einstellungen ---",
-        'setting_option_1': "1. Mögliche Verzögerungszeiten (aktuell: {})",
-        'setting_option_2': "2. Wahrscheinlichkeit für Verzögerung (aktuell: {:.1f}%)",
-        'setting_option_3': "3. Multithreading verwenden (aktuell: {})",
+        'setting_option_1': "1. Ratenlimit in Anfragen/s (aktuell: {})",
+        'setting_option_2': "2. Größe des Token-Buckets (aktuell: {})",
+        'setting_option_3': "3. Suchmodus (aktuell: {})",
         'setting_option_4_on': "4. Maximale Threads (aktuell: {})",
-        'setting_option_4_off': "4. Maximale Threads (N/A - Multithreading deaktiviert)",
+        'setting_option_4_async': "4. Maximale gleichzeitige Anfragen (aktuell: {})",
+        'setting_option_4_off': "4. Maximale Threads (N/A - sequenzielle Suche)",
         'setting_option_5': "5. Timeout für Anfragen (aktuell: {}s)",
         'setting_option_6': "6. Ausführliche Ausgabe (Verbose) (aktuell: {})",
-        'setting_option_7': "7. Zurück zum Hauptmenü",
+        'setting_option_7': "7. Verbindungen pro Session (Pool-Größe) (aktuell: {})",
+        'setting_option_8': "8. HTTP-Wiederholungen bei Verbindungsfehlern (aktuell: {})",
+        'setting_option_9': "9. HTTP/2 verwenden (nur asyncio) (aktuell: {})",
+        'setting_option_10': "10. Suchstrategie (aktuell: {})",
+        'setting_option_11': "11. Ergebnis-Cache (aktuell: {})",
+        'setting_option_12': "12. Ergebnisdatei (JSONL/CSV, aktuell: {})",
+        'setting_option_13': "13. Checkpoint-Datei zum Fortsetzen (aktuell: {})",
+        'setting_option_14': "14. Adaptive Parallelität (bei Drosselung reduzieren) (aktuell: {})",
+        'setting_option_15': "15. Zurück zum Hauptmenü",
         'prompt_select_setting': "Wähle eine Option zum Ändern: ",
-        'prompt_enter_delays': "Gib die Verzögerungszeiten durch Komma getrennt ein (z.B. 0.5,1.0,2.0): ",
         'error_invalid_delays_format': "Ungültige Eingabe: {}. Einstellungen nicht geändert.",
-        'error_delays_must_be_positive': "Alle Verzögerungszeiten müssen >= 0 sein.",
-        'setting_delays_set': "Verzögerungszeiten gesetzt auf: {}",
-        'prompt_enter_delay_probability': "Gib die Wahrscheinlichkeit für eine Verzögerung zwischen 0 und 1 ein (z.B. 0.1 für 10%): ",
-        'error_probability_range': "Wahrscheinlichkeit muss zwischen 0 und 1 liegen.",
-        'setting_probability_set': "Wahrscheinlichkeit gesetzt auf: {:.1f}%",
-        'prompt_use_threads': "Sollen Threads verwendet werden? (ja/nein): ",
-        'setting_threads_enabled': "Multithreading aktiviert.",
-        'setting_threads_disabled': "Multithreading deaktiviert.",
-        'setting_threads_not_relevant': "Einstellung nur relevant, wenn Multithreading aktiviert ist.",
+        'prompt_enter_rate_burst': "Gib die Größe des Token-Buckets ein (0 = Anfragen einer Sekunde; aktuell: {}): ",
+        'setting_rate_burst_set': "Größe des Token-Buckets gesetzt auf: {}",
+        'error_rate_burst_negative': "Die Größe des Token-Buckets darf nicht negativ sein.",
+        'rate_burst_default': "Anfragen einer Sekunde",
+        'prompt_select_search_mode': "Wähle den Suchmodus (1 = sequenziell, 2 = parallel mit Threads, 3 = asyncio): ",
+        'setting_search_mode_set': "Suchmodus gesetzt auf: {}",
+        'mode_sequential': "sequenziell",
+        'mode_threaded': "parallel (Threads)",
+        'mode_async': "asyncio",
+        'setting_threads_not_relevant': "Einstellung nicht relevant für die sequenzielle Suche.",
+        'prompt_enter_max_concurrency': "Gib die maximale Anzahl gleichzeitiger Anfragen ein (aktuell: {}): ",
+        'error_concurrency_must_be_positive': "Anzahl gleichzeitiger Anfragen muss positiv sein.",
+        'setting_max_concurrency_set': "Maximale gleichzeitige Anfragen gesetzt auf: {}",
+        'prompt_use_http2': "Soll HTTP/2 verwendet werden? (ja/nein): ",
+        'prompt_use_adaptive': "Soll die Parallelität adaptiv geregelt werden? (ja/nein): ",
+        'setting_adaptive_enabled': "Adaptive Parallelität aktiviert (Threads/gleichzeitige Anfragen sind die Obergrenze).",
+        'setting_adaptive_disabled': "Adaptive Parallelität deaktiviert.",
+        'setting_http2_enabled': "HTTP/2 aktiviert.",
+        'setting_http2_disabled': "HTTP/2 deaktiviert.",
+        'prompt_select_search_strategy': "Wähle die Suchstrategie (1 = vollständig, 2 = ausgedünnt, 3 = wahrscheinlichste zuerst): ",
+        'setting_search_strategy_set': "Suchstrategie gesetzt auf: {}",
+        'strategy_full': "vollständig",
+        'strategy_pruned': "ausgedünnt (bricht nach fehlenden Patches/Minors ab)",
+        'strategy_likely': "wahrscheinlichste zuerst (nahe bekannter Versionen und Treffer)",
+        'budget_exhausted': "Budget aufgebraucht nach {} Kandidaten - Suche endet mit den bisherigen Treffern.",
+        'prompt_enter_cache_file': "Gib den Pfad der Cache-Datei ein (leer = Cache deaktivieren): ",
+        'setting_cache_enabled': "Ergebnis-Cache aktiviert: {}",
+        'setting_cache_disabled': "Ergebnis-Cache deaktiviert.",
+        'cache_disabled': "deaktiviert",
+        'prompt_enter_output_file': "Gib den Pfad der Ergebnisdatei ein (.csv = CSV, sonst JSON Lines; leer = deaktivieren): ",
+        'setting_output_enabled': "Ergebnisdatei aktiviert: {} ({})",
+        'setting_output_disabled': "Ergebnisdatei deaktiviert.",
+        'prompt_enter_checkpoint_file': "Gib den Pfad der Checkpoint-Datei ein (abgebrochene Suchen werden fortgesetzt; leer = deaktivieren): ",
+        'setting_checkpoint_enabled': "Checkpoint aktiviert: {}",
+        'setting_checkpoint_disabled': "Checkpoint deaktiviert.",
         'prompt_enter_max_threads': "Gib die maximale Anzahl an Threads ein (aktuell: {}): ",
         'error_threads_must_be_positive': "Anzahl der Threads muss positiv sein.",
         'setting_max_threads_set': "Maximale Threads gesetzt auf: {}",
         'prompt_enter_timeout': "Gib den Timeout-Wert in Sekunden ein (aktuell: {}): ",
         'error_timeout_must_be_positive': "Timeout muss positiv sein.",
         'setting_timeout_set': "Timeout gesetzt auf: {}s",
+        'prompt_enter_rate_limit': "Gib das Limit in Anfragen pro Sekunde ein (0 = unbegrenzt; aktuell: {}): ",
+        'setting_rate_limit_set': "Ratenlimit gesetzt auf: {}",
+        'error_rate_limit_negative': "Das Ratenlimit darf nicht negativ sein.",
+        'error_metrics_interval_positive': "Das Metrik-Intervall muss größer als 0 sein.",
+        'error_workers_negative': "Die Anzahl der Worker darf nicht negativ sein.",
+        'error_no_workers': "Ohne lokale Worker (--workers 0) wird --serve-queue benötigt.",
+        'error_distributed_unsupported': "Im verteilten Modus nicht unterstützt: {} (die Worker führen keinen gemeinsamen Ergebniscache, keine Ergebnisdatei und keine Metriken; die Warteschlange ist der Checkpoint).",
+        'distributed_started': "Verteilte Suche: {} Shards, {} lokale Worker.",
+        'distributed_resuming': "Setze verteilte Suche aus {} fort.",
+        'distributed_serving': "Warteschlange für entfernte Worker unter http://{}:{} (Worker: --worker http://HOST:PORT)",
+        'distributed_progress': "\rShards erledigt: {}/{} | Gefunden: {}",
+        'error_watch_interval_positive': "Das Watch-Intervall muss größer als 0 sein.",
+        'watch_started': "Überwache {} alle {} s auf neue Firmware (Stand: {}, Strg+C beendet).",
+        'watch_new_firmware': "[{}] Neue Firmware für {}: {}",
+        'watch_no_baseline': "Warnung: Für {} wurde keine Firmware gefunden - keine Ausgangsversion, Modell wird nicht überwacht.",
+        'watch_webhook_failed': "Warnung: Benachrichtigung an {} fehlgeschlagen: {}",
+        'watch_stopped': "Überwachung beendet.",
+        'listing_used': "Bucket-Listing: {} passende Datei(en) in {} Seite(n) von {} - Raten entfällt.",
+        'listing_page': "Bucket-Listing Seite {}: {} Schlüssel ({:.0f} ms)",
+        'download_complete': "Heruntergeladen: {} ({}, SHA-256 {})",
+        'download_failed': "Download von {} fehlgeschlagen: {}",
+        'download_checksum_mismatch': "Prüfsumme stimmt nicht (MD5 {} statt {} laut ETag)",
+        'download_summary': "Download: {} Datei(en), {} in {:.1f} s ({}/s).",
+        'download_model_files': "Downloads für {}:",
+        'error_invalid_size': "Ungültige Größe: {} (z.B. 500K, 10M, 1G)",
+        'rate_limit_off': "unbegrenzt",
+        'prompt_enter_pool_size': "Gib die Pool-Größe (Verbindungen pro Host und Session) ein (aktuell: {}): ",
+        'error_pool_size_must_be_positive': "Pool-Größe muss positiv sein.",
+        'setting_pool_size_set': "Pool-Größe gesetzt auf: {}",
+        'prompt_enter_http_retries': "Gib die Anzahl der HTTP-Wiederholungen ein (aktuell: {}): ",
+        'error_retries_must_be_non_negative': "Anzahl der Wiederholungen darf nicht negativ sein.",
+        'setting_http_retries_set': "HTTP-Wiederholungen gesetzt auf: {}",
         'prompt_use_verbose': "Soll die Ausgabe ausführlich sein? (ja/nein): ",
         'setting_verbose_enabled': "Ausführliche Ausgabe aktiviert.",
         'setting_verbose_disabled': "Ausführliche Ausgabe deaktiviert.",
@@ -70,7 +241,7 @@ TRANSLATIONS = {
         'language_set_to': "Sprache auf {} gesetzt.",
         # Modellauswahl & Suche
         'available_models_title': "--- Verfügbare Kindle-Modelle ---",
-        'prompt_enter_model': "Gib die Kindle-Modellbezeichnung ein (z.B. PW5) oder 'exit' zum Abbrechen: ",
+        'prompt_enter_model': "Gib die Kindle-Modellbezeichnung ein (z.B. PW5), mehrere durch Komma getrennt, 'all' für alle Modelle oder 'exit' zum Abbrechen: ",
         'error_model_invalid': "Ungültige Kindle-Modellbezeichnung. Bitte gib eine der unterstützten Bezeichnungen ein oder 'exit'.",
         'error_no_base_url': "Fehler: Keine Basis-URL für Modell {} definiert.",
         'searching_static_title': "\n--- Suche nach statischer Firmware für {} ---",
@@ -93,21 +264,109 @@ TRANSLATIONS = {
         'search_summary_range': "Bereich: {} bis {}",
         'search_summary_threads': "Threads: {} (Max: {})",
         'search_summary_threads_no': "Threads: Nein",
+        'search_summary_async': "Modus: asyncio (max. {} gleichzeitige Anfragen, {})",
         'search_summary_timeout': "Timeout: {}s",
-        'search_summary_delay': "Verzögerung: {}s (Wahrscheinlichkeit: {:.1f}%)",
+        'search_summary_rate_limit': "Ratenlimit: {} Anfragen/s",
         'search_summary_verbose': "Ausführlich: {}",
+        'search_summary_strategy': "Strategie: {} (max. {} Anfragen)",
+        'search_summary_build_hints': "Weitere Versionsstellen (bis {} Stellen) unter Treffern und: {}",
+        'search_summary_build_hints_only': "Weitere Versionsstellen nur unter: {}",
         'starting_sequential_search': "Starte sequenzielle Suche ({} Versionen)...",
         'starting_threaded_search': "Starte parallele Suche ({} Versionen mit max. {} Threads)...",
+        'starting_async_search': "Starte asynchrone Suche ({} Versionen mit max. {} gleichzeitigen Anfragen, {})...",
         'no_versions_to_check': "Keine Versionen im angegebenen Bereich zu prüfen.",
         'error_invalid_pattern': "\nFehler: Ungültiges Dateinamenmuster '{}'. Überspringe Version {}.",
-        'progress_update': "\rFortschritt: {}/{} ({:.2f}%) [{} gefunden]",
+        'progress_update': "Fortschritt: {}/{} ({:.2f}%) [{} gefunden] {:.1f}/s, Rest {}",
         'sequential_search_complete': "\nSequenzielle Suche abgeschlossen.",
         'threaded_search_complete': "\nParallele Suche abgeschlossen.",
+        'async_search_complete': "\nAsynchrone Suche abgeschlossen.",
+        'warning_async_unavailable': "Warnung: Für den asyncio-Modus wird 'httpx' benötigt (pip install httpx). Verwende parallele Suche mit Threads.",
+        'warning_http2_unavailable': "Warnung: Für HTTP/2 wird 'h2' benötigt (pip install httpx[http2]). Verwende HTTP/1.1.",
         'search_aborted_by_user': "\nSuche durch Benutzer abgebrochen.",
         'error_unexpected_search': "\nUnerwarteter Fehler während der Suche: {}",
         'firmware_found_count': "\nFolgende {} Firmware-Dateien wurden gefunden (sortiert):",
         'firmware_none_found': "\nKeine passenden Firmware-Dateien im angegebenen Versionsbereich gefunden.",
         'search_duration': "\nSuche dauerte {:.2f} Sekunden.",
+        'pruning_summary': "Geprüft: {} von {} möglichen Versionen ({} eingespart, {:.1f}%).",
+        'cache_summary': "Aus dem Cache beantwortet: {} von {} Prüfungen ({}).",
+        'output_summary': "Ergebnisdatei: {} Datensätze geschrieben ({}).",
+        'concurrency_summary': "Adaptive Parallelität: zuletzt {}, höchstens {} von max. {} ({} Mal reduziert).",
+        'throttle_summary': "Gedrosselte Antworten (429/503): {}.",
+        'retry_summary': "Wiederholte Anfragen nach Drosselung oder Fehlern: {}.",
+        'metrics_summary': "Durchsatz: {:.1f} Anfragen/s ({} Anfragen in {:.1f} s), max. {} gleichzeitig.",
+        'metrics_latency_summary': "Latenz {}: p50 {} / p95 {} / p99 {} / max {} ms ({} Messungen).",
+        'metrics_status_summary': "Antworten nach Status: {}",
+        'metrics_errors_summary': "Fehler nach Klasse: {}",
+        'metrics_export_summary': "Metriken: {}",
+        'warning_metrics_unavailable': "WARNUNG: Metrik-Endpunkt '{}' konnte nicht gestartet werden ({}).",
+        'unresolved_summary': "WARNUNG: {} URL(s) blieben trotz Wiederholungen ohne endgültige Antwort (nicht als 'nicht gefunden' gewertet):",
+        'unresolved_model_count': "Ungeklärt für {} ({} URL(s), erneut prüfen):",
+        'changed_summary': "HINWEIS: {} bekannte Datei(en) wurden seit der letzten Prüfung ersetzt:",
+        'changed_model_count': "Ersetzt für {} ({} Datei(en) seit der letzten Prüfung geändert):",
+        'checkpoint_resuming': "Setze Suche fort: {} Ergebnisse aus dem Checkpoint ({}).",
+        'checkpoint_summary': "Aus dem Checkpoint übernommen: {} von {} Prüfungen.",
+        'checkpoint_saved': "\nFortschritt gespeichert in {} (fortsetzen mit derselben Checkpoint-Datei bzw. --resume).",
+        'warning_checkpoint_mismatch': "Warnung: Der Checkpoint {} stammt von einer anderen Suche; nur passende URLs werden übernommen.",
+        'batch_summary_title': "\nBatch-Suche für: {}",
+        'starting_batch_search': "Starte Batch-Suche für {} Modelle ({} Versionen, Modus: {})...",
+        'batch_search_complete': "\nBatch-Suche abgeschlossen.",
+        'batch_summary': "Kandidaten: {}, davon geprüft: {} ({} doppelte URLs zusammengelegt).",
+        'batch_model_found_count': "\n{}: {} Firmware-Dateien gefunden (sortiert):",
+        'batch_model_none_found': "\n{}: Keine passenden Firmware-Dateien gefunden.",
+        # Kommandozeile
+        'cli_description': "Prüft, welche Kindle-Firmware-Dateien auf Amazons Download-Servern existieren. Ohne Argumente startet das interaktive Menü.",
+        'cli_help_model': "Modell(e): z.B. PW5, eine kommagetrennte Liste (PW5,PW5SE) oder 'all'",
+        'cli_help_start': "Startversion (M.m.p), Standard: Bereich des Modells",
+        'cli_help_end': "Endversion (M.m.p), Standard: Bereich des Modells",
+        'cli_help_mode': "Suchmodus (Standard: {})",
+        'cli_help_concurrency': "Max. Threads bzw. gleichzeitige Anfragen (asyncio)",
+        'cli_help_timeout': "Timeout pro Anfrage in Sekunden (Standard: {})",
+        'cli_help_strategy': "Suchstrategie (Standard: {})",
+        'cli_help_budget': "Höchstens N Kandidaten pro Modell prüfen (0 = unbegrenzt; sinnvoll mit --strategy likely)",
+        'cli_help_deadline': "Nach SECONDS Sekunden keine neuen Kandidaten mehr prüfen (0 = unbegrenzt)",
+        'cli_help_max_depth': "Unter Treffern weitere Versionsstellen bis N Stellen prüfen, je .0 - .9 (Standard: 3 = nur unter Build-Hinweisen)",
+        'error_max_depth_min': "--max-depth muss mindestens 3 sein.",
+        'cli_help_discovery': "auto = zuerst den Bucket auflisten (ListObjectsV2), nur bei Verweigerung raten; probe = immer raten (Standard: {})",
+        'cli_help_cache': "SQLite-Datei für den Ergebnis-Cache",
+        'cli_help_revalidate': "Gecachte Treffer per bedingter Anfrage (ETag/Last-Modified) bestätigen und ersetzte Dateien melden",
+        'cli_help_download': "Gefundene Dateien nach der Suche in dieses Verzeichnis herunterladen",
+        'cli_help_download_connections': "Gleichzeitige Range-Anfragen beim Download (Standard: {})",
+        'cli_help_download_limit': "Download-Bandbreite begrenzen, Bytes pro Sekunde (z.B. 5M)",
+        'cli_help_chunk_size': "Größe der Download-Abschnitte (Standard: 8M)",
+        'cli_help_no_adaptive': "Feste Parallelität statt adaptiver Regelung",
+        'cli_help_throttle_retries': "Wiederholungen pro URL bei Drosselung (429/503) (Standard: {})",
+        'cli_help_rate_limit': "Max. Anfragen pro Sekunde über alle Worker (Standard: 20, 0 = unbegrenzt)",
+        'cli_help_burst': "Größe des Token-Buckets (Standard: Anfragen einer Sekunde)",
+        'cli_help_http2': "HTTP/2 im asyncio-Modus verwenden",
+        'cli_help_engine': "HTTP-Engine der sequenziellen/Thread-Suche: requests oder pipelined (HEADs im Pipelining über wenige persistente Verbindungen, Standard: {})",
+        'cli_help_pipeline_depth': "Anfragen pro Verbindung und Durchgang der Engine pipelined (Standard: {})",
+        'cli_help_format': "Ausgabeformat (Standard: text)",
+        'cli_help_language': "Sprache der Ausgabe",
+        'cli_help_list_models': "Unterstützte Modelle auflisten und beenden",
+        'cli_help_checkpoint': "Fortschritt regelmäßig in dieser SQLite-Datei sichern (wird nach vollständiger Suche gelöscht)",
+        'cli_help_resume': "Suche aus der Checkpoint-Datei fortsetzen statt neu zu beginnen",
+        'cli_error_resume_requires_checkpoint': "--resume benötigt --checkpoint FILE.",
+        'cli_help_output': "Jede Prüfung als Datensatz in diese Datei schreiben (wird angehängt)",
+        'cli_help_output_format': "Format der Ergebnisdatei (Standard: anhand der Endung, .csv = CSV, sonst JSON Lines)",
+        'cli_help_metrics_listen': "Prometheus-Endpunkt /metrics während der Suche bereitstellen (Standard-Host 127.0.0.1)",
+        'cli_help_metrics_file': "Metriken periodisch im Prometheus-Textformat in diese Datei schreiben",
+        'cli_help_metrics_interval': "Sekunden zwischen zwei Exporten in die Metrik-Datei (Standard: {})",
+        'cli_error_model_required': "--model ist erforderlich (oder --list-models).",
+        'cli_help_workers': "Suche in N lokale Worker-Prozesse aufteilen (verteilte Suche)",
+        'cli_help_queue': "SQLite-Datei der Shard-Warteschlange der verteilten Suche (erlaubt Fortsetzen)",
+        'cli_help_serve_queue': "Warteschlange per HTTP für Worker auf anderen Rechnern bereitstellen",
+        'cli_help_worker': "Als Worker Shards aus QUEUE (Datei oder http://HOST:PORT) abarbeiten",
+        'cli_help_watch': "Dauerhaft nur oberhalb der neuesten bekannten Version nach neuer Firmware suchen",
+        'cli_help_latest': "Nur die neueste Firmware je Modell ermitteln (Galopp-/Binärsuche, etwa hundert statt tausender Anfragen)",
+        'latest_model_found': "{}: {} ({} Anfragen statt {})",
+        'latest_model_none_found': "{}: Keine Firmware gefunden ({} Anfragen).",
+        'latest_lower_bound': "  (Untergrenze: per Raten ermittelt; Versionen nur mit Build-Nummer oder hinter größeren Lücken werden nicht erkannt)",
+        'cli_help_watch_interval': "Sekunden zwischen zwei Prüfrunden im Watch-Modus (Standard: {})",
+        'cli_help_watch_state': "JSON-Datei mit den zuletzt bekannten Versionen (Standard: {})",
+        'cli_help_watch_cycles': "Watch-Modus nach N Prüfrunden beenden (z.B. 1 für Cron-Jobs)",
+        'cli_help_webhook': "Neue Firmware per POST (JSON) an diese URL melden",
+        'cli_help_exit_on_new': "Watch-Modus nach der ersten Runde mit neuer Firmware beenden (Exit-Code 4)",
+        'cli_error_model_invalid': "Unbekanntes Modell: {}",
         'error_incomplete_config': "Fehler: Unvollständige Konfiguration für Modell {} (fehlende 'static_version' oder 'example_filename'/'default_version_range').",
         'derived_pattern_regex': "Abgeleitetes Muster (Regex): {}",
         'derived_pattern_fallback': "Abgeleitetes Muster (Fallback '_'): {}",
@@ -136,32 +395,98 @@ TRANSLATIONS = {
         'script_exiting': "Exiting script.",
         # Einstellungen
         'settings_menu_title': "--- Settings ---",
-        'setting_option_1': "1. Possible delay times (current: {})",
-        'setting_option_2': "2. Probability for delay (current: {:.1f}%)",
-        'setting_option_3': "3. Use multithreading (current: {})",
+        'setting_option_1': "1. Rate limit in requests/s (current: {})",
+        'setting_option_2': "2. Token bucket size (current: {})",
+        'setting_option_3': "3. Search mode (current: {})",
         'setting_option_4_on': "4. Maximum threads (current: {})",
-        'setting_option_4_off': "4. Maximum threads (N/A - Multithreading disabled)",
+        'setting_option_4_async': "4. Maximum concurrent requests (current: {})",
+        'setting_option_4_off': "4. Maximum threads (N/A - sequential search)",
         'setting_option_5': "5. Request timeout (current: {}s)",
         'setting_option_6': "6. Verbose output (current: {})",
-        'setting_option_7': "7. Return to Main Menu",
+        'setting_option_7': "7. Connections per session (pool size) (current: {})",
+        'setting_option_8': "8. HTTP retries on connection errors (current: {})",
+        'setting_option_9': "9. Use HTTP/2 (asyncio only) (current: {})",
+        'setting_option_10': "10. Search strategy (current: {})",
+        'setting_option_11': "11. Result cache (current: {})",
+        'setting_option_12': "12. Result file (JSONL/CSV, current: {})",
+        'setting_option_13': "13. Checkpoint file for resuming (current: {})",
+        'setting_option_14': "14. Adaptive concurrency (reduce when throttled) (current: {})",
+        'setting_option_15': "15. Return to Main Menu",
         'prompt_select_setting': "Select an option to change: ",
-        'prompt_enter_delays': "Enter delay times separated by comma (e.g., 0.5,1.0,2.0): ",
         'error_invalid_delays_format': "Invalid input: {}. Settings not changed.",
-        'error_delays_must_be_positive': "All delay times must be >= 0.",
-        'setting_delays_set': "Delay times set to: {}",
-        'prompt_enter_delay_probability': "Enter probability for delay between 0 and 1 (e.g., 0.1 for 10%): ",
-        'error_probability_range': "Probability must be between 0 and 1.",
-        'setting_probability_set': "Probability set to: {:.1f}%",
-        'prompt_use_threads': "Use threads? (yes/no): ",
-        'setting_threads_enabled': "Multithreading enabled.",
-        'setting_threads_disabled': "Multithreading disabled.",
-        'setting_threads_not_relevant': "Setting only relevant when multithreading is enabled.",
+        'prompt_enter_rate_burst': "Enter the token bucket size (0 = one second of requests; current: {}): ",
+        'setting_rate_burst_set': "Token bucket size set to: {}",
+        'error_rate_burst_negative': "The token bucket size must not be negative.",
+        'rate_burst_default': "one second of requests",
+        'prompt_select_search_mode': "Select the search mode (1 = sequential, 2 = parallel with threads, 3 = asyncio): ",
+        'setting_search_mode_set': "Search mode set to: {}",
+        'mode_sequential': "sequential",
+        'mode_threaded': "parallel (threads)",
+        'mode_async': "asyncio",
+        'setting_threads_not_relevant': "Setting not relevant for the sequential search.",
+        'prompt_enter_max_concurrency': "Enter the maximum number of concurrent requests (current: {}): ",
+        'error_concurrency_must_be_positive': "Number of concurrent requests must be positive.",
+        'setting_max_concurrency_set': "Maximum concurrent requests set to: {}",
+        'prompt_use_http2': "Use HTTP/2? (yes/no): ",
+        'prompt_use_adaptive': "Regulate concurrency adaptively? (yes/no): ",
+        'setting_adaptive_enabled': "Adaptive concurrency enabled (threads/concurrent requests are the upper limit).",
+        'setting_adaptive_disabled': "Adaptive concurrency disabled.",
+        'setting_http2_enabled': "HTTP/2 enabled.",
+        'setting_http2_disabled': "HTTP/2 disabled.",
+        'prompt_select_search_strategy': "Select the search strategy (1 = full, 2 = pruned, 3 = likely first): ",
+        'setting_search_strategy_set': "Search strategy set to: {}",
+        'strategy_full': "full",
+        'strategy_pruned': "pruned (stops after missing patches/minors)",
+        'strategy_likely': "likely first (near known versions and hits)",
+        'budget_exhausted': "Budget exhausted after {} candidates - search ends with the hits so far.",
+        'prompt_enter_cache_file': "Enter the path of the cache file (empty = disable cache): ",
+        'setting_cache_enabled': "Result cache enabled: {}",
+        'setting_cache_disabled': "Result cache disabled.",
+        'cache_disabled': "disabled",
+        'prompt_enter_output_file': "Enter the path of the result file (.csv = CSV, otherwise JSON Lines; empty = disable): ",
+        'setting_output_enabled': "Result file enabled: {} ({})",
+        'setting_output_disabled': "Result file disabled.",
+        'prompt_enter_checkpoint_file': "Enter the path of the checkpoint file (interrupted searches are resumed; empty = disable): ",
+        'setting_checkpoint_enabled': "Checkpoint enabled: {}",
+        'setting_checkpoint_disabled': "Checkpoint disabled.",
         'prompt_enter_max_threads': "Enter the maximum number of threads (current: {}): ",
         'error_threads_must_be_positive': "Number of threads must be positive.",
         'setting_max_threads_set': "Maximum threads set to: {}",
         'prompt_enter_timeout': "Enter the timeout value in seconds (current: {}): ",
         'error_timeout_must_be_positive': "Timeout must be positive.",
         'setting_timeout_set': "Timeout set to: {}s",
+        'prompt_enter_rate_limit': "Enter the limit in requests per second (0 = unlimited; current: {}): ",
+        'setting_rate_limit_set': "Rate limit set to: {}",
+        'error_rate_limit_negative': "The rate limit must not be negative.",
+        'error_metrics_interval_positive': "The metrics interval must be greater than 0.",
+        'error_workers_negative': "The number of workers must not be negative.",
+        'error_no_workers': "Without local workers (--workers 0), --serve-queue is required.",
+        'error_distributed_unsupported': "Not supported in distributed mode: {} (workers keep no shared result cache, result file or metrics; the queue is the checkpoint).",
+        'distributed_started': "Distributed search: {} shards, {} local workers.",
+        'distributed_resuming': "Resuming distributed search from {}.",
+        'distributed_serving': "Queue for remote workers at http://{}:{} (workers: --worker http://HOST:PORT)",
+        'distributed_progress': "\rShards done: {}/{} | Found: {}",
+        'error_watch_interval_positive': "The watch interval must be greater than 0.",
+        'watch_started': "Watching {} for new firmware every {} s (state: {}, Ctrl+C to stop).",
+        'watch_new_firmware': "[{}] New firmware for {}: {}",
+        'watch_no_baseline': "Warning: No firmware found for {} - no baseline version, model is not watched.",
+        'watch_webhook_failed': "Warning: Notification to {} failed: {}",
+        'watch_stopped': "Watching stopped.",
+        'listing_used': "Bucket listing: {} matching file(s) in {} page(s) from {} - no guessing needed.",
+        'listing_page': "Bucket listing page {}: {} keys ({:.0f} ms)",
+        'download_complete': "Downloaded: {} ({}, SHA-256 {})",
+        'download_failed': "Download of {} failed: {}",
+        'download_checksum_mismatch': "Checksum mismatch (MD5 {} instead of {} from the ETag)",
+        'download_summary': "Download: {} file(s), {} in {:.1f} s ({}/s).",
+        'download_model_files': "Downloads for {}:",
+        'error_invalid_size': "Invalid size: {} (e.g. 500K, 10M, 1G)",
+        'rate_limit_off': "unlimited",
+        'prompt_enter_pool_size': "Enter the pool size (connections per host and session) (current: {}): ",
+        'error_pool_size_must_be_positive': "Pool size must be positive.",
+        'setting_pool_size_set': "Pool size set to: {}",
+        'prompt_enter_http_retries': "Enter the number of HTTP retries (current: {}): ",
+        'error_retries_must_be_non_negative': "Number of retries cannot be negative.",
+        'setting_http_retries_set': "HTTP retries set to: {}",
         'prompt_use_verbose': "Should the output be verbose? (yes/no): ",
         'setting_verbose_enabled': "Verbose output enabled.",
         'setting_verbose_disabled': "Verbose output disabled.",
@@ -175,7 +500,7 @@ TRANSLATIONS = {
         'language_set_to': "Language set to {}.",
         # Modellauswahl & Suche
         'available_models_title': "--- Available Kindle Models ---",
-        'prompt_enter_model': "Enter the Kindle model identifier (e.g., PW5) or 'exit' to cancel: ",
+        'prompt_enter_model': "Enter the Kindle model identifier (e.g., PW5), several separated by commas, 'all' for all models or 'exit' to cancel: ",
         'error_model_invalid': "Invalid Kindle model identifier. Please enter one of the supported identifiers or 'exit'.",
         'error_no_base_url': "Error: No base URL defined for model {}.",
         'searching_static_title': "\n--- Searching for static firmware for {} ---",
@@ -198,21 +523,109 @@ TRANSLATIONS = {
         'search_summary_range': "Range: {} to {}",
         'search_summary_threads': "Threads: {} (Max: {})",
         'search_summary_threads_no': "Threads: No",
+        'search_summary_async': "Mode: asyncio (max {} concurrent requests, {})",
         'search_summary_timeout': "Timeout: {}s",
-        'search_summary_delay': "Delay: {}s (Probability: {:.1f}%)",
+        'search_summary_rate_limit': "Rate limit: {} requests/s",
         'search_summary_verbose': "Verbose: {}",
+        'search_summary_strategy': "Strategy: {} (max {} requests)",
+        'search_summary_build_hints': "Additional version components (up to {}) below hits and: {}",
+        'search_summary_build_hints_only': "Additional version components only below: {}",
         'starting_sequential_search': "Starting sequential search ({} versions)...",
         'starting_threaded_search': "Starting parallel search ({} versions with max {} threads)...",
+        'starting_async_search': "Starting asynchronous search ({} versions with max {} concurrent requests, {})...",
         'no_versions_to_check': "No versions to check in the specified range.",
         'error_invalid_pattern': "\nError: Invalid filename pattern '{}'. Skipping version {}.",
-        'progress_update': "\rProgress: {}/{} ({:.2f}%) [{} found]",
+        'progress_update': "Progress: {}/{} ({:.2f}%) [{} found] {:.1f}/s, ETA {}",
         'sequential_search_complete': "\nSequential search completed.",
         'threaded_search_complete': "\nParallel search completed.",
+        'async_search_complete': "\nAsynchronous search completed.",
+        'warning_async_unavailable': "Warning: The asyncio mode requires 'httpx' (pip install httpx). Using parallel search with threads.",
+        'warning_http2_unavailable': "Warning: HTTP/2 requires 'h2' (pip install httpx[http2]). Using HTTP/1.1.",
         'search_aborted_by_user': "\nSearch aborted by user.",
         'error_unexpected_search': "\nUnexpected error during search: {}",
         'firmware_found_count': "\nThe following {} firmware files were found (sorted):",
         'firmware_none_found': "\nNo matching firmware files found in the specified version range.",
         'search_duration': "\nSearch took {:.2f} seconds.",
+        'pruning_summary': "Checked: {} of {} possible versions ({} saved, {:.1f}%).",
+        'cache_summary': "Answered from cache: {} of {} checks ({}).",
+        'output_summary': "Result file: {} records written ({}).",
+        'concurrency_summary': "Adaptive concurrency: last {}, peak {} of max. {} (reduced {} times).",
+        'throttle_summary': "Throttled responses (429/503): {}.",
+        'retry_summary': "Requests retried after throttling or errors: {}.",
+        'metrics_summary': "Throughput: {:.1f} requests/s ({} requests in {:.1f} s), max. {} in flight.",
+        'metrics_latency_summary': "Latency {}: p50 {} / p95 {} / p99 {} / max {} ms ({} samples).",
+        'metrics_status_summary': "Responses by status: {}",
+        'metrics_errors_summary': "Errors by class: {}",
+        'metrics_export_summary': "Metrics: {}",
+        'warning_metrics_unavailable': "WARNING: Could not start the metrics endpoint '{}' ({}).",
+        'unresolved_summary': "WARNING: {} URL(s) got no definitive answer despite retries (not counted as 'not found'):",
+        'unresolved_model_count': "Unresolved for {} ({} URL(s), check again):",
+        'changed_summary': "NOTE: {} known file(s) were replaced since the last check:",
+        'changed_model_count': "Replaced for {} ({} file(s) changed since the last check):",
+        'checkpoint_resuming': "Resuming search: {} results from checkpoint ({}).",
+        'checkpoint_summary': "Taken from checkpoint: {} of {} checks.",
+        'checkpoint_saved': "\nProgress saved to {} (resume with the same checkpoint file or --resume).",
+        'warning_checkpoint_mismatch': "Warning: Checkpoint {} belongs to a different search; only matching URLs are reused.",
+        'batch_summary_title': "\nBatch search for: {}",
+        'starting_batch_search': "Starting batch search for {} models ({} versions, mode: {})...",
+        'batch_search_complete': "\nBatch search completed.",
+        'batch_summary': "Candidates: {}, requests: {} ({} duplicate URLs merged).",
+        'batch_model_found_count': "\n{}: {} firmware files found (sorted):",
+        'batch_model_none_found': "\n{}: No matching firmware files found.",
+        # Command line
+        'cli_description': "Checks which Kindle firmware files exist on Amazon's download servers. Without arguments the interactive menu is started.",
+        'cli_help_model': "Model(s): e.g. PW5, a comma-separated list (PW5,PW5SE) or 'all'",
+        'cli_help_start': "Start version (M.m.p), default: the model's range",
+        'cli_help_end': "End version (M.m.p), default: the model's range",
+        'cli_help_mode': "Search mode (default: {})",
+        'cli_help_concurrency': "Max. threads or concurrent requests (asyncio)",
+        'cli_help_timeout': "Timeout per request in seconds (default: {})",
+        'cli_help_strategy': "Search strategy (default: {})",
+        'cli_help_budget': "Probe at most N candidates per model (0 = unlimited; best with --strategy likely)",
+        'cli_help_deadline': "Stop probing new candidates after SECONDS seconds (0 = unlimited)",
+        'cli_help_max_depth': "Probe further version components below hits up to N components, .0 - .9 each (default: 3 = only below build hints)",
+        'error_max_depth_min': "--max-depth must be at least 3.",
+        'cli_help_discovery': "auto = list the bucket first (ListObjectsV2), guess only if listing is denied; probe = always guess (default: {})",
+        'cli_help_cache': "SQLite file for the result cache",
+        'cli_help_revalidate': "Confirm cached hits with conditional requests (ETag/Last-Modified) and report replaced files",
+        'cli_help_download': "Download the found files into this directory after the search",
+        'cli_help_download_connections': "Concurrent range requests while downloading (default: {})",
+        'cli_help_download_limit': "Limit the download bandwidth, bytes per second (e.g. 5M)",
+        'cli_help_chunk_size': "Size of the download chunks (default: 8M)",
+        'cli_help_no_adaptive': "Fixed concurrency instead of adaptive regulation",
+        'cli_help_throttle_retries': "Retries per URL when throttled (429/503) (default: {})",
+        'cli_help_rate_limit': "Max. requests per second across all workers (default: 20, 0 = unlimited)",
+        'cli_help_burst': "Token bucket size (default: one second of requests)",
+        'cli_help_http2': "Use HTTP/2 in asyncio mode",
+        'cli_help_engine': "HTTP engine of the sequential/threaded search: requests or pipelined (pipelined HEADs on a few persistent connections, default: {})",
+        'cli_help_pipeline_depth': "Requests per connection and round of the pipelined engine (default: {})",
+        'cli_help_format': "Output format (default: text)",
+        'cli_help_language': "Output language",
+        'cli_help_list_models': "List supported models and exit",
+        'cli_help_checkpoint': "Periodically save progress to this SQLite file (deleted after a complete search)",
+        'cli_help_resume': "Continue the search from the checkpoint file instead of starting over",
+        'cli_error_resume_requires_checkpoint': "--resume requires --checkpoint FILE.",
+        'cli_help_output': "Write every probe as a record to this file (appended)",
+        'cli_help_output_format': "Result file format (default: by extension, .csv = CSV, otherwise JSON Lines)",
+        'cli_help_metrics_listen': "Serve a Prometheus /metrics endpoint during the search (default host 127.0.0.1)",
+        'cli_help_metrics_file': "Periodically write metrics in Prometheus text format to this file",
+        'cli_help_metrics_interval': "Seconds between two writes of the metrics file (default: {})",
+        'cli_error_model_required': "--model is required (or --list-models).",
+        'cli_help_workers': "Split the search across N local worker processes (distributed search)",
+        'cli_help_queue': "SQLite file holding the shard queue of the distributed search (allows resuming)",
+        'cli_help_serve_queue': "Serve the queue over HTTP to workers on other hosts",
+        'cli_help_worker': "Run as a worker processing shards from QUEUE (file or http://HOST:PORT)",
+        'cli_help_watch': "Keep checking only above the newest known version for new firmware",
+        'cli_help_latest': "Only find the newest firmware per model (galloping/binary search, about a hundred instead of thousands of requests)",
+        'latest_model_found': "{}: {} ({} requests instead of {})",
+        'latest_model_none_found': "{}: No firmware found ({} requests).",
+        'latest_lower_bound': "  (lower bound: found by guessing; build-only versions or versions behind larger gaps are not detected)",
+        'cli_help_watch_interval': "Seconds between two rounds in watch mode (default: {})",
+        'cli_help_watch_state': "JSON file holding the last known versions (default: {})",
+        'cli_help_watch_cycles': "Stop watch mode after N rounds (e.g. 1 for cron jobs)",
+        'cli_help_webhook': "Report new firmware via POST (JSON) to this URL",
+        'cli_help_exit_on_new': "Stop watch mode after the first round with new firmware (exit code 4)",
+        'cli_error_model_invalid': "Unknown model: {}",
         'error_incomplete_config': "Error: Incomplete configuration for model {} (missing 'static_version' or 'example_filename'/'default_version_range').",
         'derived_pattern_regex': "Derived pattern (Regex): {}",
         'derived_pattern_fallback': "Derived pattern (Fallback '_'): {}",
@@ -230,244 +643,4324 @@ TRANSLATIONS = {
     }
 }
 
-# --- Hilfsfunktionen ---
+# --- Modelldaten ---
+# Kindle Modelldaten mit übersetzten Beschreibungen
+KINDLE_MODELS = {
+    "K5": {"description": {"de": "Kindle 5 (Touch)", "en": "Kindle 5 (Touch)"}, "base_url": "https://s3.amazonaws.com/G7G_FirmwareUpdates_WebDownloads/", "example_filename": "update_kindle_5.6.1.1.bin", "default_version_range": ((5, 3, 0), (5, 6, 25))},
+    "K4": {"description": {"de": "Kindle 4 (ohne Touch, Silber/Graphit)", "en": "Kindle 4 (Non-Touch, Silver/Graphite)"}, "base_url": "https://s3.amazonaws.com/firmwareupdates/", "static_version": "update_kindle_4.1.4.bin"},
+    "K4B": {"description": {"de": "Kindle 4 (ohne Touch, Schwarz)", "en": "Kindle 4 (Non-Touch, Black)"}, "base_url": "https://s3.amazonaws.com/firmwareupdates/", "static_version": "update_kindle_4.1.4.bin"},
+    "PW": {"description": {"de": "Kindle Paperwhite 1 (2012)", "en": "Kindle Paperwhite 1 (2012)"}, "base_url": "https://s3.amazonaws.com/G7G_FirmwareUpdates_WebDownloads/", "example_filename": "update_kindle_5.6.1.1.bin", "default_version_range": ((5, 0, 0), (5, 6, 25))},
+    "PW2": {"description": {"de": "Kindle Paperwhite 2 (2013)", "en": "Kindle Paperwhite 2 (2013)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_paperwhite_v2_5.12.2.2.bin", "default_version_range": ((5, 4, 0), (5, 12, 25))},
+    "KT2": {"description": {"de": "Kindle 7 (Basis, 2014)", "en": "Kindle 7 (Basic, 2014)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_5.12.2.2.bin", "default_version_range": ((5, 6, 0), (5, 12, 25))},
+    "KV": {"description": {"de": "Kindle Voyage (2014)", "en": "Kindle Voyage (2014)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "static_version": "update_kindle_voyage_5.13.6.bin"},
+    "PW3": {"description": {"de": "Kindle Paperwhite 3 (2015)", "en": "Kindle Paperwhite 3 (2015)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_paperwhite_5.14.2.bin", "default_version_range": ((5, 7, 0), (5, 15, 25))},
+    "KOA1": {"description": {"de": "Kindle Oasis 1 (2016)", "en": "Kindle Oasis 1 (2016)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_oasis_5.14.2.bin", "default_version_range": ((5, 8, 0), (5, 15, 25))},
+    "KT3": {"description": {"de": "Kindle 8 (Basis, 2016)", "en": "Kindle 8 (Basic, 2016)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_8th_5.14.2.bin", "default_version_range": ((5, 8, 0), (5, 15, 25))},
+    "KOA2": {"description": {"de": "Kindle Oasis 2 (2017)", "en": "Kindle Oasis 2 (2017)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_oasis_5.14.2.bin", "default_version_range": ((5, 9, 0), (5, 16, 25))},
+    "PW4": {"description": {"de": "Kindle Paperwhite 4 (2018)", "en": "Kindle Paperwhite 4 (2018)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_paperwhite_v2_5.14.2.bin", "default_version_range": ((5, 10, 0), (5, 16, 25))},
+    "KT4": {"description": {"de": "Kindle 10 (Basis, 2019)", "en": "Kindle 10 (Basic, 2019)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_10th_5.14.2.bin", "default_version_range": ((5, 11, 0), (5, 16, 25))},
+    "KOA3": {"description": {"de": "Kindle Oasis 3 (2019)", "en": "Kindle Oasis 3 (2019)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_oasis_v2_5.14.2.bin", "default_version_range": ((5, 12, 0), (5, 16, 25))},
+    "PW5": {"description": {"de": "Kindle Paperwhite 5 (11. Gen, 2021)", "en": "Kindle Paperwhite 5 (11th Gen, 2021)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_paperwhite_11th_5.16.8.bin", "default_version_range": ((5, 14, 0), (5, 17, 25))},
+    "PW5SE": {"description": {"de": "Kindle Paperwhite 5 SE (11. Gen, 2021)", "en": "Kindle Paperwhite 5 Signature Edition (11th Gen, 2021)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_paperwhite_11th_5.16.8.bin", "default_version_range": ((5, 14, 0), (5, 17, 25))},
+    "K11": {"description": {"de": "Kindle 11 (Basis, 2022)", "en": "Kindle 11 (Basic, 2022)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_11th_5.16.8.bin", "default_version_range": ((5, 15, 0), (5, 17, 25))},
+    "Scribe": {"description": {"de": "Kindle Scribe (2022)", "en": "Kindle Scribe (2022)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_scribe_5.16.8.bin", "default_version_range": ((5, 16, 0), (5, 17, 25))},
+}
+
+# --- Hilfsfunktionen ---
+
+def get_text(key, lang):
+    """Holt den übersetzten Text für einen Schlüssel in der angegebenen Sprache."""
+    # Fallback auf Englisch, wenn Sprache nicht existiert oder Schlüssel fehlt
+    return TRANSLATIONS.get(lang, TRANSLATIONS['en']).get(key, f"<{key}_MISSING>")
+
+class VersionSpace:
+    """
+    Alle dreistelligen Kandidaten (Major.Minor.Patch) eines Versionsbereichs in aufsteigender
+    Reihenfolge, mit wahlfreiem Zugriff statt verschachtelter Schleifen: len() ist geschlossen
+    berechnet, space[i] und space.index(version) kosten O(1), space[a:b] ist wieder ein
+    VersionSpace (zusammenhängender Ausschnitt, z.B. ein Shard oder der Rest ab einem
+    Fortsetzungspunkt), stride() und sample() wählen gleichmäßig bzw. zufällig verteilte Kandidaten.
+
+    Innerhalb einer Major laufen die Minors bis MAX_MINOR und die Patches bis MAX_PATCH;
+    die erste und letzte Major.Minor-Kombination sind durch Start- und Endversion begrenzt.
+    """
+
+    def __init__(self, version_range):
+        (self._start_major, self._start_minor, self._start_patch), (self._end_major, self._end_minor, self._end_patch) = (
+            tuple(version_range[0]), tuple(version_range[1]))
+        self._minors = MAX_MINOR + 1
+        self._patches = MAX_PATCH + 1
+        if tuple(version_range[0]) > tuple(version_range[1]):
+            self._first_minors = self._combos = self._first_patches = 0
+        else:
+            last_minor = self._end_minor if self._start_major == self._end_major else MAX_MINOR
+            self._first_minors = max(0, last_minor - self._start_minor + 1) # Kombinationen der ersten Major
+            self._combos = self._first_minors
+            if self._start_major < self._end_major:
+                self._combos += (self._end_major - self._start_major - 1) * self._minors + self._end_minor + 1
+        if self._combos:
+            _, _, first_patch, last_patch = self._combo(0)
+            self._first_patches = max(0, last_patch - first_patch + 1) # Leer, wenn der Start-Patch > MAX_PATCH
+        if self._combos > 1:
+            total = self._first_patches + (self._combos - 2) * self._patches + self._end_patch + 1
+        else:
+            total = self._first_patches
+        self._offset, self._length = 0, total
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._length)
+            if step != 1:
+                raise ValueError("VersionSpace: nur zusammenhängende Ausschnitte (Schrittweite 1), sonst stride()")
+            view = object.__new__(VersionSpace)
+            view.__dict__.update(self.__dict__)
+            view._offset, view._length = self._offset + start, max(0, stop - start)
+            return view
+        index = item + self._length if item < 0 else item
+        if not 0 <= index < self._length:
+            raise IndexError(item)
+        combo, patch = self._locate(self._offset + index)
+        major, minor, _, _ = self._combo(combo)
+        return major, minor, patch
+
+    def __iter__(self):
+        for major, minor, first_patch, last_patch in self.patch_ranges():
+            for patch in range(first_patch, last_patch + 1):
+                yield major, minor, patch
+
+    def __contains__(self, version):
+        return self._position(version) is not None
+
+    def __repr__(self):
+        return f"VersionSpace({self.version_range!r}, len={self._length})"
+
+    @property
+    def version_range(self):
+        """(erste, letzte Version) des Ausschnitts; None, wenn er leer ist."""
+        return (self[0], self[-1]) if self._length else None
+
+    def index(self, version):
+        """Position einer Version im Ausschnitt; ValueError, wenn sie nicht dazugehört."""
+        position = self._position(version)
+        if position is None:
+            raise ValueError(f"{version} liegt nicht im Versionsbereich")
+        return position
+
+    def patch_ranges(self):
+        """Liefert für jede Major.Minor-Kombination des Ausschnitts (major, minor, erster_patch, letzter_patch)."""
+        if not self._length:
+            return
+        first_combo, first_patch = self._locate(self._offset)
+        last_combo, last_patch = self._locate(self._offset + self._length - 1)
+        for combo in range(first_combo, last_combo + 1):
+            major, minor, low, high = self._combo(combo)
+            low = first_patch if combo == first_combo else low
+            high = last_patch if combo == last_combo else high
+            if low <= high:
+                yield major, minor, low, high
+
+    def shards(self, size):
+        """Teilt den Ausschnitt in zusammenhängende Teile von höchstens `size` Kandidaten."""
+        size = max(1, size)
+        return [self[start:start + size] for start in range(0, self._length, size)]
+
+    def stride(self, step, offset=0):
+        """Jeder `step`-te Kandidat ab Position `offset` (gleichmäßige Stichprobe)."""
+        return (self[index] for index in range(offset, self._length, max(1, step)))
+
+    def sample(self, count, seed=None):
+        """`count` zufällig gewählte Kandidaten ohne Wiederholung (mit `seed` reproduzierbar)."""
+        return [self[index] for index in random.Random(seed).sample(range(self._length), min(count, self._length))]
+
+    def _combo(self, combo):
+        """Major.Minor-Kombination Nr. `combo` mit ihrem Patch-Bereich: (major, minor, erster, letzter)."""
+        if combo < self._first_minors:
+            major, minor = self._start_major, self._start_minor + combo
+        else:
+            rest = combo - self._first_minors
+            middle = (self._end_major - self._start_major - 1) * self._minors # Kombinationen der vollen Majors
+            if rest < middle:
+                major, minor = self._start_major + 1 + rest // self._minors, rest % self._minors
+            else:
+                major, minor = self._end_major, rest - middle
+        first_patch = self._start_patch if (major, minor) == (self._start_major, self._start_minor) else 0
+        last_patch = self._end_patch if (major, minor) == (self._end_major, self._end_minor) else MAX_PATCH
+        return major, minor, first_patch, last_patch
+
+    def _locate(self, index):
+        """Absolute Position -> (Kombination, Patch)."""
+        if index < self._first_patches:
+            return 0, self._combo(0)[2] + index
+        rest = index - self._first_patches
+        combo = 1 + rest // self._patches
+        if combo >= self._combos - 1:
+            return self._combos - 1, rest - (self._combos - 2) * self._patches
+        return combo, rest % self._patches
+
+    def _position(self, version):
+        """Position einer Version im Ausschnitt oder None."""
+        if len(version) != 3:
+            return None
+        major, minor, patch = version
+        if not self._start_major <= major <= self._end_major:
+            return None
+        low_minor = self._start_minor if major == self._start_major else 0
+        high_minor = self._end_minor if major == self._end_major else MAX_MINOR
+        if not low_minor <= minor <= high_minor:
+            return None
+        if major == self._start_major:
+            combo = minor - self._start_minor
+        else:
+            combo = self._first_minors + (major - self._start_major - 1) * self._minors + minor
+        _, _, first_patch, last_patch = self._combo(combo)
+        if not first_patch <= patch <= last_patch:
+            return None
+        index = patch - first_patch if combo == 0 else self._first_patches + (combo - 1) * self._patches + patch
+        index -= self._offset
+        return index if 0 <= index < self._length else None
+
+
+def iter_patch_ranges(version_range):
+    """
+    Liefert für jede Major.Minor-Kombination im Versionsbereich
+    (major, minor, erster_patch, letzter_patch).
+    """
+    return VersionSpace(version_range).patch_ranges()
+
+
+def calculate_total_checks(version_range):
+    """Berechnet die *genaue* Anzahl der zu prüfenden Versionen (geschlossen, ohne Schleife)."""
+    return len(VersionSpace(version_range))
+
+
+# --- HTTP-Sessions ---
+
+class SessionPool:
+    """
+    Hält eine gepoolte requests.Session pro Worker-Thread.
+    Verbindungen (Keep-Alive) werden über die gesamte Suche wiederverwendet,
+    statt für jede Anfrage eine neue TCP/TLS-Verbindung aufzubauen.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, retries=DEFAULT_HTTP_RETRIES, metrics=None):
+        self.pool_size = max(1, pool_size)
+        self.retries = max(0, retries)
+        self.metrics = metrics # ProbeMetrics für die Aufbauzeit neuer Verbindungen (optional)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions = []
+
+    def _create_session(self):
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 504), # 429/503 regelt der ConcurrencyController
+            allowed_methods=frozenset(['HEAD', 'GET']),
+            raise_on_status=False,
+        )
+        if self.metrics is not None:
+            adapter = _MeteredHTTPAdapter(self.metrics, pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+        else:
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get(self):
+        """Gibt die Session des aktuellen Threads zurück (wird bei Bedarf angelegt)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self):
+        """Schließt alle Sessions und damit alle offenen Verbindungen."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class _MeteredHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter, der die Aufbauzeit jeder neuen Verbindung (DNS, TCP, TLS) an ProbeMetrics meldet."""
+
+    def __init__(self, metrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _metered_pool_class(pool_class, self.metrics)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+def _metered_pool_class(pool_class, metrics):
+    """Leitet eine urllib3-Poolklasse ab, deren Verbindungen ihren Aufbau zeitlich erfassen."""
+    class MeteredConnection(pool_class.ConnectionCls):
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            metrics.observe_connect(time.perf_counter() - start)
+
+    return type(pool_class.__name__, (pool_class,), {'ConnectionCls': MeteredConnection})
+
+
+def create_session_pool(settings, metrics=None):
+    """Erstellt einen SessionPool anhand der Einstellungen."""
+    return SessionPool(settings.get('pool_size', DEFAULT_POOL_SIZE), transport_retries(settings), metrics)
+
+
+ProbeResult = namedtuple(
+    'ProbeResult',
+    ['url', 'status', 'etag', 'content_length', 'last_modified', 'latency', 'error', 'cached', 'ttfb'],
+    defaults=(None, None, None, None, 0.0, None, False, None),
+)
+ProbeResult.__doc__ = """
+Ergebnis einer einzelnen HEAD-Anfrage.
+status ist None bei einem Fehler (Name der Exception in `error`),
+`cached` kennzeichnet Ergebnisse aus dem ProbeCache,
+`ttfb` ist die Zeit bis zu den Antwort-Headern (None bei Fehlern).
+"""
+
+
+def _header_int(value):
+    """Wandelt einen Header-Wert (z.B. Content-Length) in int um, sonst None."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_name(exc):
+    """
+    Name des Fehlers für ProbeResult.error. DNS-Fehler verbergen sich bei requests und
+    httpx hinter allgemeinen Verbindungsfehlern und werden als NameResolutionError gemeldet.
+    """
+    if any(marker in str(exc) for marker in DNS_ERROR_MARKERS):
+        return 'NameResolutionError'
+    return type(exc).__name__
+
+
+def conditional_headers(known):
+    """
+    Header für eine bedingte Anfrage anhand eines bekannten Treffers (ProbeResult):
+    If-None-Match mit dem ETag, If-Modified-Since mit Last-Modified.
+    """
+    headers = {}
+    if known is not None:
+        if known.etag: headers['If-None-Match'] = known.etag
+        if known.last_modified: headers['If-Modified-Since'] = known.last_modified
+    return headers
+
+
+def _response_probe(full_url, status, headers, latency, ttfb, known=None):
+    """
+    Baut das ProbeResult einer Antwort. Bei 304 (unverändert) fehlen Content-Length
+    und teils ETag/Last-Modified; sie werden aus dem bekannten Treffer `known` übernommen.
+    """
+    etag = headers.get('ETag')
+    content_length = _header_int(headers.get('Content-Length'))
+    last_modified = headers.get('Last-Modified')
+    if status == 304 and known is not None:
+        etag = etag or known.etag
+        content_length = known.content_length
+        last_modified = last_modified or known.last_modified
+    return ProbeResult(full_url, status, etag, content_length, last_modified, latency, ttfb=ttfb)
+
+
+def firmware_changed(known, probe):
+    """
+    True, wenn eine bekannte Datei (`known`) laut frischer Antwort ersetzt wurde:
+    200 statt 304 und abweichender ETag, Content-Length oder Last-Modified.
+    """
+    if known is None or probe.status != 200:
+        return False
+    return any(
+        old is not None and new is not None and old != new
+        for old, new in ((known.etag, probe.etag), (known.content_length, probe.content_length), (known.last_modified, probe.last_modified))
+    )
+
+
+def probe_url(full_url, timeout, sessions=None, known=None):
+    """
+    Führt die HEAD-Anfrage für eine einzelne URL aus und gibt ein ProbeResult zurück
+    (Status, ETag, Content-Length, Last-Modified, Dauer). Loggt Fehler nach stderr.
+    Mit `sessions` (SessionPool) wird die Verbindung des aktuellen Threads wiederverwendet.
+    Mit `known` (bekannter Treffer) wird bedingt angefragt; 304 bedeutet unverändert.
+    """
+    start = time.perf_counter()
+    try:
+        if sessions is not None:
+            response = sessions.get().head(full_url, timeout=timeout, headers=conditional_headers(known), allow_redirects=True)
+        else:
+            headers = {'User-Agent': USER_AGENT, **conditional_headers(known)}
+            response = requests.head(full_url, timeout=timeout, headers=headers, allow_redirects=True)
+        return _response_probe(full_url, response.status_code, response.headers, time.perf_counter() - start,
+                               response.elapsed.total_seconds(), known)
+    except requests.exceptions.RequestException as e:
+        # Logge Fehler nur einmal hier
+        print(f"\nFehler bei {full_url}: {type(e).__name__} - {e}", file=sys.stderr)
+        return ProbeResult(full_url, latency=time.perf_counter() - start, error=_error_name(e))
+    except Exception as e:
+        print(f"\nUnerwarteter interner Fehler bei URL {full_url}: {e}", file=sys.stderr)
+        return ProbeResult(full_url, latency=time.perf_counter() - start, error=type(e).__name__)
+
+
+def probe_outcome(probe):
+    """
+    Übersetzt ein ProbeResult in den Rückgabevertrag von check_url:
+    Dateiname (str) bei 200 und 304 (bekannte Datei unverändert), sonst Statuscode (int), None bei Fehler.
+    """
+    if probe.status is None:
+        return None
+    if probe.status in (200, 304):
+        return probe.url.split("/")[-1]
+    return probe.status
+
+
+class TokenBucket:
+    """
+    Gemeinsamer Ratenbegrenzer (Token-Bucket) für alle Worker einer Suche:
+    höchstens `rate` Anfragen pro Sekunde, kurzfristig bis zu `burst` auf einmal.
+    Jede Anfrage reserviert ein Token und wartet nur so lange, bis es verfügbar ist;
+    dadurch bleibt die Gesamtrate unabhängig von der Anzahl der Threads bzw. Tasks.
+    """
+
+    def __init__(self, rate, burst=0):
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst and burst > 0 else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens=1):
+        """Reserviert `tokens` Tokens und gibt die Wartezeit in Sekunden zurück."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens=1):
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def acquire_async(self):
+        wait_time = self._reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+
+def create_rate_limiter(settings):
+    """Erstellt den Token-Bucket der Suche, falls ein Ratenlimit eingestellt ist."""
+    rate_limit = settings.get('rate_limit', DEFAULT_RATE_LIMIT)
+    if not rate_limit or rate_limit <= 0:
+        return None
+    return TokenBucket(rate_limit, settings.get('rate_burst', DEFAULT_RATE_BURST))
+
+
+def transport_retries(settings):
+    """
+    Wiederholungen innerhalb von requests/httpx (urllib3-Retry bzw. Transport). Mit Ratenlimit
+    keine: sie liefen am Token-Bucket vorbei, Fehler wiederholt dann SearchContext (mit Token).
+    """
+    rate_limit = settings.get('rate_limit', DEFAULT_RATE_LIMIT)
+    if rate_limit and rate_limit > 0:
+        return 0
+    return settings.get('http_retries', DEFAULT_HTTP_RETRIES)
+
+
+# --- Lastregelung ---
+
+def is_throttled(probe):
+    """True, wenn der Server die Anfrage gedrosselt hat (429 bzw. 503 SlowDown)."""
+    return probe.status in THROTTLE_STATUSES
+
+
+def is_timeout(probe):
+    """True, wenn die Anfrage an einem Timeout gescheitert ist (requests und httpx)."""
+    return probe.error is not None and 'Timeout' in probe.error
+
+
+def failure_class(probe):
+    """
+    Ordnet ein Ergebnis ohne endgültige Antwort einer Fehlerklasse zu: 'throttled'
+    (429/503) oder eine Klasse aus ERROR_RETRY_LIMITS ('dns', 'connect', 'timeout',
+    'server', 'other'). 408 zählt als 'timeout'. None bei einer endgültigen Antwort (200, übrige 4xx).
+    """
+    if is_throttled(probe):
+        return 'throttled'
+    if probe.error is None:
+        if probe.status is not None and probe.status >= 500:
+            return 'server'
+        if probe.status in TIMEOUT_STATUSES:
+            return 'timeout'
+        return None
+    if probe.error == 'NameResolutionError':
+        return 'dns'
+    if 'Connect' in probe.error or probe.error in ('ConnectionError', 'RemoteProtocolError', 'ReadError', 'WriteError', 'ProxyError', 'SSLError', 'ChunkedEncodingError'):
+        return 'connect'
+    if is_timeout(probe):
+        return 'timeout'
+    return 'other'
+
+
+class ConcurrencyController:
+    """
+    AIMD-Regler für die Anzahl gleichzeitiger Anfragen der parallelen Suchmodi.
+    Solange die Latenz flach bleibt, wird die Parallelität erhöht (erst verdoppelnd,
+    nach dem ersten Engpass um 1 pro Fenster); bei Drosselung (429/503) oder gehäuften
+    Timeouts wird sie halbiert und neue Anfragen pausieren für eine exponentiell
+    wachsende Wartezeit mit Zufallsanteil (Backoff).
+    Ohne `adaptive` bleibt die Parallelität fest, der Backoff gilt trotzdem.
+    Wird nur aus dem Thread bzw. Event-Loop aufgerufen, der die Ergebnisse einsammelt.
+    """
+
+    LATENCY_ALPHA = 0.2 # Glättung der Latenz (EWMA)
+    LATENCY_TOLERANCE = 1.5 # Latenz gilt als flach bis zum 1,5-fachen der Basislatenz
+    BASE_LATENCY_DRIFT = 1.001 # Basislatenz darf langsam mitwachsen
+    DECREASE_FACTOR = 0.5
+    DECREASE_COOLDOWN = 1.0 # Höchstens eine Halbierung pro Sekunde
+    TIMEOUT_CLUSTER = 3 # Timeouts innerhalb von TIMEOUT_WINDOW Sekunden gelten als Engpass
+    TIMEOUT_WINDOW = 5.0
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 30.0
+
+    def __init__(self, maximum, initial=None, adaptive=True):
+        self.maximum = max(1, maximum)
+        self.adaptive = adaptive
+        self.limit = float(self.maximum if not adaptive else min(self.maximum, initial or self.maximum))
+        self.peak = self.limit
+        self.slow_start = True
+        self.latency = None
+        self.base_latency = None
+        self.throttled = 0 # Anzahl gedrosselter Antworten
+        self.decreases = 0
+        self._backoff_level = 0
+        self._resume_at = 0.0
+        self._last_decrease = 0.0
+        self._timeouts = deque()
+
+    @property
+    def current(self):
+        return max(1, int(self.limit))
+
+    def backoff_remaining(self):
+        """Sekunden, die vor der nächsten neuen Anfrage noch zu warten sind."""
+        return max(0.0, self._resume_at - time.monotonic())
+
+    def on_result(self, probe):
+        if probe.cached:
+            return
+        if is_throttled(probe):
+            self.throttled += 1
+            self._congestion()
+            return
+        if is_timeout(probe):
+            now = time.monotonic()
+            self._timeouts.append(now)
+            while self._timeouts and now - self._timeouts[0] > self.TIMEOUT_WINDOW:
+                self._timeouts.popleft()
+            if len(self._timeouts) >= self.TIMEOUT_CLUSTER:
+                self._timeouts.clear()
+                self._congestion()
+            return
+        if probe.status is None or probe.latency is None:
+            return
+        self._backoff_level = 0
+        if self.latency is None:
+            self.latency = self.base_latency = probe.latency
+        else:
+            self.latency += self.LATENCY_ALPHA * (probe.latency - self.latency)
+            self.base_latency = min(self.base_latency * self.BASE_LATENCY_DRIFT, self.latency)
+        if not self.adaptive:
+            return
+        if self.latency <= self.base_latency * self.LATENCY_TOLERANCE:
+            # Slow Start: +1 pro Ergebnis verdoppelt die Parallelität pro Runde
+            self.limit = min(self.maximum, self.limit + (1.0 if self.slow_start else 1.0 / self.limit))
+            self.peak = max(self.peak, self.limit)
+        else:
+            self.slow_start = False
+
+    def _congestion(self):
+        now = time.monotonic()
+        self.slow_start = False
+        if self.adaptive and now - self._last_decrease >= self.DECREASE_COOLDOWN:
+            self.limit = max(1.0, self.limit * self.DECREASE_FACTOR)
+            self._last_decrease = now
+            self.decreases += 1
+        if now < self._resume_at:
+            return # Nachzügler desselben Engpasses verlängern den Backoff nicht
+        self._backoff_level = min(self._backoff_level + 1, 16)
+        delay = min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** (self._backoff_level - 1))
+        self._resume_at = now + random.uniform(delay / 2, delay)
+
+
+class _ConcurrencyGate:
+    """
+    Lässt höchstens `limit()` Worker-Threads gleichzeitig eine Anfrage stellen; weitere
+    warten, bis einer fertig ist. Die Grenze wird bei jedem Eintritt neu gelesen, sodass
+    der Thread-Pool größer sein kann als die aktuelle Parallelität des ConcurrencyControllers.
+    """
+
+    def __init__(self, limit):
+        self._limit = limit
+        self._active = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            while self._active >= self._limit():
+                self._condition.wait(PROGRESS_INTERVAL) # Grenze kann ohne Benachrichtigung wachsen
+            self._active += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+        return False
+
+
+def check_url(full_url, possible_delays, delay_probability, timeout, sessions=None, limiter=None):
+    """
+    Führt die Anfrage für eine einzelne URL aus.
+    Gibt Dateiname (str), Statuscode (int) oder None (Fehler) zurück.
+    Loggt Fehler nach stderr.
+    Mit `sessions` (SessionPool) wird die Verbindung des aktuellen Threads wiederverwendet.
+    Mit `limiter` (TokenBucket) wartet die Anfrage vorher auf ein Token; `possible_delays`
+    und `delay_probability` werden nicht mehr verwendet (nur noch aus Kompatibilität).
+    """
+    if limiter is not None:
+        limiter.acquire()
+    return probe_outcome(probe_url(full_url, timeout, sessions))
+
+
+# --- Ergebnis-Cache ---
+
+class ProbeCache:
+    """
+    Persistenter Ergebnis-Cache (SQLite) mit der URL als Schlüssel.
+    Speichert Status, ETag, Content-Length, Last-Modified und Zeitpunkt der Prüfung.
+    Treffer (200) und Fehlanzeigen (403/404, MISS_STATUSES) haben getrennte Gültigkeitsdauern;
+    andere Antworten (z.B. 408, 429, 5xx) und Verbindungsfehler werden nicht gespeichert.
+    ETag und Last-Modified abgelaufener Treffer dienen als Validatoren für bedingte
+    Anfragen (validators()); ein 304 erneuert den Eintrag als Treffer.
+    Der Zugriff ist thread-sicher, Schreibvorgänge werden gebündelt committet.
+    """
+
+    COMMIT_INTERVAL = 200
+    COMMIT_SECONDS = 5.0
+
+    def __init__(self, path, hit_ttl=DEFAULT_CACHE_HIT_TTL, miss_ttl=DEFAULT_CACHE_MISS_TTL):
+        self.path = path
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.served = 0 # Anzahl der aus dem Cache beantworteten Prüfungen
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS probes ("
+            "url TEXT PRIMARY KEY, status INTEGER NOT NULL, etag TEXT, "
+            "content_length INTEGER, last_modified TEXT, checked_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def is_cacheable(probe):
+        status = probe.status
+        return status in (200, 304) or status in MISS_STATUSES
+
+    def lookup(self, url):
+        """Gibt ein gültiges ProbeResult aus dem Cache zurück oder None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, etag, content_length, last_modified, checked_at FROM probes WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, etag, content_length, last_modified, checked_at = row
+        ttl = self.hit_ttl if status == 200 else self.miss_ttl
+        if time.time() - checked_at > ttl:
+            return None
+        with self._lock:
+            self.served += 1
+        return ProbeResult(url, status, etag, content_length, last_modified, 0.0, None, True)
+
+    def validators(self, url):
+        """Gibt den gespeicherten Treffer (auch abgelaufen) für eine bedingte Anfrage zurück oder None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, content_length, last_modified FROM probes WHERE url = ? AND status = 200", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return ProbeResult(url, 200, *row, 0.0, None, True)
+
+    def store(self, probe):
+        """Speichert ein frisch geprüftes Ergebnis (sofern es zwischengespeichert werden darf)."""
+        if probe.cached or not self.is_cacheable(probe):
+            return
+        self._insert(probe)
+
+    def _insert(self, probe):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO probes (url, status, etag, content_length, last_modified, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (probe.url, 200 if probe.status == 304 else probe.status, probe.etag, probe.content_length, probe.last_modified, time.time()),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.COMMIT_INTERVAL or time.monotonic() - self._last_commit >= self.COMMIT_SECONDS:
+                self._conn.commit()
+                self._uncommitted = 0
+                self._last_commit = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+def open_probe_cache(settings):
+    """Öffnet den Ergebnis-Cache, falls in den Einstellungen eine Datei angegeben ist."""
+    cache_file = settings.get('cache_file')
+    if not cache_file:
+        return None
+    return ProbeCache(
+        cache_file,
+        settings.get('cache_hit_ttl', DEFAULT_CACHE_HIT_TTL),
+        settings.get('cache_miss_ttl', DEFAULT_CACHE_MISS_TTL),
+    )
+
+
+# --- Checkpoints ---
+
+class SearchCheckpoint(ProbeCache):
+    """
+    Hält den Fortschritt einer laufenden Suche fest, damit sie nach einem Abbruch
+    (Strg+C, Netzwerkausfall, beendeter Container) fortgesetzt werden kann.
+    Gespeichert werden alle abgeschlossenen Prüfungen samt Treffern, unabhängig von
+    der Reihenfolge: Ausgedünnte Suchen und aufgeklappte Versionsebenen hängen von
+    den Ergebnissen ab und werden beim Fortsetzen ohne Anfragen wieder durchlaufen.
+    Fehler, 429 und 5xx werden nicht gespeichert und beim Fortsetzen erneut geprüft.
+    Nach einer vollständigen Suche wird die Datei mit discard() entfernt.
+    """
+
+    COMMIT_INTERVAL = 50
+
+    def __init__(self, path, search_key, resume=False):
+        super().__init__(path, math.inf, math.inf)
+        self.mismatch = False
+        with self._lock:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS checkpoint_meta (key TEXT PRIMARY KEY, value TEXT)")
+            if not resume:
+                self._conn.execute("DELETE FROM probes")
+            else:
+                row = self._conn.execute("SELECT value FROM checkpoint_meta WHERE key = 'search'").fetchone()
+                self.mismatch = row is not None and row[0] != search_key
+            self.restorable = self._conn.execute("SELECT COUNT(*) FROM probes").fetchone()[0]
+            self._conn.execute("INSERT OR REPLACE INTO checkpoint_meta (key, value) VALUES ('search', ?)", (search_key,))
+            self._conn.commit()
+
+    def store(self, probe):
+        """Speichert ein abgeschlossenes Ergebnis, auch wenn es aus dem Ergebnis-Cache stammt."""
+        if self.is_cacheable(probe):
+            self._insert(probe)
+
+    def discard(self):
+        """Schließt den Checkpoint und löscht die Datei (Suche vollständig abgeschlossen)."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def open_search_checkpoint(settings, search_key):
+    """Öffnet den Checkpoint der Suche, falls in den Einstellungen eine Datei angegeben ist."""
+    checkpoint_file = settings.get('checkpoint_file')
+    if not checkpoint_file:
+        return None
+    lang = settings['language']
+    checkpoint = SearchCheckpoint(checkpoint_file, search_key, settings.get('resume', False))
+    if checkpoint.mismatch:
+        print(get_text('warning_checkpoint_mismatch', lang).format(checkpoint_file), file=sys.stderr)
+    if checkpoint.restorable and not settings.get('quiet'):
+        print(get_text('checkpoint_resuming', lang).format(checkpoint.restorable, checkpoint_file))
+    return checkpoint
+
+
+# --- Ergebnis-Export ---
+
+def output_format_for(path, output_format=None):
+    """Bestimmt das Format der Ergebnisdatei: explizit angegeben, sonst anhand der Endung."""
+    if output_format:
+        return output_format
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+class ProbeResultWriter:
+    """
+    Schreibt jede abgeschlossene Prüfung als eigenen Datensatz in eine Datei
+    (JSON Lines oder CSV), damit Auswertungen eine Suche schon während des Laufs
+    verarbeiten können. Es wird angehängt; geschrieben wird gepuffert und spätestens
+    alle FLUSH_INTERVAL Datensätze bzw. FLUSH_SECONDS Sekunden auf die Platte gebracht,
+    sodass auch ein abgebrochener Lauf seine Teilergebnisse hinterlässt.
+    Wird nur aus dem Thread aufgerufen, der die Ergebnisse einsammelt.
+    """
+
+    FIELDS = ('url', 'version', 'status', 'found', 'latency', 'size', 'etag', 'last_modified', 'cached', 'error', 'checked_at')
+    FLUSH_INTERVAL = 100
+    FLUSH_SECONDS = 2.0
+
+    def __init__(self, path, output_format=None):
+        self.path = path
+        self.format = output_format_for(path, output_format)
+        self.written = 0
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', encoding='utf-8', newline='')
+        self._csv = None
+        if self.format == 'csv':
+            self._csv = csv.writer(self._file)
+            if new_file:
+                self._csv.writerow(self.FIELDS)
+
+    @staticmethod
+    def version_of(url):
+        """Liest das Versionstupel aus dem Dateinamen einer URL (oder None)."""
+        match = re.search(r'(\d+\.\d+\.\d+(?:\.\d+)*)', url.rsplit('/', 1)[-1])
+        return tuple(int(part) for part in match.group(1).split('.')) if match else None
+
+    def write(self, probe):
+        version = self.version_of(probe.url)
+        record = {
+            'url': probe.url,
+            'version': list(version) if version else None,
+            'status': probe.status,
+            'found': probe.status == 200,
+            'latency': round(probe.latency, 4) if probe.latency is not None else None,
+            'size': probe.content_length,
+            'etag': probe.etag,
+            'last_modified': probe.last_modified,
+            'cached': probe.cached,
+            'error': probe.error,
+            'checked_at': round(time.time(), 3),
+        }
+        if self._csv is not None:
+            if version: record['version'] = '.'.join(map(str, version))
+            self._csv.writerow(['' if record[field] is None else record[field] for field in self.FIELDS])
+        else:
+            self._file.write(json.dumps(record) + "\n")
+        self.written += 1
+        self._unflushed += 1
+        if self._unflushed >= self.FLUSH_INTERVAL or time.monotonic() - self._last_flush >= self.FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def open_result_writer(settings):
+    """Öffnet die Ergebnisdatei, falls in den Einstellungen eine angegeben ist."""
+    output_file = settings.get('output_file')
+    if not output_file:
+        return None
+    return ProbeResultWriter(output_file, settings.get('output_format'))
+
+
+# --- Metriken ---
+
+class LatencyHistogram:
+    """Latenz-Histogramm mit festen Bucket-Grenzen (in Sekunden) wie bei Prometheus."""
+
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Letzter Eintrag: über der höchsten Grenze
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Näherungswert für das Quantil `q` (Obergrenze des Buckets, in dem es liegt)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def prometheus_lines(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum:.6f}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class ProbeMetrics:
+    """
+    Laufzeitmetriken der HEAD-Anfragen einer Suche: Latenz-Histogramme je Phase
+    ('connect' = Aufbau neuer Verbindungen inkl. DNS/TLS, 'ttfb' = bis zu den Antwort-Headern,
+    'total' = gesamte Anfrage), Durchsatz, gleichzeitig offene Anfragen sowie Anzahl nach
+    Statuscode und Fehlerklasse. Threadsicher; wird von allen Suchmodi befüllt.
+    `concurrency_limit` liefert bei Bedarf die aktuell erlaubte Parallelität.
+    """
+
+    PHASES = ('connect', 'ttfb', 'total')
+
+    def __init__(self, concurrency_limit=None):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.histograms = {phase: LatencyHistogram() for phase in self.PHASES}
+        self.statuses = {} # Statuscode -> Anzahl
+        self.errors = {} # Fehlerklasse (siehe failure_class) -> Anzahl
+        self.requests = 0
+        self.cached = 0
+        self.listing_pages = 0 # ListObjectsV2-Seiten (nicht in `requests` enthalten)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.concurrency_limit = concurrency_limit
+
+    def begin(self):
+        """Meldet den Start einer Anfrage (für die Anzahl gleichzeitig offener Anfragen)."""
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self, probe):
+        """Erfasst das Ergebnis einer mit begin() gestarteten Anfrage."""
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.histograms['total'].observe(probe.latency)
+            if probe.ttfb is not None:
+                self.histograms['ttfb'].observe(probe.ttfb)
+            if probe.status is not None:
+                self.statuses[probe.status] = self.statuses.get(probe.status, 0) + 1
+            else:
+                error_class = failure_class(probe)
+                self.errors[error_class] = self.errors.get(error_class, 0) + 1
+
+    def record_cached(self):
+        with self._lock:
+            self.cached += 1
+
+    def record_listing_page(self):
+        with self._lock:
+            self.listing_pages += 1
+
+    def observe_connect(self, seconds):
+        with self._lock:
+            self.histograms['connect'].observe(seconds)
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def throughput(self):
+        """Anfragen pro Sekunde seit Beginn der Suche."""
+        elapsed = self.elapsed()
+        return self.requests / elapsed if elapsed > 0 else 0.0
+
+    def render(self):
+        """Gibt die Metriken im Prometheus-Textformat zurück."""
+        with self._lock:
+            lines = [
+                '# HELP kindle_checker_probe_duration_seconds Dauer der HEAD-Anfragen je Phase.',
+                '# TYPE kindle_checker_probe_duration_seconds histogram',
+            ]
+            for phase in self.PHASES:
+                lines += self.histograms[phase].prometheus_lines('kindle_checker_probe_duration_seconds', f'phase="{phase}"')
+            lines += ['# HELP kindle_checker_probes_total Beantwortete Anfragen nach Statuscode.',
+                      '# TYPE kindle_checker_probes_total counter']
+            lines += [f'kindle_checker_probes_total{{status="{status}"}} {count}' for status, count in sorted(self.statuses.items())]
+            lines += ['# HELP kindle_checker_probe_errors_total Fehlgeschlagene Anfragen nach Fehlerklasse.',
+                      '# TYPE kindle_checker_probe_errors_total counter']
+            lines += [f'kindle_checker_probe_errors_total{{class="{error_class}"}} {count}' for error_class, count in sorted(self.errors.items())]
+            lines += [
+                '# TYPE kindle_checker_cache_hits_total counter',
+                f'kindle_checker_cache_hits_total {self.cached}',
+                '# TYPE kindle_checker_listing_pages_total counter',
+                f'kindle_checker_listing_pages_total {self.listing_pages}',
+                '# TYPE kindle_checker_in_flight gauge',
+                f'kindle_checker_in_flight {self.in_flight}',
+                '# TYPE kindle_checker_in_flight_peak gauge',
+                f'kindle_checker_in_flight_peak {self.peak_in_flight}',
+            ]
+            requests_done = self.requests
+        elapsed = self.elapsed()
+        if self.concurrency_limit is not None:
+            lines += ['# TYPE kindle_checker_concurrency_limit gauge', f'kindle_checker_concurrency_limit {self.concurrency_limit()}']
+        lines += [
+            '# TYPE kindle_checker_probes_per_second gauge',
+            f'kindle_checker_probes_per_second {requests_done / elapsed if elapsed > 0 else 0.0:.3f}',
+            '# TYPE kindle_checker_elapsed_seconds gauge',
+            f'kindle_checker_elapsed_seconds {elapsed:.3f}',
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Liefert die Metriken unter /metrics aus."""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Keine Zugriffsprotokolle auf der Konsole
+
+
+class MetricsExporter:
+    """
+    Stellt ProbeMetrics während einer Suche bereit: als HTTP-Endpunkt /metrics
+    (`listen` = '[HOST:]PORT', Standard-Host 127.0.0.1) und/oder als Datei im
+    Prometheus-Textformat, die alle `interval` Sekunden und am Ende atomar ersetzt wird
+    (z.B. für den Textfile-Collector des node_exporter).
+    """
+
+    def __init__(self, metrics, listen=None, path=None, interval=DEFAULT_METRICS_INTERVAL):
+        self.metrics = metrics
+        self.path = path
+        self.interval = max(0.1, interval)
+        self._server = None
+        self._stop = threading.Event()
+        self._threads = []
+        if listen is not None:
+            host, _, port = str(listen).rpartition(':')
+            self._server = ThreadingHTTPServer((host or '127.0.0.1', int(port)), _MetricsRequestHandler)
+            self._server.daemon_threads = True
+            self._server.metrics = metrics
+            self._start(self._server.serve_forever)
+        if path:
+            self._start(self._dump_periodically)
+
+    @property
+    def address(self):
+        """Tatsächliche Adresse (host, port) des HTTP-Endpunkts oder None."""
+        return self._server.server_address if self._server is not None else None
+
+    def _start(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _dump_periodically(self):
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def dump(self):
+        """Schreibt die aktuellen Metriken in die Datei (über eine temporäre Datei)."""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.metrics.render())
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        if self.path:
+            self.dump()
+
+
+def open_metrics_exporter(settings, metrics):
+    """
+    Startet den Metrik-Export, falls in den Einstellungen ein Endpunkt oder eine Datei
+    angegeben ist. Ist der Port belegt, wird ohne Endpunkt weitergesucht.
+    """
+    listen = settings.get('metrics_listen')
+    path = settings.get('metrics_file')
+    if listen is None and not path:
+        return None
+    interval = settings.get('metrics_interval', DEFAULT_METRICS_INTERVAL)
+    try:
+        return MetricsExporter(metrics, listen, path, interval)
+    except (OSError, ValueError) as e:
+        print(get_text('warning_metrics_unavailable', settings['language']).format(listen, e), file=sys.stderr)
+        return MetricsExporter(metrics, None, path, interval) if path else None
+
+
+class SearchContext:
+    """
+    Bündelt die gemeinsam genutzten Ressourcen einer Suche (SessionPool, Ratenbegrenzer,
+    Ergebnis-Cache, Checkpoint, Ergebnisdatei, Metriken) und die Anfrage-Einstellungen. Selbst angelegte Ressourcen
+    werden mit close() freigegeben. `search_key` beschreibt die Suche für den Checkpoint.
+    Ein übergebener `limiter` (z.B. der gemeinsame Token-Bucket von Suche und Download)
+    ersetzt den eigenen Ratenbegrenzer.
+    """
+
+    def __init__(self, settings, sessions=None, search_key="", limiter=None):
+        self.settings = settings
+        self.timeout = settings['timeout']
+        self.metrics = ProbeMetrics(lambda: self.concurrency_limit(self.controller.maximum))
+        self._owns_sessions = sessions is None
+        self.sessions = sessions if sessions is not None else create_session_pool(settings, self.metrics)
+        self.limiter = limiter if limiter is not None else create_rate_limiter(settings)
+        self.start_controller(1) # Sequenziell nur Backoff; parallele Engines setzen ihr Maximum
+        self.throttle_retries = settings.get('throttle_retries', DEFAULT_THROTTLE_RETRIES)
+        self.retried = 0 # Wiederholte Anfragen nach Drosselung oder Fehlern
+        self.unresolved = [] # (URL, Fehlerklasse) ohne endgültige Antwort
+        self.changed = [] # (URL, bekannter Treffer, neue Antwort) ersetzter Dateien
+        self.revalidate = settings.get('revalidate', DEFAULT_REVALIDATE)
+        self._attempts = {} # URL -> Anzahl Wiederholungen
+        self._throttled_queue = deque() # Gedrosselte URLs, vorrangig nach dem Backoff
+        self._failed_queue = deque() # Fehlgeschlagene URLs, wenn gerade nichts Neues ansteht
+        self.completed = False
+        self.cache = self.checkpoint = self.writer = self.exporter = None
+        try:
+            self.cache = open_probe_cache(settings)
+            self.checkpoint = open_search_checkpoint(settings, search_key)
+            self.writer = open_result_writer(settings)
+            self.exporter = open_metrics_exporter(settings, self.metrics)
+        except BaseException:
+            self.close() # Bereits geöffnete Dateien/Verbindungen nicht liegen lassen
+            raise
+
+    def lookup(self, url):
+        """Bekanntes Ergebnis aus Checkpoint oder Cache (mit `revalidate` keine Cache-Treffer) oder None."""
+        if self.checkpoint is not None:
+            probe = self.checkpoint.lookup(url)
+            if probe is not None:
+                return probe
+        if self.cache is not None:
+            probe = self.cache.lookup(url)
+            if probe is not None and not (self.revalidate and probe.status == 200):
+                if self.checkpoint is not None: self.checkpoint.store(probe)
+                return probe
+        return None
+
+    def validators(self, url):
+        """Bekannter Treffer aus dem Ergebnis-Cache für eine bedingte Anfrage (oder None)."""
+        if self.cache is None:
+            return None
+        return self.cache.validators(url)
+
+    def note_change(self, known, probe):
+        """Merkt sich eine bekannte Datei, die laut `probe` ersetzt wurde."""
+        if firmware_changed(known, probe):
+            self.changed.append((probe.url, known, probe))
+
+    def remember(self, probe):
+        """Legt ein frisch geprüftes Ergebnis im Ergebnis-Cache und im Checkpoint ab."""
+        if self.cache is not None:
+            self.cache.store(probe)
+        if self.checkpoint is not None:
+            self.checkpoint.store(probe)
+
+    def before_probe(self, url):
+        """Gibt (bekanntes Ergebnis, None) oder (None, Validatoren für die bedingte Anfrage) zurück."""
+        known = self.lookup(url)
+        if known is not None:
+            self.metrics.record_cached()
+            return known, None
+        return None, self.validators(url)
+
+    def after_probe(self, validators, probe):
+        """Zählt eine abgeschlossene Anfrage und legt das Ergebnis in Cache und Checkpoint ab."""
+        self.metrics.finish(probe)
+        self.note_change(validators, probe)
+        self.remember(probe)
+        return probe
+
+    def start_controller(self, maximum, initial=ADAPTIVE_INITIAL_CONCURRENCY):
+        """Legt den ConcurrencyController für eine Engine mit `maximum` gleichzeitigen Anfragen an."""
+        self.controller = ConcurrencyController(
+            maximum, initial, self.settings.get('adaptive_concurrency', DEFAULT_ADAPTIVE_CONCURRENCY)
+        )
+        return self.controller
+
+    def concurrency_limit(self, ceiling):
+        """Aktuell erlaubte Anzahl gleichzeitiger Anfragen (höchstens `ceiling`)."""
+        if not self.controller.adaptive:
+            return ceiling
+        return min(ceiling, self.controller.current)
+
+    def should_retry(self, probe):
+        """
+        Meldet ein Ergebnis an den ConcurrencyController und reiht gedrosselte bzw. fehlgeschlagene
+        URLs erneut ein (True). Nach zu vielen Versuchen landen sie in `unresolved`.
+        """
+        self.controller.on_result(probe)
+        error_class = failure_class(probe)
+        if error_class is None:
+            self._attempts.pop(probe.url, None)
+            return False
+        if error_class == 'throttled':
+            limit, queue = self.throttle_retries, self._throttled_queue
+        else:
+            limit, queue = ERROR_RETRY_LIMITS[error_class], self._failed_queue
+        attempts = self._attempts.get(probe.url, 0)
+        if attempts >= limit:
+            self._attempts.pop(probe.url, None)
+            self.unresolved.append((probe.url, error_class))
+            return False
+        self._attempts[probe.url] = attempts + 1
+        self.retried += 1
+        queue.append(probe.url)
+        return True
+
+    def next_url(self, url_iter):
+        """Nächste URL: gedrosselte Wiederholungen, dann neue URLs, zuletzt fehlgeschlagene (oder None)."""
+        if self._throttled_queue:
+            return self._throttled_queue.popleft()
+        url = next(url_iter, None)
+        if url is None and self._failed_queue:
+            return self._failed_queue.popleft()
+        return url
+
+    def complete(self):
+        """Markiert die Suche als vollständig (ohne ungeklärte URLs entfernt close() den Checkpoint)."""
+        self.completed = not self.unresolved
+
+    def record_probe(self, probe):
+        """Hält ein abgeschlossenes Prüfergebnis in der Ergebnisdatei fest (falls aktiv)."""
+        if self.writer is not None:
+            self.writer.write(probe)
+
+    def close(self):
+        if self._owns_sessions:
+            self.sessions.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.checkpoint is not None:
+            if self.completed:
+                self.checkpoint.discard()
+            else:
+                self.checkpoint.close()
+                print(get_text('checkpoint_saved', self.settings['language']).format(self.checkpoint.path), file=sys.stderr)
+        if self.writer is not None:
+            self.writer.close()
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+def probe_for_search(full_url, context):
+    """Prüft eine URL im Rahmen einer Suche (über Checkpoint/Cache und Ratenlimit)."""
+    known, validators = context.before_probe(full_url)
+    if known is not None:
+        return known
+    if context.limiter is not None:
+        context.limiter.acquire()
+    context.metrics.begin()
+    return context.after_probe(validators, probe_url(full_url, context.timeout, context.sessions, validators))
+
+
+def iter_probe_results_sequential(urls, context):
+    """Prüft URLs nacheinander und liefert (url, ProbeResult) mit der endgültigen Antwort."""
+    if context.settings.get('http_engine') == 'pipelined':
+        yield from iter_probe_results_pipelined(urls, context, 1)
+        return
+    url_iter = iter(urls)
+    while True:
+        time.sleep(context.controller.backoff_remaining())
+        url = context.next_url(url_iter)
+        if url is None:
+            return
+        probe = probe_for_search(url, context)
+        if not context.should_retry(probe):
+            yield url, probe
+
+
+def generate_firmware_urls(base_url, filename_pattern, version_range, lang):
+    """
+    Generator-Funktion, die alle zu prüfenden URLs basierend auf dem Versionsbereich
+    (Tupel-Paar oder VersionSpace, z.B. ein Ausschnitt ab einem Fortsetzungspunkt) erzeugt.
+    """
+    space = version_range if isinstance(version_range, VersionSpace) else VersionSpace(version_range)
+    for major, minor, patch in space:
+        version = f"{major}.{minor}.{patch}"
+        try:
+            test_filename = filename_pattern.replace("*", version)
+            yield f"{base_url}{test_filename}"
+        except AttributeError:
+            print(get_text('error_invalid_pattern', lang).format(filename_pattern, version), file=sys.stderr)
+            continue
+
+
+def extract_version_key(filename, lang):
+    """
+    Extrahiert ein Versionsobjekt aus einem Dateinamen für die Sortierung.
+    """
+    match = re.search(r'(\d+\.\d+\.\d+(?:\.\d+)*)', filename)
+    if match:
+        try:
+            return pkg_version.parse(match.group(1))
+        except pkg_version.InvalidVersion:
+            print(get_text('warning_invalid_version_format', lang).format(filename), file=sys.stderr)
+            return pkg_version.parse("0.0.0")
+    else:
+         print(get_text('warning_no_version_for_sort', lang).format(filename), file=sys.stderr)
+         return pkg_version.parse("0.0.0")
+
+
+def sort_firmwares_by_version(firmware_list, lang):
+    """
+    Sortiert eine Liste von Firmware-Dateinamen numerisch nach ihrer Version.
+    """
+    if not firmware_list:
+        return []
+    try:
+        # Verwende eine Lambda-Funktion, um die Sprache an extract_version_key zu übergeben
+        firmware_list.sort(key=lambda fname: extract_version_key(fname, lang))
+        return firmware_list
+    except Exception as e:
+        print(get_text('error_sorting_list', lang).format(e), file=sys.stderr)
+        return firmware_list
+
+# --- Suchstrategien ---
+
+class PrunedVersionWalker:
+    """
+    URL-Quelle für die Suchstrategie 'pruned': Statt das volle Raster aus Minor 0..99
+    und Patch 0..25 abzufragen, wird anhand der bisherigen Ergebnisse ausgedünnt:
+
+    - Pro Minor werden zuerst nur die ersten `probe_patches` Patches geprüft (.0 - .3).
+      Ist dort nichts vorhanden, gilt die Minor als leer.
+    - Nach einem Treffer wird weitergesucht, bis `max_misses` Patches in Folge
+      hinter dem letzten Treffer fehlen.
+    - Nach `max_empty_minors` leeren Minors in Folge wird die Major-Version beendet.
+
+    Der Iterator liefert nur URLs, die aktuell geprüft werden können. Ergebnisse werden
+    über record() zurückgemeldet; danach können wieder neue URLs bereitstehen. Ein
+    StopIteration bedeutet also nur "im Moment nichts zu tun", solange noch Anfragen offen sind.
+    """
+
+    def __init__(self, base_url, filename_pattern, version_range, probe_patches, max_misses, max_empty_minors):
+        self.base_url = base_url
+        self.filename_pattern = filename_pattern
+        self.probe_patches = max(1, probe_patches)
+        self.max_misses = max(0, max_misses)
+        self.max_empty_minors = max(1, max_empty_minors)
+        self.probes_issued = 0
+        self._patch_ranges = VersionSpace(version_range).patch_ranges()
+        self._active = [] # Minors in aufsteigender Reihenfolge, die gerade geprüft werden
+        self._by_url = {}
+        self._stopped_major = None
+        self._current_major = None
+        self._empty_run = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self._advance()
+        for state in self._active:
+            if state['next_patch'] <= state['limit']:
+                patch = state['next_patch']
+                state['next_patch'] += 1
+                state['pending'] += 1
+                version = f"{state['major']}.{state['minor']}.{patch}"
+                url = f"{self.base_url}{self.filename_pattern.replace('*', version)}"
+                self._by_url[url] = (state, patch)
+                self.probes_issued += 1
+                return url
+        raise StopIteration
+
+    def record(self, url, result):
+        """Meldet das Ergebnis einer zuvor gelieferten URL zurück."""
+        entry = self._by_url.pop(url, None)
+        if entry is None:
+            return
+        state, patch = entry
+        state['pending'] -= 1
+        if isinstance(result, str): # Gefunden
+            state['has_hit'] = True
+            if not state['stopped']:
+                state['limit'] = min(max(state['limit'], patch + self.max_misses), state['max_patch'])
+
+    def _is_resolved(self, state):
+        return state['pending'] == 0 and state['next_patch'] > state['limit']
+
+    def _advance(self):
+        # Abgeschlossene Minors in Reihenfolge auswerten
+        while self._active and self._is_resolved(self._active[0]):
+            state = self._active.pop(0)
+            if state['major'] != self._current_major:
+                self._current_major = state['major']
+                self._empty_run = 0
+            if state['has_hit']:
+                self._empty_run = 0
+                continue
+            self._empty_run += 1
+            if self._empty_run >= self.max_empty_minors and self._stopped_major != state['major']:
+                self._stopped_major = state['major']
+                # Bereits angefangene Minors derselben Major nicht weiter ausbauen
+                for other in self._active:
+                    if other['major'] == state['major']:
+                        other['stopped'] = True
+                        other['limit'] = other['next_patch'] - 1
+
+        # Neue Minors aktivieren (begrenzter Vorgriff, damit parallel geprüft werden kann)
+        while len(self._active) < self.max_empty_minors:
+            next_range = next(self._patch_ranges, None)
+            if next_range is None:
+                return
+            major, minor, min_patch, max_patch = next_range
+            if major == self._stopped_major:
+                continue
+            self._active.append({
+                'major': major, 'minor': minor, 'max_patch': max_patch,
+                'next_patch': min_patch, 'limit': min(min_patch + self.probe_patches - 1, max_patch),
+                'pending': 0, 'has_hit': False, 'stopped': False,
+            })
+
+
+class LikelyVersionScheduler:
+    """
+    URL-Quelle für die Suchstrategie 'likely': Alle Kandidaten des Bereichs werden
+    nach geschätzter Wahrscheinlichkeit statt aufsteigend geliefert. Wahrscheinlich sind
+    kleine Patch-Nummern und Versionen nahe an bekannten Versionen ("Anker": Beispieldatei,
+    Build-Hinweise und jeder Treffer der laufenden Suche). Ein neuer Treffer legt nur seine
+    Nachbarn (Patches derselben Minor, benachbarte Minors, nächste Major) mit ihrer Bewertung
+    zusätzlich in den Heap; veraltete Einträge bereits gelieferter Versionen werden beim
+    Entnehmen übersprungen. Mit einem Budget (ProbeBudget) liefert die Suche so in wenigen
+    Prozent der Anfragen die meisten Treffer.
+
+    Der übrige Bereich wird nicht vorab aufgezählt: Pro Major.Minor-Kombination liegt nur
+    ihr nächster Patch im Heap (k-Wege-Mischen), bewertet nach dem Abstand zu den Start-Ankern.
+    Zusätzliche Versionsebenen (BuildLevelExpander) werden über add() mit eigener Bewertung eingereiht.
+    """
+
+    def __init__(self, base_url, filename_pattern, version_range, anchors):
+        self.base_url = base_url
+        self.filename_pattern = filename_pattern
+        self._space = VersionSpace(version_range)
+        self._anchors = {tuple(anchor[:3]) for anchor in anchors
+                         if len(anchor) >= 3 and tuple(anchor[:3]) in self._space}
+        self._issued = set()
+        self._heap = []
+        self._counter = itertools.count() # Eindeutiger Gleichstand-Brecher, damit Einträge nie verglichen werden
+        for major, minor, first_patch, last_patch in self._space.patch_ranges():
+            offset = self._minor_distance(major, minor)
+            self._push(offset + first_patch, (major, minor, first_patch), (offset, last_patch))
+        for anchor in self._anchors:
+            self._push_neighbours(anchor)
+
+    def score(self, version):
+        """Geschätzte Unwahrscheinlichkeit (kleiner = früher prüfen)."""
+        if not self._anchors:
+            major, minor, patch = version
+            return patch + LIKELY_MINOR_WEIGHT * minor + LIKELY_MAJOR_WEIGHT * major
+        return min(self._distance(version, anchor) for anchor in self._anchors)
+
+    @staticmethod
+    def _distance(version, anchor):
+        major, minor, patch = version
+        anchor_major, anchor_minor, anchor_patch = anchor
+        if (major, minor) == (anchor_major, anchor_minor):
+            return min(patch, abs(patch - anchor_patch)) # Nachbarn des Ankers und Patch .0 ff.
+        return patch + LIKELY_MINOR_WEIGHT * abs(minor - anchor_minor) + LIKELY_MAJOR_WEIGHT * abs(major - anchor_major)
+
+    def _minor_distance(self, major, minor):
+        """Bewertung von Patch .0 einer Major.Minor-Kombination gegenüber den Start-Ankern."""
+        return self.score((major, minor, 0))
+
+    def _push(self, score, version, run=None):
+        heapq.heappush(self._heap, (score, version, next(self._counter), run))
+
+    def _push_neighbours(self, anchor):
+        """Legt die Patches der Anker-Minor, der benachbarten Minors und von Minor 0 der nächsten Major in den Heap."""
+        major, minor, _ = anchor
+        for neighbour_major, neighbour_minor in ((major, minor), (major, minor - 1), (major, minor + 1), (major + 1, 0)):
+            for patch in range(MAX_PATCH + 1):
+                version = (neighbour_major, neighbour_minor, patch)
+                if version not in self._issued and version in self._space:
+                    self._push(self._distance(version, anchor), version)
+
+    def add(self, version, score):
+        """Reiht einen zusätzlichen Kandidaten (z.B. eine vierstellige Version) mit eigener Bewertung ein."""
+        if version not in self._issued:
+            self._push(score, tuple(version))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while self._heap:
+            _, version, _, run = heapq.heappop(self._heap)
+            if run is not None: # Nächsten Patch derselben Major.Minor nachlegen
+                offset, last_patch = run
+                major, minor, patch = version
+                if patch < last_patch:
+                    self._push(offset + patch + 1, (major, minor, patch + 1), run)
+            if version not in self._issued:
+                self._issued.add(version)
+                return f"{self.base_url}{self.filename_pattern.replace('*', '.'.join(map(str, version)))}"
+        raise StopIteration
+
+    def record(self, url, result):
+        """Treffer werden zu Ankern; nur ihre Nachbarn werden zusätzlich eingereiht."""
+        if not isinstance(result, str):
+            return
+        version = version_from_url(url, self.base_url, self.filename_pattern)
+        if version is None or len(version) < 3 or version[:3] in self._anchors:
+            return
+        self._anchors.add(version[:3])
+        self._push_neighbours(version[:3])
+
+
+class ProbeBudget:
+    """
+    Begrenzt eine URL-Quelle auf höchstens `budget` Kandidaten und/oder bis zum Zeitpunkt
+    `deadline` (time.monotonic). Danach liefert sie keine neuen URLs mehr; laufende Anfragen
+    und Wiederholungen werden noch abgeschlossen und die Suche endet mit den bis dahin
+    gefundenen Dateien.
+    """
+
+    def __init__(self, urls, feedback, budget, deadline, lang, quiet=False):
+        self._urls = iter(urls)
+        self._feedback = feedback
+        self.budget = budget
+        self.deadline = deadline
+        self.issued = 0
+        self.exhausted = False
+        self._lang = lang
+        self._quiet = quiet
+
+    @property
+    def added_checks(self):
+        return getattr(self._feedback, 'added_checks', 0)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.exhausted:
+            if (self.budget and self.issued >= self.budget) or (self.deadline and time.monotonic() >= self.deadline):
+                self.exhausted = True
+                if not self._quiet:
+                    print(get_text('budget_exhausted', self._lang).format(self.issued), file=sys.stderr)
+        if self.exhausted:
+            raise StopIteration
+        url = next(self._urls)
+        self.issued += 1
+        return url
+
+    def record(self, url, result):
+        if self._feedback is not None:
+            self._feedback.record(url, result)
+
+
+class BuildLevelExpander:
+    """
+    Erweitert eine URL-Quelle um weitere Versionsebenen (z.B. 5.6.1.1 oder 5.16.2.1.1).
+    Eine Ebene wird nur unterhalb eines Präfixes aufgeklappt, das als Hinweis (`build_hints`)
+    konfiguriert ist oder - bei `max_depth` > 3 - bereits gefunden wurde; so vervielfacht sich
+    der Suchraum nicht mit jeder zusätzlichen Ebene. Eine fünfstellige Version wie 5.16.2.1.1
+    wird daher nur erreicht, wenn ihr vierstelliger Präfix 5.16.2.1 existiert oder als Hinweis
+    angegeben ist.
+    Aufgeklappte Kandidaten werden vor den restlichen URLs der Basisquelle geliefert; bei der
+    Strategie 'likely' werden sie stattdessen mit eigener Bewertung in deren Heap eingereiht,
+    damit sie ein Budget nicht vor wahrscheinlicheren dreistelligen Kandidaten aufbrauchen.
+    """
+
+    def __init__(self, base_urls, base_feedback, base_url, filename_pattern, version_range, build_hints, max_build, max_depth):
+        self.base_url = base_url
+        self.filename_pattern = filename_pattern
+        self.max_build = max(0, max_build)
+        self.max_depth = max(3, max_depth)
+        self.added_checks = 0 # Zusätzliche Kandidaten außerhalb des 3-stelligen Rasters
+        self._base = iter(base_urls)
+        self._base_feedback = base_feedback
+        self._scheduler = base_feedback if isinstance(base_feedback, LikelyVersionScheduler) else None
+        self._queue = deque()
+        self._expanded = set()
+        start_version, end_version = version_range
+        for hint in build_hints or ():
+            hint = tuple(hint)
+            if len(hint) >= 3 and tuple(start_version) <= hint[:3] <= tuple(end_version):
+                self._expand(hint) # Hinweise unabhängig von max_depth
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._queue:
+            return self._queue.popleft()
+        return next(self._base)
+
+    def record(self, url, result):
+        """Meldet ein Ergebnis zurück; Treffer klappen die nächste Versionsebene auf."""
+        if self._base_feedback is not None:
+            self._base_feedback.record(url, result)
+        if isinstance(result, str): # Gefunden
+            version = version_from_url(url, self.base_url, self.filename_pattern)
+            if version is not None and len(version) < self.max_depth:
+                self._expand(version)
+
+    def _expand(self, prefix):
+        if prefix in self._expanded:
+            return
+        self._expanded.add(prefix)
+        prefix_str = ".".join(map(str, prefix))
+        for build in range(self.max_build + 1):
+            if self._scheduler is not None:
+                self._scheduler.add(tuple(prefix) + (build,), LIKELY_BUILD_WEIGHT * (build + 1))
+            else:
+                self._queue.append(f"{self.base_url}{self.filename_pattern.replace('*', f'{prefix_str}.{build}')}")
+            self.added_checks += 1
+
+
+def version_from_url(url, base_url, filename_pattern):
+    """
+    Liest das Versionstupel (beliebig viele Stellen) aus einer Kandidaten-URL,
+    indem Basis-URL sowie Präfix und Suffix des Dateinamenmusters entfernt werden.
+    Gibt None zurück, wenn die URL nicht zum Muster passt.
+    """
+    if not url.startswith(base_url) or filename_pattern.count("*") != 1:
+        return None
+    prefix, suffix = filename_pattern.split("*")
+    filename = url[len(base_url):]
+    if not filename.startswith(prefix) or not filename.endswith(suffix):
+        return None
+    version_str = filename[len(prefix):len(filename) - len(suffix)]
+    try:
+        return tuple(int(part) for part in version_str.split("."))
+    except ValueError:
+        return None
+
+
+def get_build_hints(example_filename):
+    """
+    Leitet Hinweise für tiefere Versionsebenen aus einem Beispiel-Dateinamen ab:
+    Aus 'update_kindle_5.16.2.1.1.bin' werden die Präfixe (5, 16, 2) und (5, 16, 2, 1).
+    """
+    if not example_filename:
+        return []
+    match = re.search(r'(\d+\.\d+\.\d+(?:\.\d+)*)', example_filename)
+    if not match:
+        return []
+    parts = tuple(int(part) for part in match.group(1).split("."))
+    return [parts[:depth] for depth in range(3, len(parts))]
+
+
+def get_version_anchors(example_filename):
+    """Version des Beispiel-Dateinamens als Anker für die Strategie 'likely' (leer, wenn keine erkannt wird)."""
+    match = re.search(r'(\d+\.\d+\.\d+(?:\.\d+)*)', example_filename or '')
+    return [tuple(int(part) for part in match.group(1).split("."))] if match else []
+
+
+def create_url_source(base_url, filename_pattern, version_range, settings, build_hints=None, anchors=None, context=None):
+    """
+    Erstellt die URL-Quelle für die eingestellte Suchstrategie.
+    Gibt (urls, feedback) zurück; feedback ist None, wenn die Quelle keine
+    Rückmeldung braucht, sonst ein Objekt, dem jedes Ergebnis per record() gemeldet wird
+    (PrunedVersionWalker und/oder BuildLevelExpander, bzw. ListedFirmwareSource, wenn
+    der Bucket das Auflisten erlaubt - siehe discover_firmware_urls; `context` ist der
+    SearchContext, über den das Listing läuft).
+    """
+    lang = settings['language']
+    listed_urls = discover_firmware_urls(base_url, filename_pattern, version_range, settings, context)
+    if listed_urls is not None:
+        source = ListedFirmwareSource(listed_urls, calculate_total_checks(version_range))
+        return _apply_budget(source, source, settings)
+    strategy = settings.get('search_strategy', DEFAULT_SEARCH_STRATEGY)
+    if strategy == 'pruned':
+        urls = feedback = PrunedVersionWalker(
+            base_url, filename_pattern, version_range,
+            settings.get('prune_probe_patches', DEFAULT_PRUNE_PROBE_PATCHES),
+            settings.get('prune_max_misses', DEFAULT_PRUNE_MAX_MISSES),
+            settings.get('prune_max_empty_minors', DEFAULT_PRUNE_MAX_EMPTY_MINORS),
+        )
+    elif strategy == 'likely':
+        anchors = list(anchors or []) + list(build_hints or []) + list(settings.get('build_hints', []))
+        urls = feedback = LikelyVersionScheduler(base_url, filename_pattern, version_range, anchors)
+    else:
+        urls, feedback = generate_firmware_urls(base_url, filename_pattern, version_range, lang), None
+
+    max_depth = settings.get('max_version_depth', DEFAULT_MAX_VERSION_DEPTH)
+    hints = list(build_hints or []) + list(settings.get('build_hints', []))
+    if max_depth > 3 or hints:
+        urls = feedback = BuildLevelExpander(
+            urls, feedback, base_url, filename_pattern, version_range, hints,
+            settings.get('max_build', DEFAULT_MAX_BUILD), max_depth,
+        )
+    return _apply_budget(urls, feedback, settings)
+
+
+def _apply_budget(urls, feedback, settings):
+    """Umhüllt die URL-Quelle mit einem ProbeBudget, falls ein Anfrage- oder Zeitbudget eingestellt ist."""
+    budget = settings.get('probe_budget', DEFAULT_PROBE_BUDGET)
+    time_budget = settings.get('time_budget', DEFAULT_TIME_BUDGET)
+    if not budget and not time_budget:
+        return urls, feedback
+    deadline = time.monotonic() + time_budget if time_budget else None
+    source = ProbeBudget(urls, feedback, budget, deadline, settings['language'], settings.get('quiet', False))
+    return source, source
+
+
+# --- Bucket-Listing (S3 ListObjectsV2) ---
+
+_listing_denied = set() # Listing-URLs, die das Auflisten verweigert haben (einmal pro Prozess versuchen)
+
+
+def listing_request(base_url, filename_pattern):
+    """
+    Leitet aus einer S3-URL (Pfad-Stil 'https://s3.amazonaws.com/BUCKET/...' oder
+    virtueller Host 'https://BUCKET.s3.amazonaws.com/...') die ListObjectsV2-URL des
+    Buckets, den Schlüssel-Präfix der Basis-URL und den Präfix für das Listing
+    (Basis + Dateiname vor dem '*') ab. Gibt (list_url, key_prefix, prefix) zurück.
+    """
+    parts = urlsplit(base_url)
+    path = parts.path.lstrip('/')
+    if re.match(r'^[^.]+\.s3[.-]', parts.netloc.lower()): # Virtueller Host: Bucket steckt im Hostnamen
+        list_url, key_prefix = f"{parts.scheme}://{parts.netloc}/", path
+    else:
+        bucket, _, key_prefix = path.partition('/')
+        list_url = f"{parts.scheme}://{parts.netloc}/{bucket}/"
+    return list_url, key_prefix, key_prefix + filename_pattern.split('*', 1)[0]
+
+
+def _xml_name(tag):
+    """Elementname ohne XML-Namensraum."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def list_bucket_keys(list_url, prefix, settings, sessions, limiter=None, metrics=None):
+    """
+    Listet alle Schlüssel unter `prefix` seitenweise per ListObjectsV2 und liest das XML
+    dabei blockweise (XMLPullParser), ohne die Antwort vollständig im Speicher zu halten.
+    Jede Seite wartet auf ein Token von `limiter` und wird in `metrics` gezählt (beide optional).
+    Gibt (Liste der Schlüssel, Anzahl Seiten) zurück oder None, wenn das Listing verweigert
+    wird (403/404/...) bzw. keine ListObjectsV2-Antwort kommt.
+    """
+    keys = []
+    pages = 0
+    token = None
+    while True:
+        params = {'list-type': '2', 'prefix': prefix, 'max-keys': str(LISTING_PAGE_SIZE)}
+        if token: params['continuation-token'] = token
+        if limiter is not None:
+            limiter.acquire()
+        if metrics is not None:
+            metrics.record_listing_page()
+        start = time.perf_counter()
+        page_keys = len(keys)
+        try:
+            with sessions.get().get(list_url, params=params, timeout=settings['timeout'], stream=True) as response:
+                if response.status_code != 200:
+                    return None
+                parser = ElementTree.XMLPullParser(events=('start', 'end'))
+                root, truncated, token = None, False, None
+                for block in response.iter_content(DOWNLOAD_BLOCK_SIZE):
+                    parser.feed(block)
+                    for event, element in parser.read_events():
+                        name = _xml_name(element.tag)
+                        if event == 'start':
+                            if root is None: root = name
+                            continue
+                        if name == 'Key':
+                            keys.append(element.text or '')
+                        elif name == 'IsTruncated':
+                            truncated = (element.text or '').strip().lower() == 'true'
+                        elif name == 'NextContinuationToken':
+                            token = element.text
+                        elif name == 'Contents':
+                            element.clear() # Verarbeitete Einträge sofort freigeben
+                parser.close()
+        except (requests.exceptions.RequestException, ElementTree.ParseError):
+            return None
+        if root != 'ListBucketResult':
+            return None
+        pages += 1
+        if settings.get('verbose') and not settings.get('quiet'):
+            print(get_text('listing_page', settings['language']).format(pages, len(keys) - page_keys, (time.perf_counter() - start) * 1000))
+        if not truncated or not token:
+            return keys, pages
+
+
+def discover_firmware_urls(base_url, filename_pattern, version_range, settings, context=None):
+    """
+    Ermittelt die vorhandenen Firmware-Dateien eines Modells per Bucket-Listing statt
+    per Raten: Schlüssel, die zum Muster passen und im Versionsbereich liegen (mit beliebig
+    vielen Versionsstellen - das Listing kostet dafür keine Anfragen), aufsteigend sortiert als URLs.
+    Gibt None zurück, wenn das Listing nicht erlaubt ist (dann wird wie bisher geprüft).
+    Mit `context` (SearchContext) laufen die Seiten über dessen SessionPool und Ratenbegrenzer
+    und werden in dessen Metriken gezählt.
+    """
+    if settings.get('discovery', DEFAULT_DISCOVERY) != 'auto' or filename_pattern.count('*') != 1:
+        return None
+    list_url, key_prefix, prefix = listing_request(base_url, filename_pattern)
+    if list_url in _listing_denied:
+        return None
+    if context is not None:
+        listing = list_bucket_keys(list_url, prefix, settings, context.sessions, context.limiter, context.metrics)
+    else:
+        with create_session_pool(settings) as sessions:
+            listing = list_bucket_keys(list_url, prefix, settings, sessions, create_rate_limiter(settings))
+    if listing is None:
+        _listing_denied.add(list_url)
+        return None
+    keys, pages = listing
+    name_prefix, suffix = filename_pattern.split('*')
+    version_pattern = re.compile(re.escape(key_prefix + name_prefix) + r'(\d+(?:\.\d+){2,})' + re.escape(suffix))
+    start_version, end_version = tuple(version_range[0]), tuple(version_range[1])
+    found = []
+    for key in keys:
+        match = version_pattern.fullmatch(key)
+        if not match:
+            continue
+        version = tuple(int(part) for part in match.group(1).split('.'))
+        if start_version <= version[:3] <= end_version:
+            found.append((version, f"{base_url}{key[len(key_prefix):]}"))
+    if not settings.get('quiet'):
+        print(get_text('listing_used', settings['language']).format(len(found), pages, list_url))
+    return [url for _, url in sorted(found)]
+
+
+class ListedFirmwareSource:
+    """
+    URL-Quelle aus einem Bucket-Listing: nur die gelisteten Dateien, die zur Bestätigung
+    (ETag, Cache, Ergebnisdatei) wie gewohnt per HEAD geprüft werden. `added_checks`
+    korrigiert die geplanten Prüfungen vom vollständigen Raster auf die gelisteten Dateien.
+    """
+
+    def __init__(self, urls, grid_checks):
+        self._urls = iter(urls)
+        self.listed = len(urls)
+        self.added_checks = len(urls) - grid_checks
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._urls)
+
+    def record(self, url, result):
+        pass
+
+
+def _planned_checks(total_checks, feedback):
+    """Anzahl der geplanten Prüfungen inklusive aufgeklappter Versionsebenen."""
+    return total_checks + getattr(feedback, 'added_checks', 0)
+
+
+def _print_probe_savings(checks_done, total_checks, lang):
+    """Gibt aus, wie viele Anfragen durch das Ausdünnen eingespart wurden."""
+    saved = total_checks - checks_done
+    saved_percent = (saved / total_checks) * 100 if total_checks > 0 else 0
+    print(get_text('pruning_summary', lang).format(checks_done, total_checks, saved, saved_percent))
+
+
+# --- Suchfunktionen ---
+
+# --- Fortschrittsanzeige ---
+
+class ProgressReporter:
+    """
+    Zeichnet die Fortschrittszeile (Stand, Treffer, Rate, Restzeit) in einem eigenen Thread
+    alle PROGRESS_INTERVAL Sekunden neu, statt bei jeder Prüfung auf die Konsole zu schreiben.
+    Die Suchschleife setzt nur die Zähler `done` und `found` (update); Meldungen wie
+    Treffer laufen über message(), damit sie die Fortschrittszeile sauber überschreiben.
+    Ohne Terminal (Umleitung in Datei/Pipe), im ausführlichen oder stillen Modus bleibt
+    die Anzeige aus. `total` liefert die aktuell geplante Anzahl Prüfungen.
+    """
+
+    def __init__(self, settings, total, stream=None):
+        self.lang = settings['language']
+        self.total = total
+        self.stream = stream or sys.stdout
+        self.done = 0
+        self.found = 0
+        isatty = getattr(self.stream, 'isatty', None)
+        self.enabled = not settings.get('verbose') and not settings.get('quiet') and bool(isatty and isatty())
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._line_length = 0
+        self._samples = deque() # (Zeitpunkt, done) für die Rate im Zeitfenster
+
+    def start(self):
+        if self.enabled:
+            self._samples.append((time.monotonic(), self.done))
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def update(self, done, found):
+        """Neuer Stand aus der Suchschleife (nur Zähler, keine Ausgabe)."""
+        self.done = done
+        self.found = found
+
+    def message(self, text, file=None):
+        """Gibt eine Zeile aus; eine sichtbare Fortschrittszeile wird vorher entfernt."""
+        with self._lock:
+            self._clear_line()
+            print(text, file=file or self.stream)
+
+    def _clear_line(self):
+        if self._line_length:
+            self.stream.write("\r" + " " * self._line_length + "\r")
+            self.stream.flush()
+            self._line_length = 0
+
+    def _run(self):
+        while not self._stop.wait(PROGRESS_INTERVAL):
+            self._render()
+
+    def _rate(self, now, done):
+        samples = self._samples
+        samples.append((now, done))
+        while len(samples) > 2 and now - samples[0][0] > PROGRESS_RATE_WINDOW:
+            samples.popleft()
+        elapsed = now - samples[0][0]
+        return (done - samples[0][1]) / elapsed if elapsed > 0 else 0.0
+
+    def _render(self):
+        done, found, total = self.done, self.found, self.total()
+        rate = self._rate(time.monotonic(), done)
+        percent = (done / total) * 100 if total > 0 else 100
+        if rate > 0 and total > done:
+            minutes, seconds = divmod(int((total - done) / rate), 60)
+            eta = f"{minutes}:{seconds:02d}"
+        else:
+            eta = "-:--"
+        line = get_text('progress_update', self.lang).format(done, total, percent, found, rate, eta)
+        with self._lock:
+            padding = " " * max(0, self._line_length - len(line))
+            self.stream.write("\r" + line + padding)
+            self.stream.flush()
+            self._line_length = len(line)
+
+    def stop(self):
+        """Beendet die Anzeige und entfernt die Fortschrittszeile."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._clear_line()
+
+
+def _report_result(url, result, checks_done, found_files, progress, verbose, lang, quiet=False):
+    """
+    Verarbeitet das Ergebnis einer einzelnen Prüfung (gemeinsam für alle Suchmodi):
+    merkt sich Treffer, gibt sie aus und aktualisiert die Zähler der Fortschrittsanzeige.
+    Mit `quiet` werden nur die Treffer gesammelt (nicht-interaktive Nutzung).
+    """
+    if isinstance(result, str): # Gefunden
+        found_files.append(result)
+        if not quiet: progress.message(get_text('found_url', lang).format(url))
+    elif isinstance(result, int): # Nicht gefunden
+        if verbose and not quiet:
+            progress.message(get_text('not_found_url_status', lang).format(url, result))
+    elif result is not None and not quiet: # Unerwartet (None = Fehler, wurde bereits geloggt)
+        progress.message(get_text('error_unexpected_return_type', lang).format(url, type(result)), file=sys.stderr)
+    progress.update(checks_done, len(found_files))
+
+
+def _print_search_stats(context, checks_done, planned_checks):
+    """Gibt nach einer Suche die Einsparungen durch Pruning und Cache aus."""
+    settings = context.settings
+    lang = settings['language']
+    if settings.get('quiet'):
+        return
+    if settings.get('search_strategy') == 'pruned' or settings.get('probe_budget') or settings.get('time_budget'):
+        _print_probe_savings(checks_done, planned_checks, lang)
+    if context.cache is not None:
+        print(get_text('cache_summary', lang).format(context.cache.served, checks_done, context.cache.path))
+    controller = context.controller
+    if controller.adaptive and controller.maximum > 1:
+        print(get_text('concurrency_summary', lang).format(controller.current, int(controller.peak), controller.maximum, controller.decreases))
+    if controller.throttled:
+        print(get_text('throttle_summary', lang).format(controller.throttled))
+    if context.retried:
+        print(get_text('retry_summary', lang).format(context.retried))
+    if context.checkpoint is not None and context.checkpoint.served:
+        print(get_text('checkpoint_summary', lang).format(context.checkpoint.served, checks_done))
+    if context.writer is not None:
+        print(get_text('output_summary', lang).format(context.writer.written, context.writer.path))
+    _print_metrics_summary(context, lang)
+    if context.changed:
+        print(get_text('changed_summary', lang).format(len(context.changed)), file=sys.stderr)
+        for url, known, probe in context.changed:
+            print(f"- {url} ({describe_change(known, probe)})", file=sys.stderr)
+    if context.unresolved:
+        print(get_text('unresolved_summary', lang).format(len(context.unresolved)), file=sys.stderr)
+        for url, error_class in context.unresolved:
+            print(f"- {url} ({error_class})", file=sys.stderr)
+
+
+def describe_change(known, probe):
+    """Kurzbeschreibung einer ersetzten Datei: geänderte Validatoren alt -> neu."""
+    parts = []
+    for name, old, new in (('ETag', known.etag, probe.etag), ('Content-Length', known.content_length, probe.content_length),
+                           ('Last-Modified', known.last_modified, probe.last_modified)):
+        if old != new:
+            parts.append(f"{name}: {old} -> {new}")
+    return ", ".join(parts)
+
+
+def _print_metrics_summary(context, lang):
+    """Gibt Durchsatz, Latenz-Quantile und die Verteilung der Antworten einer Suche aus."""
+    metrics = context.metrics
+    if not metrics.requests:
+        return
+    print(get_text('metrics_summary', lang).format(metrics.throughput(), metrics.requests, metrics.elapsed(), metrics.peak_in_flight))
+    if context.settings.get('verbose') or context.exporter is not None:
+        for phase in ProbeMetrics.PHASES:
+            histogram = metrics.histograms[phase]
+            if histogram.count:
+                quantiles = [f"{histogram.quantile(q) * 1000:.0f}" for q in (0.5, 0.95, 0.99)]
+                print(get_text('metrics_latency_summary', lang).format(phase, *quantiles, f"{histogram.max * 1000:.0f}", histogram.count))
+        print(get_text('metrics_status_summary', lang).format(", ".join(f"{status}: {count}" for status, count in sorted(metrics.statuses.items()))))
+        if metrics.errors:
+            print(get_text('metrics_errors_summary', lang).format(", ".join(f"{name}: {count}" for name, count in sorted(metrics.errors.items()))))
+    if context.exporter is not None and context.exporter.path:
+        print(get_text('metrics_export_summary', lang).format(context.exporter.path))
+
+
+def _search_firmware(base_url, filename_pattern, version_range, settings, sessions, build_hints, anchors, mode, banner):
+    """
+    Gemeinsamer Ablauf der Einzelsuche im Suchmodus `mode` (siehe run_probes).
+    `banner(total_checks)` liefert die Startmeldung des Modus.
+    """
+    lang = settings['language']
+    verbose = settings['verbose']
+    quiet = settings.get('quiet', False)
+
+    found_files = []
+    total_checks = calculate_total_checks(version_range)
+    if total_checks == 0:
+        if not quiet: print(get_text('no_versions_to_check', lang))
+        return []
+    checks_done = 0
+
+    if not quiet:
+        print(banner(total_checks))
+
+    context = SearchContext(settings, sessions, repr((base_url, filename_pattern, version_range)))
+    urls, feedback = create_url_source(base_url, filename_pattern, version_range, settings, build_hints, anchors, context)
+    progress = ProgressReporter(settings, lambda: _planned_checks(total_checks, feedback))
+
+    def on_probe(url, probe):
+        nonlocal checks_done
+        context.record_probe(probe)
+        result = probe_outcome(probe)
+        if feedback is not None: feedback.record(url, result)
+        checks_done += 1
+        _report_result(url, result, checks_done, found_files, progress, verbose, lang, quiet)
+
+    progress.start()
+    try:
+        run_probes(urls, context, on_probe, mode)
+        context.complete()
+    finally:
+        progress.stop()
+        context.close()
+
+    if not quiet:
+        print(get_text(f'{mode}_search_complete', lang))
+    _print_search_stats(context, checks_done, _planned_checks(total_checks, feedback))
+    return found_files
+
+
+def check_firmware_version(base_url, filename_pattern, version_range, settings, sessions=None, build_hints=None, anchors=None):
+    """
+    Überprüft *sequenziell*, ob Firmware-Dateien existieren.
+    Ohne `sessions` wird ein eigener SessionPool für die Suche angelegt.
+    """
+    return _search_firmware(base_url, filename_pattern, version_range, settings, sessions, build_hints, anchors, 'sequential',
+                            lambda total: get_text('starting_sequential_search', settings['language']).format(total))
+
+
+def iter_probe_results_threaded(urls, context):
+    """
+    Prüft URLs parallel im Thread-Pool (höchstens max_threads gleichzeitig) und liefert
+    (url, ProbeResult) in Abschlussreihenfolge. URLs werden erst gezogen, wenn ein Platz frei wird.
+    """
+    max_threads = context.settings['max_threads']
+    if context.settings.get('http_engine') == 'pipelined':
+        connections = min(max_threads, context.settings.get('pipeline_connections', DEFAULT_PIPELINE_CONNECTIONS))
+        yield from iter_probe_results_pipelined(urls, context, max(1, connections))
+        return
+    ceiling = max_threads
+    context.start_controller(ceiling, min(ADAPTIVE_INITIAL_CONCURRENCY, max(1, max_threads // 2)))
+    gate = _ConcurrencyGate(lambda: context.concurrency_limit(ceiling))
+    url_iter = iter(urls)
+    pending = {}
+
+    def gated_probe(url):
+        with gate:
+            return probe_for_search(url, context)
+
+    with ThreadPoolExecutor(max_workers=ceiling) as executor:
+        def fill_window():
+            while len(pending) < context.concurrency_limit(ceiling) * THREAD_QUEUE_FACTOR:
+                delay = context.controller.backoff_remaining()
+                if delay > 0:
+                    if pending:
+                        return
+                    time.sleep(delay)
+                url = context.next_url(url_iter)
+                if url is None:
+                    return
+                pending[executor.submit(gated_probe, url)] = url
+
+        try:
+            fill_window()
+            while pending:
+                done, _ = wait(pending, timeout=context.controller.backoff_remaining() or None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    try:
+                        probe = future.result()
+                    except Exception as exc:
+                        print(f"\nFehler beim Abrufen des Ergebnisses für {url}: {exc}", file=sys.stderr) # Bleibt Englisch für Debugging
+                        probe = ProbeResult(url, error=type(exc).__name__)
+                    if context.should_retry(probe):
+                        continue
+                    yield url, probe
+                fill_window()
+        finally:
+            # Bei Abbruch (z.B. KeyboardInterrupt) keine weiteren Anfragen mehr starten
+            for future in pending:
+                future.cancel()
+
+
+def check_firmware_version_threaded(base_url, filename_pattern, version_range, settings, sessions=None, build_hints=None, anchors=None):
+    """
+    Überprüft *parallel* mit Threads, ob Firmware-Dateien existieren.
+    Jeder Worker-Thread nutzt seine eigene Session aus dem SessionPool.
+    """
+    return _search_firmware(base_url, filename_pattern, version_range, settings, sessions, build_hints, anchors, 'threaded',
+                            lambda total: get_text('starting_threaded_search', settings['language']).format(total, settings['max_threads']))
+
+
+# --- Pipelining-Engine (http.client) ---
+
+class PipelinedConnection:
+    """
+    Persistente HTTP/1.1-Verbindung zu einem Ziel (Schema, Host, Port), über die mehrere
+    HEAD-Anfragen in einem Schreibvorgang gesendet und die Antworten danach der Reihe nach
+    gelesen werden (Pipelining). Aufgebaut wird sie mit http.client (inkl. TLS); gelesen werden
+    nur Statuszeile und die Header aus PIPELINE_HEADERS - kein Response-Objekt, keine Weiterleitung.
+    """
+
+    def __init__(self, scheme, host, port, timeout, metrics=None):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.metrics = metrics
+        default_port = 443 if scheme == 'https' else 80
+        self._host_header = host if port == default_port else f"{host}:{port}"
+        self._conn = None
+        self._reader = None
+
+    @property
+    def connected(self):
+        return self._conn is not None
+
+    def connect(self):
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        self._conn = connection_class(self.host, self.port, timeout=self.timeout)
+        start = time.perf_counter()
+        self._conn.connect()
+        if self.metrics is not None:
+            self.metrics.observe_connect(time.perf_counter() - start)
+        self._reader = self._conn.sock.makefile('rb')
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = self._reader = None
+
+    def head_many(self, requests_):
+        """
+        Sendet die Anfragen `requests_` ((Pfad, Zusatz-Header), ...) und liest ihre Antworten.
+        Gibt ([(status, headers, ttfb, latency), ...], Fehler oder None) zurück; die Liste ist
+        kürzer als `requests_`, wenn der Server die Verbindung vorher schließt oder ein Fehler auftritt.
+        """
+        lines = []
+        for path, headers in requests_:
+            lines.append(f"HEAD {path} HTTP/1.1\r\nHost: {self._host_header}\r\nUser-Agent: {USER_AGENT}\r\n")
+            lines.extend(f"{name}: {value}\r\n" for name, value in headers.items())
+            lines.append("\r\n")
+        start = time.perf_counter()
+        responses = []
+        try:
+            self._conn.sock.sendall("".join(lines).encode('latin-1'))
+            for _ in requests_:
+                status_line = self._reader.readline(65537)
+                if not status_line:
+                    return responses, None # Verbindung vom Server geschlossen
+                ttfb = time.perf_counter() - start
+                parts = status_line.split(None, 2)
+                if len(parts) < 2 or not parts[0].startswith(b'HTTP/') or not parts[1].isdigit():
+                    raise http.client.BadStatusLine(status_line)
+                headers = {}
+                while True:
+                    line = self._reader.readline(65537)
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.partition(b':')
+                    canonical = PIPELINE_HEADERS.get(name.strip().lower())
+                    if canonical:
+                        headers[canonical] = value.strip().decode('latin-1')
+                responses.append((int(parts[1]), headers, ttfb, time.perf_counter() - start))
+                if headers.get('Connection', '').lower() == 'close':
+                    return responses, None
+        except (OSError, http.client.HTTPException) as e:
+            return responses, e
+        return responses, None
+
+
+class PipelinedHeadPool:
+    """
+    Pipelining-Verbindungen je Worker-Thread und Ziel. probe_many() liefert für eine Reihe
+    von URLs dasselbe ProbeResult wie probe_url: Antworten, die vor dem Schließen der
+    Verbindung ausbleiben, werden auf einer neuen Verbindung erneut gesendet; die erste
+    unbeantwortete Anfrage gilt nach PIPELINE_RETRIES erneuten Sendungen als Fehler.
+    Weiterleitungen (3xx außer 304) werden über die Verbindungen des Pools verfolgt.
+    """
+
+    def __init__(self, timeout, metrics=None):
+        self.timeout = timeout
+        self.metrics = metrics
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def _connection(self, scheme, host, port):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        connection = connections.get((scheme, host, port))
+        if connection is None:
+            connection = connections[(scheme, host, port)] = PipelinedConnection(scheme, host, port, self.timeout, self.metrics)
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def probe_many(self, urls, validators=None):
+        """Prüft `urls` (je Ziel gebündelt) und gibt die ProbeResults in derselben Reihenfolge zurück."""
+        validators = validators or {}
+        results = {}
+        targets = {url: url for url in urls} # URL -> aktuelles Ziel (nach Weiterleitungen)
+        pending = list(targets)
+        for _ in range(PIPELINE_MAX_REDIRECTS + 1):
+            by_origin = {}
+            for url in pending:
+                parts = urlsplit(targets[url])
+                port = parts.port or (443 if parts.scheme == 'https' else 80)
+                path = parts.path + (f"?{parts.query}" if parts.query else "")
+                by_origin.setdefault((parts.scheme, parts.hostname, port), []).append((url, path))
+            redirects = {}
+            for origin, items in by_origin.items():
+                self._probe_origin(origin, items, validators, results, redirects)
+            if not redirects:
+                break
+            targets.update({url: urljoin(targets[url], location) for url, location in redirects.items()})
+            pending = list(redirects)
+        else:
+            for url in pending:
+                results[url] = self._failed(url, requests.exceptions.TooManyRedirects(f"Mehr als {PIPELINE_MAX_REDIRECTS} Weiterleitungen"))
+        return [results[url] for url in urls]
+
+    def _probe_origin(self, origin, items, validators, results, redirects):
+        """
+        Sendet die Anfragen `items` ((URL, Pfad), ...) über die Verbindung zu `origin` und legt
+        die Ergebnisse in `results` ab, Weiterleitungen als URL -> Location in `redirects`.
+        """
+        connection = self._connection(*origin)
+        attempts = {}
+        while items:
+            fresh = not connection.connected
+            if fresh:
+                try:
+                    connection.connect()
+                except OSError as e: # Ziel nicht erreichbar: alle URLs dieses Ziels schlagen fehl
+                    connection.close()
+                    for url, _ in items:
+                        results[url] = self._failed(url, e)
+                    return
+            responses, error = connection.head_many(
+                [(path, conditional_headers(validators.get(url))) for url, path in items])
+            for (url, _), (status, headers, ttfb, latency) in zip(items, responses):
+                if 300 <= status < 400 and status != 304 and headers.get('Location'):
+                    redirects[url] = headers['Location']
+                else:
+                    results[url] = _response_probe(url, status, headers, latency, ttfb, validators.get(url))
+            items = items[len(responses):]
+            if error is None and not items:
+                return
+            connection.close()
+            if not items:
+                return
+            # An der ersten unbeantworteten Anfrage ist die Verbindung abgebrochen; die dahinter
+            # wartenden werden ohne Zählung erneut gesendet. Bleibt auch eine neue Verbindung ganz
+            # ohne Antwort, liegt es an der Anfrage selbst (weitere Versuche übernimmt SearchContext).
+            url = items[0][0]
+            attempts[url] = attempts.get(url, 0) + 1
+            if attempts[url] <= PIPELINE_RETRIES and not (fresh and not responses):
+                continue
+            results[url] = self._failed(url, error)
+            items = items[1:]
+            if fresh and not responses and error is not None:
+                # Timeout/Fehler auf neuer Verbindung: die wartenden Anfragen brechen mit ab
+                # (zählen nicht als eigene Timeouts)
+                for url, _ in items:
+                    results[url] = self._failed(url, ConnectionError(f"Pipelining nach {_error_name(error)} abgebrochen"))
+                return
+
+    @staticmethod
+    def _failed(url, error):
+        error_name = _error_name(error) if error is not None else 'RemoteProtocolError'
+        print(f"\nFehler bei {url}: {error_name} - {error or 'Verbindung ohne Antwort geschlossen'}", file=sys.stderr)
+        return ProbeResult(url, error=error_name)
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+
+def probe_batch_for_search(urls, context, pool):
+    """Gegenstück zu probe_for_search für einen Durchgang der Pipelining-Engine über `pool`."""
+    results, validators = {}, {}
+    for url in urls:
+        known, validators[url] = context.before_probe(url)
+        if known is not None:
+            results[url] = known
+    fresh = [url for url in urls if url not in results]
+    if fresh:
+        if context.limiter is not None:
+            context.limiter.acquire(len(fresh))
+        for _ in fresh:
+            context.metrics.begin()
+        for probe in pool.probe_many(fresh, {url: validators[url] for url in fresh}):
+            results[probe.url] = context.after_probe(validators[probe.url], probe)
+    return [results[url] for url in urls]
+
+
+def iter_probe_results_pipelined(urls, context, connections):
+    """
+    Prüft URLs mit der Pipelining-Engine (Durchgänge von bis zu pipeline_depth URLs je
+    Verbindung) und liefert (url, ProbeResult) wie die anderen Modi.
+    """
+    depth = max(1, context.settings.get('pipeline_depth', DEFAULT_PIPELINE_DEPTH))
+    context.start_controller(connections * depth)
+    pool = PipelinedHeadPool(context.timeout, context.metrics)
+    try:
+        yield from _run_pipelined_batches(iter(urls), context, pool, connections, depth)
+    finally:
+        pool.close() # Erst nach dem Ende aller Worker-Threads
+
+
+def _run_pipelined_batches(url_iter, context, pool, connections, depth):
+    """Verteilt Durchgänge auf die Worker-Threads (siehe iter_probe_results_pipelined)."""
+    maximum = connections * depth
+    controller = context.controller
+    pending = {}
+
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        def fill_window():
+            while len(pending) < connections:
+                delay = controller.backoff_remaining()
+                if delay > 0:
+                    if pending:
+                        return
+                    time.sleep(delay)
+                size = max(1, min(depth, context.concurrency_limit(maximum) // connections))
+                batch = []
+                while len(batch) < size:
+                    url = context.next_url(url_iter)
+                    if url is None:
+                        break
+                    batch.append(url)
+                if not batch:
+                    return
+                pending[executor.submit(probe_batch_for_search, batch, context, pool)] = batch
+
+        try:
+            fill_window()
+            while pending:
+                done, _ = wait(pending, timeout=controller.backoff_remaining() or None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = pending.pop(future)
+                    try:
+                        probes = future.result()
+                    except Exception as exc:
+                        print(f"\nFehler beim Abrufen der Ergebnisse für {len(batch)} URLs: {exc}", file=sys.stderr)
+                        probes = [ProbeResult(url, error=type(exc).__name__) for url in batch]
+                    for probe in probes:
+                        if context.should_retry(probe):
+                            continue
+                        yield probe.url, probe
+                fill_window()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _connect_tracer(metrics):
+    """
+    Trace-Callback für httpx: misst den Aufbau einer neuen Verbindung (DNS, TCP, TLS)
+    bis zum Senden der ersten Request-Header und meldet ihn an ProbeMetrics.
+    """
+    connect_started = []
+
+    async def trace(event_name, info):
+        if event_name == 'connection.connect_tcp.started':
+            connect_started.append(time.perf_counter())
+        elif connect_started and event_name.endswith('send_request_headers.started'):
+            metrics.observe_connect(time.perf_counter() - connect_started.pop())
+
+    return trace
+
+
+async def probe_url_async(client, full_url, timeout, metrics=None, known=None):
+    """
+    Asynchrones Gegenstück zu probe_url (httpx); gibt ein ProbeResult zurück.
+    Mit `metrics` wird zusätzlich der Verbindungsaufbau erfasst, mit `known` bedingt angefragt.
+    """
+    start = time.perf_counter()
+    extensions = {'trace': _connect_tracer(metrics)} if metrics is not None else None
+    try:
+        response = await client.head(full_url, timeout=timeout, headers=conditional_headers(known),
+                                     follow_redirects=True, extensions=extensions)
+        return _response_probe(full_url, response.status_code, response.headers, time.perf_counter() - start,
+                               response.elapsed.total_seconds(), known)
+    except httpx.HTTPError as e:
+        print(f"\nFehler bei {full_url}: {type(e).__name__} - {e}", file=sys.stderr)
+        return ProbeResult(full_url, latency=time.perf_counter() - start, error=_error_name(e))
+    except Exception as e:
+        print(f"\nUnerwarteter interner Fehler bei URL {full_url}: {e}", file=sys.stderr)
+        return ProbeResult(full_url, latency=time.perf_counter() - start, error=type(e).__name__)
+
+
+async def probe_for_search_async(client, full_url, context):
+    """Asynchrones Gegenstück zu probe_for_search."""
+    known, validators = context.before_probe(full_url)
+    if known is not None:
+        return known
+    if context.limiter is not None:
+        await context.limiter.acquire_async()
+    context.metrics.begin()
+    return context.after_probe(validators, await probe_url_async(client, full_url, context.timeout, context.metrics, validators))
+
+
+def _create_async_client(settings):
+    """
+    Erstellt den httpx.AsyncClient für den asyncio-Modus.
+    Fällt auf HTTP/1.1 zurück, wenn HTTP/2 gewünscht, aber 'h2' nicht installiert ist.
+    """
+    lang = settings['language']
+    max_concurrency = settings['max_concurrency']
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    http2 = settings['use_http2']
+    try:
+        transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits, retries=transport_retries(settings))
+    except ImportError:
+        print(get_text('warning_http2_unavailable', lang), file=sys.stderr)
+        transport = httpx.AsyncHTTPTransport(http2=False, limits=limits, retries=transport_retries(settings))
+    return httpx.AsyncClient(transport=transport, headers={'User-Agent': USER_AGENT})
+
+
+async def _run_async_checks(urls, context, on_result):
+    """
+    Hält bis zu `max_concurrency` HEAD-Anfragen gleichzeitig offen und ruft
+    on_result(url, ProbeResult) im Event-Loop mit der endgültigen Antwort auf.
+    """
+    max_concurrency = context.settings['max_concurrency']
+    context.start_controller(max_concurrency)
+
+    async with _create_async_client(context.settings) as client:
+        finished = deque()
+        wakeup = asyncio.Event()
+        tasks = set()
+
+        async def probe(url):
+            try:
+                result = await probe_for_search_async(client, url, context)
+            except Exception as exc:
+                print(f"\nFehler beim Abrufen des Ergebnisses für {url}: {exc}", file=sys.stderr) # Bleibt Englisch für Debugging
+                result = ProbeResult(url, error=type(exc).__name__)
+            # Selbst austragen, bevor geweckt wird (ein done-Callback käme zu spät)
+            tasks.discard(asyncio.current_task())
+            finished.append((url, result))
+            wakeup.set()
+
+        url_iter = iter(urls)
+        try:
+            while True:
+                while finished:
+                    url, result = finished.popleft()
+                    if not context.should_retry(result):
+                        on_result(url, result)
+
+                delay = context.controller.backoff_remaining()
+                while delay <= 0 and len(tasks) < context.concurrency_limit(max_concurrency):
+                    url = context.next_url(url_iter)
+                    if url is None:
+                        break
+                    tasks.add(asyncio.create_task(probe(url)))
+
+                if not tasks:
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        continue
+                    break
+                wakeup.clear()
+                if not finished:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), timeout=delay if delay > 0 else None)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def check_firmware_version_async(base_url, filename_pattern, version_range, settings, build_hints=None, anchors=None):
+    """
+    Überprüft *asynchron* (asyncio + httpx, optional HTTP/2), ob Firmware-Dateien existieren.
+    Ohne installiertes httpx wird auf die parallele Suche mit Threads zurückgegriffen.
+    """
+    lang = settings['language']
+    if httpx is None:
+        print(get_text('warning_async_unavailable', lang), file=sys.stderr)
+        return check_firmware_version_threaded(base_url, filename_pattern, version_range, settings, build_hints=build_hints, anchors=anchors)
+    return _search_firmware(base_url, filename_pattern, version_range, settings, None, build_hints, anchors, 'async',
+                            lambda total: get_text('starting_async_search', lang).format(
+                                total, settings['max_concurrency'], "HTTP/2" if settings['use_http2'] else "HTTP/1.1"))
+
+
+def run_probes(urls, context, on_probe, mode=None):
+    """
+    Prüft alle URLs aus `urls` im Suchmodus `mode` (Standard: eingestellter Modus) und ruft
+    für jedes Ergebnis on_probe(url, ProbeResult) im aufrufenden Thread bzw. Event-Loop auf.
+    """
+    mode = mode or context.settings['search_mode']
+    if mode == 'async' and httpx is None:
+        print(get_text('warning_async_unavailable', context.settings['language']), file=sys.stderr)
+        mode = 'threaded'
+
+    if mode == 'async':
+        asyncio.run(_run_async_checks(urls, context, on_probe))
+    elif mode == 'threaded':
+        for url, probe in iter_probe_results_threaded(urls, context):
+            on_probe(url, probe)
+    else:
+        for url, probe in iter_probe_results_sequential(urls, context):
+            on_probe(url, probe)
+
+
+# --- Batch-Suche ---
+
+class BatchUrlSource:
+    """
+    Vereint die URL-Quellen mehrerer Modelle zu einer Quelle für einen gemeinsamen
+    Worker-Pool. Die Modelle werden reihum bedient; URLs, die mehrere Modelle teilen
+    (z.B. PW und K5 oder PW5 und PW5SE), werden nur einmal geprüft und das Ergebnis
+    allen beteiligten Modellen zugeordnet.
+    """
+
+    def __init__(self):
+        self.results = {} # Modell -> Liste gefundener Dateinamen
+        self.unresolved = {} # Modell -> Liste (URL, Fehlerklasse) ohne endgültige Antwort
+        self.candidates_done = 0 # Kandidaten aller Modelle inkl. Duplikate
+        self.duplicates = 0
+        self._sources = []
+        self._next_index = 0
+        self._owners = {} # URL -> Modelle, die auf das Ergebnis warten
+        self._known = {} # URL -> Ergebnis bereits geprüfter URLs
+
+    @property
+    def added_checks(self):
+        return sum(getattr(source['feedback'], 'added_checks', 0) for source in self._sources)
+
+    def add_source(self, model_key, urls, feedback=None):
+        self.results.setdefault(model_key, [])
+        self.unresolved.setdefault(model_key, [])
+        self._sources.append({'model': model_key, 'urls': iter(urls), 'feedback': feedback})
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        for _ in range(len(self._sources)):
+            source = self._sources[self._next_index]
+            self._next_index = (self._next_index + 1) % len(self._sources)
+            url = self._next_unique(source)
+            if url is not None:
+                return url
+        raise StopIteration
+
+    def _next_unique(self, source):
+        """Liefert die nächste noch nicht vergebene URL einer Quelle (oder None)."""
+        for url in source['urls']:
+            if url in self._known:
+                self.duplicates += 1
+                self._assign(source, url, *self._known[url])
+            elif url in self._owners:
+                self.duplicates += 1
+                self._owners[url].append(source)
+            else:
+                self._owners[url] = [source]
+                return url
+        return None
+
+    def record(self, url, result, error_class=None):
+        """
+        Ordnet das Ergebnis einer geprüften URL allen beteiligten Modellen zu.
+        `error_class` (siehe failure_class) markiert URLs ohne endgültige Antwort.
+        """
+        self._known[url] = (result, error_class)
+        for source in self._owners.pop(url, []):
+            self._assign(source, url, result, error_class)
+
+    def _assign(self, source, url, result, error_class=None):
+        self.candidates_done += 1
+        if source['feedback'] is not None:
+            source['feedback'].record(url, result)
+        if isinstance(result, str): # Gefunden
+            self.results[source['model']].append(result)
+        elif error_class is not None:
+            self.unresolved[source['model']].append((url, error_class))
+
+
+def resolve_model_keys(model_input, models):
+    """
+    Wandelt eine Benutzereingabe ('PW5', 'pw5, pw5se' oder 'all') in Modellschlüssel um
+    (ohne Beachtung der Groß-/Kleinschreibung). Gibt None zurück, wenn ein Modell unbekannt ist.
+    """
+    keys_by_upper = {key.upper(): key for key in models}
+    requested = [part.strip().upper() for part in model_input.split(",") if part.strip()]
+    if requested == ["ALL"]:
+        return list(models)
+    if not requested or any(part not in keys_by_upper for part in requested):
+        return None
+    resolved = []
+    for part in requested:
+        if keys_by_upper[part] not in resolved:
+            resolved.append(keys_by_upper[part])
+    return resolved
+
+
+def check_firmware_batch(model_keys, models, settings, version_ranges=None, unresolved=None, changed=None,
+                         sessions=None, limiter=None):
+    """
+    Durchsucht mehrere Modelle in einem gemeinsamen Durchlauf (jeweils mit ihrem
+    Standard-Versionsbereich oder dem Bereich aus `version_ranges`).
+    Gemeinsame URLs werden nur einmal geprüft.
+    Gibt ein Dictionary Modell -> Liste gefundener Dateinamen zurück. Ist `unresolved`
+    ein Dictionary, wird es mit Modell -> Liste (URL, Fehlerklasse) der URLs gefüllt,
+    die auch nach allen Wiederholungen keine endgültige Antwort geliefert haben, `changed`
+    mit Modell -> Liste (URL, bekannter Treffer, neue Antwort) ersetzter Dateien.
+    `sessions` und `limiter` (optional) werden statt eigener Ressourcen verwendet.
+    """
+    lang = settings['language']
+    verbose = settings['verbose']
+    quiet = settings.get('quiet', False)
+    version_ranges = version_ranges or {}
+
+    source = BatchUrlSource()
+    total_checks = 0
+    searched = [] # Beschreibung der Suche für den Checkpoint
+    planned = [] # (Modell, statische URL) bzw. (Modell, Argumente für create_url_source)
+    model_base_urls = {}
+    for model_key in model_keys:
+        model = models[model_key]
+        base_url = model.get("base_url")
+        example_filename = model.get("example_filename")
+        default_version_range = model.get("default_version_range")
+        static_version_filename = model.get("static_version")
+        if not base_url:
+            print(get_text('error_no_base_url', lang).format(model_key), file=sys.stderr)
+            continue
+        if not base_url.endswith('/'): base_url += '/'
+        model_base_urls[model_key] = base_url
+
+        if static_version_filename:
+            planned.append((model_key, f"{base_url}{static_version_filename}"))
+            searched.append((model_key, static_version_filename))
+            total_checks += 1
+        elif example_filename and default_version_range:
+            version_range = version_ranges.get(model_key, default_version_range)
+            filename_pattern = get_filename_pattern_simple(example_filename, lang, quiet)
+            build_hints = list(model.get("build_hints", [])) + get_build_hints(example_filename)
+            planned.append((model_key, (base_url, filename_pattern, version_range, settings, build_hints,
+                                        get_version_anchors(example_filename))))
+            searched.append((model_key, tuple(version_range)))
+            total_checks += calculate_total_checks(version_range)
+        else:
+            print(get_text('error_incomplete_config', lang).format(model_key), file=sys.stderr)
+
+    if total_checks == 0:
+        if not quiet: print(get_text('no_versions_to_check', lang))
+        return source.results
+
+    if not quiet:
+        print(get_text('starting_batch_search', lang).format(len(dict(planned)), total_checks, get_text('mode_' + settings['search_mode'], lang)))
+
+    context = SearchContext(settings, sessions, repr(searched), limiter)
+    try:
+        for model_key, plan in planned: # Quellen erst jetzt: das Bucket-Listing nutzt Pool, Limiter und Metriken der Suche
+            if isinstance(plan, str):
+                source.add_source(model_key, [plan])
+            else:
+                urls, feedback = create_url_source(*plan, context=context)
+                source.add_source(model_key, urls, feedback)
+    except BaseException:
+        context.close()
+        raise
+    found_files = []
+    probes_done = 0
+    progress = ProgressReporter(settings, lambda: total_checks + source.added_checks)
+
+    def on_probe(url, probe):
+        nonlocal probes_done
+        probes_done += 1
+        context.record_probe(probe)
+        result = probe_outcome(probe)
+        source.record(url, result, failure_class(probe))
+        _report_result(url, result, source.candidates_done, found_files, progress, verbose, lang, quiet)
+
+    progress.start()
+    try:
+        run_probes(source, context, on_probe)
+        context.complete()
+    finally:
+        progress.stop()
+        context.close()
+
+    if not quiet:
+        print(get_text('batch_search_complete', lang))
+        print(get_text('batch_summary', lang).format(source.candidates_done, probes_done, source.duplicates))
+    _print_search_stats(context, source.candidates_done, total_checks + source.added_checks)
+    if unresolved is not None:
+        unresolved.update(source.unresolved)
+    if changed is not None:
+        for model_key, filenames in source.results.items():
+            urls = {f"{model_base_urls[model_key]}{filename}" for filename in filenames}
+            changed[model_key] = [entry for entry in context.changed if entry[0] in urls]
+    return source.results
+
+
+# --- Verteilte Suche (Koordinator / Worker) ---
+
+def split_into_shards(model_keys, kindle_models, version_ranges, shard_minors=SHARD_MINORS):
+    """
+    Zerlegt eine Suche in Shards von je `shard_minors` Minor-Versionen pro Modell
+    (statische Modelle: ein Shard mit genau einer URL). Identische Shards mehrerer Modelle
+    (gleiche Basis-URL, gleiches Muster, gleicher Bereich) werden zusammengelegt.
+    Gibt eine Liste von Dictionaries zurück (base_url, filename_pattern, version_range,
+    build_hints, models).
+    """
+    shards = {}
+    for model_key in model_keys:
+        model = kindle_models[model_key]
+        base_url = model.get("base_url")
+        if not base_url:
+            continue
+        if not base_url.endswith('/'): base_url += '/'
+        if model.get("static_version"):
+            pieces = [(model["static_version"], None, [], [])]
+        elif model_key in version_ranges:
+            filename_pattern = get_filename_pattern_simple(model["example_filename"], DEFAULT_LANGUAGE, quiet=True)
+            build_hints = list(model.get("build_hints", [])) + get_build_hints(model["example_filename"])
+            anchors = get_version_anchors(model["example_filename"])
+            pieces = [(filename_pattern, shard_range, build_hints, anchors)
+                      for shard_range in _shard_ranges(version_ranges[model_key], shard_minors)]
+        else:
+            continue
+        for filename_pattern, shard_range, build_hints, anchors in pieces:
+            key = (base_url, filename_pattern, shard_range)
+            shard = shards.setdefault(key, {
+                'base_url': base_url, 'filename_pattern': filename_pattern, 'version_range': shard_range,
+                'build_hints': [list(hint) for hint in build_hints], 'anchors': [list(anchor) for anchor in anchors], 'models': [],
+            })
+            shard['models'].append(model_key)
+    return list(shards.values())
+
+
+def _shard_ranges(version_range, shard_minors):
+    """Teilt einen Versionsbereich in Bereiche von höchstens `shard_minors` Minors derselben Major."""
+    group = []
+    for major, minor, first_patch, last_patch in VersionSpace(version_range).patch_ranges():
+        if group and (group[0][0] != major or len(group) >= shard_minors):
+            yield ((group[0][0], group[0][1], group[0][2]), (group[-1][0], group[-1][1], group[-1][3]))
+            group = []
+        group.append((major, minor, first_patch, last_patch))
+    if group:
+        yield ((group[0][0], group[0][1], group[0][2]), (group[-1][0], group[-1][1], group[-1][3]))
+
+
+class ShardQueue:
+    """
+    Warteschlange der Shards einer verteilten Suche in einer SQLite-Datei. Mehrere Prozesse
+    (auch auf anderen Rechnern über ShardQueueServer) holen sich Shards mit claim() und
+    melden Treffer mit complete(). Solange ein Worker vorankommt, verlängert er den Lease
+    mit renew(); ein Shard ohne Abschluss oder Verlängerung innerhalb von
+    SHARD_LEASE_SECONDS geht an den nächsten Worker (z.B. nach einem Absturz). Die Datei
+    dient zugleich als Checkpoint: Eine erneut gestartete Suche mit derselben
+    Beschreibung setzt bei den offenen Shards fort.
+    """
+
+    def __init__(self, path, lease=SHARD_LEASE_SECONDS):
+        self.path = path
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS shards (id INTEGER PRIMARY KEY, spec TEXT NOT NULL,"
+            " state TEXT NOT NULL DEFAULT 'pending', worker TEXT, lease_until REAL, attempts INTEGER NOT NULL DEFAULT 0);"
+            "CREATE TABLE IF NOT EXISTS found (shard_id INTEGER, filename TEXT, PRIMARY KEY (shard_id, filename));"
+            "CREATE TABLE IF NOT EXISTS unresolved (shard_id INTEGER, url TEXT, error_class TEXT, PRIMARY KEY (shard_id, url));"
+        )
+
+    def _meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def prepare(self, search_key, shards, settings):
+        """
+        Legt die Shards einer Suche an. Gehört die Datei bereits zu derselben Suche, bleiben
+        erledigte Shards erhalten (Fortsetzen); sonst wird neu begonnen.
+        Gibt True zurück, wenn fortgesetzt wird.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._meta('search_key') == search_key:
+                    self._conn.execute("COMMIT")
+                    return True
+                for table in ('meta', 'shards', 'found', 'unresolved'):
+                    self._conn.execute(f"DELETE FROM {table}")
+                worker_settings = {key: value for key, value in settings.items() if key not in SHARD_LOCAL_SETTINGS}
+                self._conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                                       [('search_key', json.dumps(search_key)), ('settings', json.dumps(worker_settings))])
+                self._conn.executemany("INSERT INTO shards (spec) VALUES (?)", [(json.dumps(shard),) for shard in shards])
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return False
+
+    def settings(self):
+        """Einstellungen, mit denen die Worker suchen sollen."""
+        with self._lock:
+            return self._meta('settings')
+
+    def claim(self, worker):
+        """Vergibt den nächsten offenen (oder verwaisten) Shard an `worker`; None, wenn keiner frei ist."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, spec FROM shards WHERE state = 'pending' OR (state = 'running' AND lease_until < ?) "
+                    "ORDER BY id LIMIT 1", (now,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE shards SET state = 'running', worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                        (worker, now + self.lease, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        shard = json.loads(row[1])
+        shard['id'] = row[0]
+        return shard
+
+    def renew(self, shard_id, worker):
+        """Verlängert den Lease eines laufenden Shards von `worker`; False, wenn er ihn nicht mehr hält."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE shards SET lease_until = ? WHERE id = ? AND state = 'running' AND worker = ?",
+                (time.time() + self.lease, shard_id, worker),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, shard_id, found, unresolved):
+        """Speichert das Ergebnis eines Shards (ein zweiter Abschluss desselben Shards wird ignoriert)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = self._conn.execute("SELECT state FROM shards WHERE id = ?", (shard_id,)).fetchone()
+                if state is not None and state[0] != 'done':
+                    self._conn.executemany("INSERT OR IGNORE INTO found (shard_id, filename) VALUES (?, ?)",
+                                           [(shard_id, filename) for filename in found])
+                    self._conn.executemany("INSERT OR IGNORE INTO unresolved (shard_id, url, error_class) VALUES (?, ?, ?)",
+                                           [(shard_id, url, error_class) for url, error_class in unresolved])
+                    self._conn.execute("UPDATE shards SET state = 'done', lease_until = NULL WHERE id = ?", (shard_id,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def status(self):
+        """Gibt (erledigte Shards, alle Shards, bisher gefundene Dateien) zurück."""
+        with self._lock:
+            done, total = self._conn.execute("SELECT COUNT(CASE WHEN state = 'done' THEN 1 END), COUNT(*) FROM shards").fetchone()
+            found = self._conn.execute("SELECT COUNT(DISTINCT filename) FROM found").fetchone()[0]
+        return done, total, found
+
+    def results(self):
+        """Gibt (Modell -> gefundene Dateinamen, Modell -> [(URL, Fehlerklasse)]) über alle Shards zurück."""
+        found, unresolved = {}, {}
+        with self._lock:
+            specs = {shard_id: json.loads(spec) for shard_id, spec in self._conn.execute("SELECT id, spec FROM shards")}
+            for shard_id, filename in self._conn.execute("SELECT shard_id, filename FROM found ORDER BY shard_id"):
+                for model_key in specs[shard_id]['models']:
+                    found.setdefault(model_key, []).append(filename)
+            for shard_id, url, error_class in self._conn.execute("SELECT shard_id, url, error_class FROM unresolved ORDER BY shard_id"):
+                for model_key in specs[shard_id]['models']:
+                    unresolved.setdefault(model_key, []).append((url, error_class))
+        return found, unresolved
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class _ShardQueueRequestHandler(BaseHTTPRequestHandler):
+    """JSON-Schnittstelle der ShardQueue für entfernte Worker (GET /settings, /status; POST /claim, /renew, /complete)."""
+
+    def do_GET(self):
+        queue = self.server.queue
+        if self.path == '/settings':
+            self._send_json(queue.settings())
+        elif self.path == '/status':
+            self._send_json(dict(zip(('done', 'total', 'found'), queue.status())))
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        queue = self.server.queue
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except ValueError:
+            self.send_error(400)
+            return
+        if self.path == '/claim':
+            self._send_json(queue.claim(str(body.get('worker', self.client_address[0]))))
+        elif self.path == '/renew':
+            self._send_json({'ok': queue.renew(int(body['shard_id']), str(body.get('worker', self.client_address[0])))})
+        elif self.path == '/complete':
+            queue.complete(int(body['shard_id']), body.get('found', []), [tuple(item) for item in body.get('unresolved', [])])
+            self._send_json({'ok': True})
+        else:
+            self.send_error(404)
+
+    def _send_json(self, value):
+        body = json.dumps(value).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ShardQueueServer:
+    """
+    Stellt eine ShardQueue über HTTP bereit, damit Worker auf anderen Rechnern mitsuchen
+    (`listen` = '[HOST:]PORT', Standard-Host 127.0.0.1; für andere Rechner z.B. '0.0.0.0:8765').
+    Keine Authentifizierung - nur in vertrauenswürdigen Netzen verwenden.
+    """
+
+    def __init__(self, queue, listen):
+        host, _, port = str(listen).rpartition(':')
+        self._server = ThreadingHTTPServer((host or '127.0.0.1', int(port)), _ShardQueueRequestHandler)
+        self._server.daemon_threads = True
+        self._server.queue = queue
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class RemoteShardQueue:
+    """Client-Seite von ShardQueueServer mit derselben Schnittstelle wie ShardQueue."""
+
+    def __init__(self, url, timeout=DEFAULT_TIMEOUT):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(max_retries=Retry(total=5, backoff_factor=0.5, allowed_methods=None)))
+
+    def _call(self, method, path, payload=None):
+        response = self._session.request(method, self.url + path, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def settings(self):
+        return self._call('GET', '/settings')
+
+    def claim(self, worker):
+        return self._call('POST', '/claim', {'worker': worker})
+
+    def renew(self, shard_id, worker):
+        return self._call('POST', '/renew', {'shard_id': shard_id, 'worker': worker})['ok']
+
+    def complete(self, shard_id, found, unresolved):
+        self._call('POST', '/complete', {'shard_id': shard_id, 'found': found, 'unresolved': [list(item) for item in unresolved]})
+
+    def status(self):
+        status = self._call('GET', '/status')
+        return status['done'], status['total'], status['found']
+
+    def close(self):
+        self._session.close()
+
+
+def open_shard_queue(location):
+    """Öffnet eine Shard-Warteschlange: SQLite-Datei oder http://HOST:PORT eines Koordinators."""
+    if location.startswith(('http://', 'https://')):
+        return RemoteShardQueue(location)
+    return ShardQueue(location)
+
+
+def run_shard(shard, settings, sessions=None, limiter=None, heartbeat=None):
+    """
+    Durchsucht einen Shard im eingestellten Suchmodus (ohne Konsolenausgabe).
+    Gibt (gefundene Dateinamen, [(URL, Fehlerklasse)] ungeklärter URLs) zurück.
+    `heartbeat` wird bei Fortschritt höchstens alle SHARD_RENEW_SECONDS aufgerufen (Lease verlängern).
+    Der Zustand der Strategie (pruned: leere Minors in Folge, likely: Anker und Bewertung,
+    Kandidaten-Budget) gilt nur innerhalb des Shards und beginnt im nächsten neu.
+    """
+    base_url, filename_pattern = shard['base_url'], shard['filename_pattern']
+    if shard['version_range'] is None: # Statisches Modell
+        urls, feedback = [f"{base_url}{filename_pattern}"], None
+        search_key = f"{base_url}{filename_pattern}"
+    else:
+        version_range = tuple(tuple(version) for version in shard['version_range'])
+        search_key = repr((base_url, filename_pattern, version_range))
+    context = SearchContext(settings, sessions, search_key, limiter)
+    found = []
+    last_beat = time.monotonic()
+
+    def on_probe(url, probe):
+        nonlocal last_beat
+        result = probe_outcome(probe)
+        if feedback is not None: feedback.record(url, result)
+        if isinstance(result, str): found.append(result)
+        if heartbeat is not None and time.monotonic() - last_beat >= SHARD_RENEW_SECONDS:
+            last_beat = time.monotonic()
+            heartbeat()
+
+    try:
+        if shard['version_range'] is not None:
+            urls, feedback = create_url_source(base_url, filename_pattern, version_range, settings,
+                                               shard.get('build_hints'), shard.get('anchors'), context)
+        run_probes(urls, context, on_probe)
+        context.complete()
+    finally:
+        context.close()
+    return found, list(context.unresolved)
+
+
+def run_shard_worker(location, worker_id=None, stop_when_idle=True, sessions=None, limiter=None):
+    """
+    Worker-Schleife: holt Shards aus der Warteschlange (`location`, siehe open_shard_queue),
+    durchsucht sie mit den Einstellungen des Koordinators und meldet die Treffer zurück.
+    Endet, sobald alle Shards erledigt sind. Gibt die Anzahl bearbeiteter Shards zurück.
+    `sessions` und `limiter` (optional, z.B. die des Koordinators) ersetzen die eigenen.
+    """
+    queue = open_shard_queue(location)
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    settings = default_settings(**queue.settings())
+    settings['quiet'] = True
+    owns_sessions = sessions is None
+    if owns_sessions:
+        sessions = create_session_pool(settings) # Verbindungen über alle Shards hinweg wiederverwenden
+    limiter = limiter if limiter is not None else create_rate_limiter(settings) # Ein Token-Bucket für alle Shards
+    processed = 0
+    try:
+        while True:
+            shard = queue.claim(worker_id)
+            if shard is None:
+                done, total, _ = queue.status()
+                if done >= total and stop_when_idle:
+                    return processed
+                time.sleep(SHARD_POLL_SECONDS) # Andere Worker arbeiten noch; verwaiste Shards abwarten
+                continue
+            found, unresolved = run_shard(shard, settings, sessions, limiter, lambda: queue.renew(shard['id'], worker_id))
+            queue.complete(shard['id'], found, unresolved)
+            processed += 1
+    finally:
+        if owns_sessions:
+            sessions.close()
+        queue.close()
+
 
-def get_text(key, lang):
-    """Holt den übersetzten Text für einen Schlüssel in der angegebenen Sprache."""
-    # Fallback auf Englisch, wenn Sprache nicht existiert oder Schlüssel fehlt
-    return TRANSLATIONS.get(lang, TRANSLATIONS['en']).get(key, f"<{key}_MISSING>")
+def _worker_command(location):
+    """Befehlszeile für einen lokalen Worker-Prozess dieses Skripts."""
+    return [sys.executable, os.path.abspath(__file__), '--worker', location]
 
-def calculate_total_checks(version_range):
-    """Berechnet die *genaue* Anzahl der zu prüfenden Versionen."""
-    start_major, start_minor, start_patch = version_range[0]
-    end_major, end_minor, end_patch = version_range[1]
-    total = 0
-    max_patch = 25
-    max_minor_default = 99
-
-    if start_major > end_major: return 0
-    if start_major == end_major and start_minor > end_minor: return 0
-    if start_major == end_major and start_minor == end_minor and start_patch > end_patch: return 0
-
-    for major in range(start_major, end_major + 1):
-        min_minor_loop = start_minor if major == start_major else 0
-        max_minor_loop = end_minor if major == end_major else max_minor_default
-        for minor in range(min_minor_loop, max_minor_loop + 1):
-            min_patch_loop = start_patch if major == start_major and minor == start_minor else 0
-            max_patch_loop = end_patch if major == end_major and minor == end_minor else max_patch
-            if min_patch_loop <= max_patch_loop:
-                 total += (max_patch_loop - min_patch_loop + 1)
-    return total
-
-
-def check_url(full_url, possible_delays, delay_probability, timeout):
+
+def search_firmware_distributed(models, start_version=None, end_version=None, workers=os.cpu_count() or 1, queue_file=None,
+                                serve=None, settings=None, kindle_models=None, **overrides):
     """
-    Führt die Anfrage für eine einzelne URL aus.
-    Gibt Dateiname (str), Statuscode (int) oder None (Fehler) zurück.
-    Loggt Fehler nach stderr.
+    Wie search_firmware, verteilt die Suche aber auf Shards (SHARD_MINORS Minors je Modell),
+    die `workers` lokale Prozesse über eine SQLite-Warteschlange abarbeiten. Mit `serve`
+    ('[HOST:]PORT') können weitere Rechner per `--worker http://HOST:PORT` mitarbeiten;
+    `workers=0` überlässt die Arbeit dann ganz den entfernten Workern (ohne `serve` ein ValueError).
+    Ratenlimit und Parallelität gelten je Worker. Ergebniscache, Checkpoint, Ergebnisdatei
+    und Metrik-Export werden nicht unterstützt (ValueError, siehe DISTRIBUTED_UNSUPPORTED_SETTINGS);
+    die Warteschlange (`queue_file`) ist selbst der Checkpoint: Ein erneuter Aufruf mit
+    derselben Datei setzt fort. Ohne `queue_file` wird eine temporäre Datei verwendet.
+    Laufen keine lokalen Worker mehr und wurde SHARD_LEASE_SECONDS lang kein Shard fertig
+    (z.B. alle entfernten Worker ausgefallen), übernimmt der Koordinator die restlichen
+    Shards selbst. Strategie-Zustand und Kandidaten-Budget gelten je Shard (siehe run_shard).
     """
+    kindle_models = kindle_models or KINDLE_MODELS
+    settings = _headless_settings(settings, overrides)
+    lang = settings['language']
+    unsupported = [key for key in DISTRIBUTED_UNSUPPORTED_SETTINGS if settings.get(key)]
+    if unsupported:
+        raise ValueError(get_text('error_distributed_unsupported', lang).format(", ".join(unsupported)))
+    if workers < 0:
+        raise ValueError(get_text('error_workers_negative', lang))
+    if workers == 0 and serve is None:
+        raise ValueError(get_text('error_no_workers', lang))
+    quiet = settings['quiet']
+    model_keys, version_ranges = resolve_search_request(models, start_version, end_version, kindle_models, lang)
+    shards = split_into_shards(model_keys, kindle_models, version_ranges)
+
+    temp_dir = None
+    if not queue_file:
+        temp_dir = tempfile.mkdtemp(prefix='kindle_checker_')
+        queue_file = os.path.join(temp_dir, 'queue.sqlite')
+    queue = server = None
+    processes = []
+    sessions, limiter = create_shared_resources(settings) # Für übernommene Shards und den Download
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        response = requests.head(full_url, timeout=timeout, headers=headers, allow_redirects=True)
+        queue = ShardQueue(queue_file)
+        search_key = repr((sorted(model_keys), sorted(version_ranges.items()), settings['search_strategy']))
+        if queue.prepare(search_key, shards, settings) and not quiet:
+            print(get_text('distributed_resuming', lang).format(queue_file))
+        if serve is not None:
+            server = ShardQueueServer(queue, serve)
+            if not quiet: print(get_text('distributed_serving', lang).format(*server.address[:2]))
+        processes = [subprocess.Popen(_worker_command(queue_file)) for _ in range(workers)]
+        if not quiet:
+            print(get_text('distributed_started', lang).format(len(shards), len(processes)))
+
+        last_status = None
+        last_progress = time.monotonic()
+        while True:
+            done, total, found_count = queue.status()
+            if (done, found_count) != last_status:
+                if not quiet:
+                    sys.stdout.write(get_text('distributed_progress', lang).format(done, total, found_count))
+                    sys.stdout.flush()
+                last_status = (done, found_count)
+                last_progress = time.monotonic()
+            if done >= total:
+                break
+            if all(process.poll() is not None for process in processes) and (
+                    server is None or time.monotonic() - last_progress >= SHARD_LEASE_SECONDS):
+                # Keine lokalen Worker mehr und (ohne Server bzw. seit einem Lease) kein Fortschritt: Rest selbst übernehmen
+                run_shard_worker(queue_file, f"{socket.gethostname()}:{os.getpid()}:coordinator", sessions=sessions, limiter=limiter)
+                continue
+            time.sleep(0.5)
+        if not quiet: print()
+        found, unresolved = queue.results()
+        return _download_results(_search_results(model_keys, kindle_models, version_ranges, found, unresolved, lang),
+                                 settings, sessions, limiter)
+    finally:
+        if sessions is not None:
+            sessions.close()
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+        if server is not None:
+            server.close()
+        if queue is not None:
+            queue.close()
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
-        if random.random() < delay_probability:
-            if possible_delays:
-                time.sleep(random.choice(possible_delays))
 
-        if response.status_code == 200:
-            return full_url.split("/")[-1]
-        else:
-            return response.status_code
+# --- Watch-Modus (neue Versionen überwachen) ---
+
+def frontier_versions(latest, patches=WATCH_PATCHES, minors=WATCH_MINORS):
+    """
+    Versionen direkt oberhalb der neuesten bekannten Version `latest` (Tupel):
+    die nächsten `patches` Patches (bzw. Builds bei 4+ Stellen), Patch .0 bis .patches-1
+    der nächsten `minors` Minor-Versionen und der nächsten Major-Version.
+    """
+    major, minor, patch = latest[:3]
+    versions = []
+    if len(latest) > 3:
+        versions += [latest[:-1] + (latest[-1] + step,) for step in range(1, patches + 1)]
+    versions += [(major, minor, patch + step) for step in range(1, patches + 1)]
+    for next_minor in range(minor + 1, minor + minors + 1):
+        versions += [(major, next_minor, next_patch) for next_patch in range(patches)]
+    versions += [(major + 1, 0, next_patch) for next_patch in range(patches)]
+    return versions
+
+
+class WatchState:
+    """
+    Zuletzt bekannter Stand des Watch-Modus in einer JSON-Datei:
+    je Modell die neueste gefundene Version und die bekannten Dateinamen.
+    Wird atomar (über eine temporäre Datei) geschrieben.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.models = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.models = json.load(f).get('models', {})
+
+    def latest(self, model_key):
+        entry = self.models.get(model_key)
+        return tuple(entry['latest']) if entry else None
+
+    def update(self, model_key, filenames, versions):
+        """Übernimmt gefundene Dateien; gibt die bisher unbekannten zurück."""
+        entry = self.models.setdefault(model_key, {'latest': None, 'found': []})
+        new = [filename for filename in filenames if filename not in entry['found']]
+        entry['found'] += new
+        known_versions = [tuple(entry['latest'])] if entry['latest'] else []
+        entry['latest'] = list(max(known_versions + list(versions)))
+        return new
+
+    def save(self):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'updated': time.strftime('%Y-%m-%dT%H:%M:%S'), 'models': self.models}, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def post_webhook(url, payload, timeout=DEFAULT_TIMEOUT, lang=DEFAULT_LANGUAGE):
+    """Sendet eine Benachrichtigung als JSON per POST; Fehler werden nur gemeldet."""
+    try:
+        requests.post(url, json=payload, timeout=timeout).raise_for_status()
+        return True
     except requests.exceptions.RequestException as e:
-        # Logge Fehler nur einmal hier
-        print(f"\nFehler bei {full_url}: {type(e).__name__} - {e}", file=sys.stderr)
+        print(get_text('watch_webhook_failed', lang).format(url, e), file=sys.stderr)
+        return False
+
+
+def watch_firmware(models, settings=None, kindle_models=None, state_file=DEFAULT_WATCH_STATE_FILE,
+                   interval=DEFAULT_WATCH_INTERVAL, cycles=None, on_new=None, webhook=None,
+                   stop_on_new=False, **overrides):
+    """
+    Überwacht Modelle auf neue Firmware: Für jedes dynamische Modell wird nur die
+    "Front" oberhalb der neuesten bekannten Version geprüft (siehe frontier_versions),
+    alle `interval` Sekunden, bis `cycles` Runden erreicht sind (None = endlos) oder mit
+    `stop_on_new` nach der ersten Runde mit neuen Dateien. Modelle ohne bekannten Stand in
+    `state_file` werden einmalig vollständig durchsucht (search_firmware); statische Modelle
+    haben keine Front und werden übersprungen.
+
+    Neue Dateien werden an on_new(model_key, filenames, urls) und/oder per POST an
+    `webhook` gemeldet ({'model', 'files', 'urls'}) und mit `download_dir` heruntergeladen. Findet eine Runde etwas, wird die
+    Front sofort erneut geprüft, damit mehrere Veröffentlichungen auf einmal erkannt werden.
+    Gibt die Liste aller neu gefundenen Dateien ({'model', 'file', 'url'}) zurück.
+    """
+    kindle_models = kindle_models or KINDLE_MODELS
+    settings = _headless_settings(settings, overrides)
+    lang = settings['language']
+    model_keys, _ = resolve_search_request(models, None, None, kindle_models, lang)
+    state = WatchState(state_file)
+    targets = {}
+    for model_key in model_keys:
+        model = kindle_models[model_key]
+        if model.get("static_version") or not model.get("default_version_range"):
+            continue
+        base_url = model["base_url"] if model["base_url"].endswith('/') else model["base_url"] + '/'
+        targets[model_key] = (base_url, get_filename_pattern_simple(model["example_filename"], lang, quiet=True))
+
+    sessions, limiter = create_shared_resources(settings) # Für alle Runden und Downloads des Watch-Modus
+    try:
+        return _watch_loop(targets, state, settings, kindle_models, interval, cycles, on_new, webhook, stop_on_new,
+                           sessions, limiter)
+    finally:
+        if sessions is not None:
+            sessions.close()
+
+
+def _watch_loop(targets, state, settings, kindle_models, interval, cycles, on_new, webhook, stop_on_new, sessions, limiter):
+    """Prüfrunden von watch_firmware mit gemeinsamem SessionPool und Ratenbegrenzer."""
+    lang = settings['language']
+    # Ausgangsstand: einmalige vollständige Suche für Modelle ohne gespeicherten Stand
+    unseeded = [model_key for model_key in targets if state.latest(model_key) is None]
+    if unseeded:
+        unseeded, version_ranges = resolve_search_request(unseeded, None, None, kindle_models, lang)
+        for entry in _search_and_download(unseeded, kindle_models, version_ranges, settings, sessions, limiter):
+            base_url, filename_pattern = targets[entry['model']]
+            versions = [version_from_url(url, base_url, filename_pattern) for url in entry['urls']]
+            versions = [v for v in versions if v is not None]
+            if versions:
+                state.update(entry['model'], entry['found'], versions)
+            else:
+                print(get_text('watch_no_baseline', lang).format(entry['model']), file=sys.stderr)
+                del targets[entry['model']]
+        state.save()
+
+    watch_settings = dict(settings, **{key: None for key in WATCH_LOCAL_SETTINGS})
+    new_files = []
+    cycle = 0
+    while targets and (cycles is None or cycle < cycles):
+        cycle += 1
+        found_in_cycle = False
+        moved = True
+        while moved: # Front erneut prüfen, solange sie sich verschiebt
+            moved = False
+            found = _probe_watch_frontier(targets, state, watch_settings, sessions, limiter)
+            for model_key, filenames in found.items():
+                base_url, filename_pattern = targets[model_key]
+                urls = [f"{base_url}{filename}" for filename in filenames]
+                versions = [version_from_url(url, base_url, filename_pattern) for url in urls]
+                new = state.update(model_key, filenames, versions)
+                if not new:
+                    continue
+                found_in_cycle = moved = True
+                new_urls = [f"{base_url}{filename}" for filename in new]
+                new_files += [{'model': model_key, 'file': filename, 'url': url} for filename, url in zip(new, new_urls)]
+                if on_new is not None:
+                    on_new(model_key, new, new_urls)
+                if webhook:
+                    post_webhook(webhook, {'model': model_key, 'files': new, 'urls': new_urls}, settings['timeout'], lang)
+                if settings.get('download_dir'):
+                    download_firmware(new_urls, settings['download_dir'], settings, sessions, limiter)
+            state.save()
+        if (stop_on_new and found_in_cycle) or (cycles is not None and cycle >= cycles):
+            break
+        time.sleep(interval)
+    return new_files
+
+
+def _probe_watch_frontier(targets, state, settings, sessions=None, limiter=None):
+    """Prüft die Front aller Modelle in einer gemeinsamen Suche; gibt Modell -> gefundene Dateien zurück."""
+    url_models = {}
+    for model_key, (base_url, filename_pattern) in targets.items():
+        for version in frontier_versions(state.latest(model_key)):
+            url = f"{base_url}{filename_pattern.replace('*', '.'.join(map(str, version)))}"
+            url_models.setdefault(url, []).append(model_key)
+    found = {}
+
+    def on_probe(url, probe):
+        result = probe_outcome(probe)
+        if isinstance(result, str):
+            for model_key in url_models[url]:
+                found.setdefault(model_key, []).append(result)
+
+    context = SearchContext(settings, sessions, limiter=limiter)
+    try:
+        run_probes(list(url_models), context, on_probe)
+    finally:
+        context.close()
+    return found
+
+
+# --- Neueste Version (Galopp-Suche) ---
+
+class LatestVersionSearch:
+    """
+    Sucht die höchste vorhandene Version eines Modells, ohne den Bereich abzurastern.
+    Die Major.Minor-Kombinationen des Bereichs bilden eine Achse (5.99 -> 6.0); eine
+    Kombination gilt als vorhanden, wenn einer ihrer Patches .0 bis tolerance-1 existiert.
+    Ab der neuesten bekannten Kombination wird mit 1, 2, 4, 8, ... Schritten galoppiert und
+    die Grenze binär eingegrenzt. Leere Minors dahinter werden ebenfalls mit exponentiell
+    wachsenden Schritten übersprungen, danach füllen höchstens `gap_probes` Anfragen die
+    Lücken zwischen diesen Punkten (nächste zuerst); jeder Treffer setzt die Suche dort fort.
+    Zuletzt wird die Patch-Achse der höchsten Kombination genauso abgesucht.
+    Statt tausender Anfragen genügen so einige Dutzend; Versionen nur mit Build-Nummer oder
+    hinter nicht geprüften Lücken bleiben aber unerkannt, das Ergebnis ist eine Untergrenze.
+    confirm_listed() bestätigt stattdessen die Dateien eines Bucket-Listings (exakt).
+
+    Alle Kandidaten eines Schritts werden gemeinsam im eingestellten Suchmodus geprüft
+    (run_probes); `probes` zählt die Anfragen, `found` enthält Version -> Dateiname aller Treffer.
+    """
+
+    def __init__(self, base_url, filename_pattern, version_range, context, tolerance=LATEST_TOLERANCE,
+                 gap_probes=LATEST_GAP_PROBES):
+        self.base_url = base_url
+        self.filename_pattern = filename_pattern
+        self.space = VersionSpace(version_range)
+        self.context = context
+        self.tolerance = max(1, tolerance)
+        self.gap_probes = gap_probes
+        self.probes = 0
+        self.found = {}
+        self._exists = {} # Version -> vorhanden (bereits geprüft)
+        self._combos = [(major, minor) for major, minor, _, _ in self.space.patch_ranges()]
+        self._gap_spent = 0
+
+    def run(self, start):
+        """Sucht ab der Version `start` (Tupel); gibt die höchste gefundene Version oder None zurück."""
+        current = tuple(start[:3])
+        self._check([current])
+        if not self._combos:
+            return max(self.found) if self.found else None
+        positions = {combo: position for position, combo in enumerate(self._combos)}
+        major_starts = [position for position, (_, minor) in enumerate(self._combos) if minor == 0]
+        combo = self._highest(lambda position: self._check(self._combo_versions(position)),
+                              positions.get(current[:2], 0), len(self._combos) - 1,
+                              self._spend_gap_probes, major_starts)
+        prefix = self._combos[combo]
+        known = [version[2] for version in self.found if version[:2] == prefix]
+        self._highest(lambda patch: self._check([prefix + (patch,)]), max(known, default=0), MAX_PATCH)
+        return max(self.found) if self.found else None
+
+    def url(self, version):
+        return f"{self.base_url}{self.filename_pattern.replace('*', '.'.join(map(str, version)))}"
+
+    def confirm_listed(self, urls):
+        """
+        Bestätigt die Dateien eines Bucket-Listings (aufsteigend sortierte URLs, siehe
+        discover_firmware_urls) von oben per HEAD; gibt die höchste vorhandene Version zurück.
+        """
+        name_prefix, suffix = self.filename_pattern.split('*')
+        for url in reversed(urls):
+            filename = url[len(self.base_url):]
+            version = tuple(int(part) for part in filename[len(name_prefix):len(filename) - len(suffix)].split('.'))
+            if self._probe([version]):
+                return version
         return None
-    except Exception as e:
-        print(f"\nUnerwarteter interner Fehler bei URL {full_url}: {e}", file=sys.stderr)
+
+    def _combo_versions(self, position):
+        return [self._combos[position] + (patch,) for patch in range(self.tolerance)]
+
+    def _spend_gap_probes(self, cost):
+        """Reserviert Anfragen zum Auffüllen von Lücken; False, wenn `gap_probes` erschöpft ist."""
+        if self._gap_spent + cost > self.gap_probes:
+            return False
+        self._gap_spent += cost
+        return True
+
+    def _highest(self, alive, low, limit, gap_budget=None, starts=()):
+        """
+        Höchste Position bis `limit`, für die `alive` Treffer liefert, ausgehend von `low`:
+        galoppieren, binär eingrenzen und dahinter weitersuchen (_beyond).
+        """
+        while True:
+            step, high = 1, limit + 1
+            while low + step <= limit: # Galopp: 1, 2, 4, 8, ... oberhalb des letzten Treffers
+                if not alive(low + step):
+                    high = low + step
+                    break
+                low += step
+                step *= 2
+            while high - low > 1: # Binär eingrenzen
+                middle = (low + high) // 2
+                if alive(middle):
+                    low = middle
+                else:
+                    high = middle
+            beyond = self._beyond(alive, low, limit, gap_budget, starts)
+            if beyond is None:
+                return low
+            low = beyond # Lücke übersprungen: von dort weiter galoppieren
+
+    def _beyond(self, alive, low, limit, gap_budget, starts=()):
+        """
+        Erste gefundene Position hinter der Lücke oberhalb von `low` oder None: zuerst
+        `low` + 1, 2, 4, 8, ... bis vor die nächste Position aus `starts` (Beginn der
+        nächsten Major) und diese selbst, dann die Lücken zwischen den Sprüngen
+        (nächste zuerst), solange `gap_budget` weitere Anfragen erlaubt.
+        """
+        later = [start for start in starts if low < start <= limit][:1]
+        bound = later[0] - 1 if later else limit
+        points, offset = [], 1
+        while low + offset <= bound: # Exponentielle Schritte über leere Positionen
+            points.append(low + offset)
+            offset *= 2
+        for point in points + later:
+            if alive(point):
+                return point
+        if gap_budget is None:
+            return None
+        spans = [(a, b) for a, b in zip(points, points[1:] + [bound + 1]) if b - a > 1]
+        heapq.heapify(spans)
+        while spans and gap_budget(self.tolerance): # Lücken halbieren, nächste zuerst
+            a, b = heapq.heappop(spans)
+            middle = (a + b) // 2
+            if alive(middle):
+                return middle
+            for span in ((a, middle), (middle, b)):
+                if span[1] - span[0] > 1:
+                    heapq.heappush(spans, span)
         return None
 
+    def _check(self, versions):
+        """Prüft die noch unbekannten Versionen gemeinsam; gibt die vorhandenen zurück."""
+        return self._probe([version for version in dict.fromkeys(versions) if version in self.space])
 
-def generate_firmware_urls(base_url, filename_pattern, version_range, lang):
+    def _probe(self, versions):
+        pending = {self.url(version): version for version in versions if version not in self._exists}
+
+        def on_probe(url, probe):
+            result = probe_outcome(probe)
+            if isinstance(result, str):
+                self._exists[pending[url]] = True
+                self.found[pending[url]] = result
+
+        if pending:
+            self._exists.update(dict.fromkeys(pending.values(), False))
+            self.probes += len(pending)
+            run_probes(list(pending), self.context, on_probe)
+        return [version for version in versions if self._exists[version]]
+
+
+def find_latest_firmware(models, start_version=None, end_version=None, settings=None, kindle_models=None, **overrides):
     """
-    Generator-Funktion, die alle zu prüfenden URLs basierend auf dem Versionsbereich erzeugt.
-    """
-    start_major, start_minor, start_patch = version_range[0]
-    end_major, end_minor, end_patch = version_range[1]
-    max_patch_val = 25
-    max_minor_default = 99
-
-    if start_major > end_major: return
-    if start_major == end_major and start_minor > end_minor: return
-    if start_major == end_major and start_minor == end_minor and start_patch > end_patch: return
-
-    for major in range(start_major, end_major + 1):
-        min_minor_loop = start_minor if major == start_major else 0
-        max_minor_loop = end_minor if major == end_major else max_minor_default
-        for minor in range(min_minor_loop, max_minor_loop + 1):
-            min_patch_loop = start_patch if major == start_major and minor == start_minor else 0
-            max_patch_loop = end_patch if major == end_major and minor == end_minor else max_patch_val
-            if min_patch_loop > max_patch_loop: continue
-            for patch in range(min_patch_loop, max_patch_loop + 1):
-                version = f"{major}.{minor}.{patch}"
-                try:
-                    test_filename = filename_pattern.replace("*", version)
-                    yield f"{base_url}{test_filename}"
-                except AttributeError:
-                    print(get_text('error_invalid_pattern', lang).format(filename_pattern, version), file=sys.stderr)
-                    continue
+    Ermittelt für jedes dynamische Modell nur die neueste vorhandene Firmware (LatestVersionSearch),
+    ausgehend von der Version der Beispieldatei bzw. dem Beginn des Versionsbereichs, falls
+    diese außerhalb liegt. Erlaubt der Bucket das Auflisten (discovery='auto'), werden
+    stattdessen die gelisteten Dateien von oben bestätigt. Parameter wie bei search_firmware;
+    Ergebnis-Cache und Checkpoint werden nicht verwendet, damit neue Dateien nicht hinter
+    gespeicherten 403 verborgen bleiben.
+
+    Gibt je Modell ein Dictionary zurück:
+    {'model', 'version_range', 'latest' ('M.m.p' oder None), 'file', 'url', 'probes' (gestellte Anfragen),
+    'full_checks' (Anfragen einer vollständigen Suche), 'lower_bound' (True, wenn geraten statt
+    gelistet: höhere Versionen sind möglich), 'unresolved' (Liste {'url', 'error'})}.
+    Statische Modelle werden übersprungen.
+    """
+    kindle_models = kindle_models or KINDLE_MODELS
+    settings = _headless_settings(settings, overrides)
+    lang = settings['language']
+    model_keys, version_ranges = resolve_search_request(models, start_version, end_version, kindle_models, lang)
+    settings = dict(settings, **{key: None for key in LATEST_LOCAL_SETTINGS})
+    results = []
+    for model_key in model_keys:
+        if model_key not in version_ranges:
+            continue
+        model = kindle_models[model_key]
+        version_range = version_ranges[model_key]
+        base_url = model["base_url"] if model["base_url"].endswith('/') else model["base_url"] + '/'
+        filename_pattern = get_filename_pattern_simple(model["example_filename"], lang, quiet=True)
+        anchors = [anchor[:3] for anchor in get_version_anchors(model["example_filename"])
+                   if len(anchor) >= 3 and version_range[0] <= anchor[:3] <= version_range[1]]
+        context = SearchContext(settings)
+        try:
+            search = LatestVersionSearch(base_url, filename_pattern, version_range, context)
+            listed = discover_firmware_urls(base_url, filename_pattern, version_range, settings, context)
+            if listed is not None:
+                latest = search.confirm_listed(listed)
+            else:
+                latest = search.run(max(anchors) if anchors else version_range[0])
+        finally:
+            context.close()
+        results.append({
+            'model': model_key,
+            'version_range': ['.'.join(map(str, v)) for v in version_range],
+            'latest': '.'.join(map(str, latest)) if latest else None,
+            'file': search.found[latest] if latest else None,
+            'url': search.url(latest) if latest else None,
+            'probes': search.probes,
+            'full_checks': calculate_total_checks(version_range),
+            'lower_bound': listed is None,
+            'unresolved': [{'url': url, 'error': error_class} for url, error_class in context.unresolved],
+        })
+    return results
 
 
-def extract_version_key(filename, lang):
+# --- Download ---
+
+def parse_byte_size(value):
+    """Wandelt '500K', '10M', '1.5G' oder eine Zahl (Bytes) in Bytes um; wirft ValueError."""
+    text = str(value).strip().upper().rstrip('B')
+    factor = 1
+    if text and text[-1] in 'KMG':
+        factor = 1024 ** ('KMG'.index(text[-1]) + 1)
+        text = text[:-1]
+    size = float(text) * factor
+    if not math.isfinite(size) or size < 0:
+        raise ValueError(value)
+    return int(size)
+
+
+def _format_bytes(size):
+    """Größe in lesbarer Form (KiB/MiB/GiB)."""
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GiB"
+
+
+class FirmwareDownload:
     """
-    Extrahiert ein Versionsobjekt aus einem Dateinamen für die Sortierung.
+    Zustand eines Downloads: Die Datei wird in `<name>.part` (bei bekannter Größe vorbelegt)
+    in Abschnitten von `chunk_size` Bytes geladen; `<name>.part.json` hält fest, welche
+    Abschnitte fertig sind. Ein abgebrochener Download lädt beim nächsten Mal nur die
+    fehlenden Abschnitte - sofern sich Größe und ETag der Datei nicht geändert haben.
     """
-    match = re.search(r'(\d+\.\d+\.\d+(?:\.\d+)*)', filename)
-    if match:
+
+    def __init__(self, url, directory, size, etag, accepts_ranges, chunk_size):
+        self.url = url
+        self.filename = url.rsplit('/', 1)[-1]
+        self.path = os.path.join(directory, self.filename)
+        self.part_path = f"{self.path}.part"
+        self.state_path = f"{self.part_path}.json"
+        self.size = size
+        self.etag = etag
+        if accepts_ranges and size:
+            self.chunk_size = max(DOWNLOAD_BLOCK_SIZE, chunk_size)
+            self.chunks = [(start, min(start + self.chunk_size, size) - 1) for start in range(0, size, self.chunk_size)]
+        else: # Ohne Range-Unterstützung oder Größe: ein einziger Abschnitt, nicht fortsetzbar
+            self.chunk_size = None
+            self.chunks = [(0, None)]
+        self.done = set()
+        self.resumed = False
+        self.failed = False # Ein Abschnitt ist endgültig gescheitert: restliche Abschnitte nicht mehr laden
+        self._lock = threading.Lock()
+
+    def _state(self):
+        return {'url': self.url, 'size': self.size, 'etag': self.etag, 'chunk_size': self.chunk_size}
+
+    def prepare(self):
+        """Legt die Teildatei an bzw. übernimmt einen passenden Stand; gibt die offenen Abschnitte zurück."""
+        state = None
+        if self.chunk_size and os.path.exists(self.part_path) and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = None
+        if state is not None and all(state.get(key) == value for key, value in self._state().items()):
+            self.done = set(state.get('done', []))
+            self.resumed = bool(self.done)
+        else:
+            with open(self.part_path, 'wb') as f:
+                if self.size: f.truncate(self.size) # Vorbelegen: Abschnitte schreiben an ihren Offset
+            self.done = set()
+        self._save_state()
+        return [index for index in range(len(self.chunks)) if index not in self.done]
+
+    def _save_state(self):
+        if not self.chunk_size:
+            return
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(self._state(), done=sorted(self.done)), f)
+        os.replace(temp_path, self.state_path)
+
+    def mark_done(self, index):
+        """Markiert einen Abschnitt als fertig; gibt True zurück, wenn damit alle fertig sind."""
+        with self._lock:
+            self.done.add(index)
+            self._save_state()
+            return len(self.done) == len(self.chunks)
+
+    def finish(self):
+        """
+        Berechnet SHA-256 (und MD5) blockweise über die fertige Teildatei und benennt sie um.
+        Gibt (sha256, md5) als Hex-Strings zurück.
+        """
+        sha256, md5 = hashlib.sha256(), hashlib.md5()
+        with open(self.part_path, 'rb') as f:
+            for block in iter(lambda: f.read(DOWNLOAD_BLOCK_SIZE), b''):
+                sha256.update(block)
+                md5.update(block)
+        os.replace(self.part_path, self.path)
+        self.discard_state()
+        return sha256.hexdigest(), md5.hexdigest()
+
+    def discard_state(self):
         try:
-            return pkg_version.parse(match.group(1))
-        except pkg_version.InvalidVersion:
-            print(get_text('warning_invalid_version_format', lang).format(filename), file=sys.stderr)
-            return pkg_version.parse("0.0.0")
-    else:
-         print(get_text('warning_no_version_for_sort', lang).format(filename), file=sys.stderr)
-         return pkg_version.parse("0.0.0")
+            os.remove(self.state_path)
+        except OSError:
+            pass
 
 
-def sort_firmwares_by_version(firmware_list, lang):
+def _etag_md5(etag):
+    """MD5 aus einem S3-ETag (nur bei Uploads in einem Stück, sonst None)."""
+    value = (etag or '').strip('"').lower()
+    return value if re.fullmatch(r'[0-9a-f]{32}', value) else None
+
+
+def plan_download(url, directory, settings, sessions, limiter=None):
+    """Ermittelt Größe, ETag und Range-Unterstützung per HEAD und legt den FirmwareDownload an."""
+    if limiter is not None:
+        limiter.acquire()
+    response = sessions.get().head(url, timeout=settings['timeout'], allow_redirects=True)
+    response.raise_for_status()
+    accepts_ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+    return FirmwareDownload(
+        url, directory, _header_int(response.headers.get('Content-Length')), response.headers.get('ETag'),
+        accepts_ranges, settings.get('download_chunk_size', DEFAULT_DOWNLOAD_CHUNK_SIZE),
+    )
+
+
+def _download_chunk(download, index, settings, sessions, limiter, bandwidth):
     """
-    Sortiert eine Liste von Firmware-Dateinamen numerisch nach ihrer Version.
+    Lädt einen Abschnitt per Range-Anfrage und schreibt ihn an seinen Offset in die
+    Teildatei. Bei Abbruch, 5xx oder Drosselung wird der Abschnitt bis zu
+    DOWNLOAD_CHUNK_RETRIES Mal mit wachsender Pause wiederholt. Ist die Datei bereits
+    gescheitert (`download.failed`), bricht der Abschnitt ab und gibt die bis dahin
+    geschriebenen Bytes zurück.
     """
-    if not firmware_list:
-        return []
-    try:
-        # Verwende eine Lambda-Funktion, um die Sprache an extract_version_key zu übergeben
-        firmware_list.sort(key=lambda fname: extract_version_key(fname, lang))
-        return firmware_list
-    except Exception as e:
-        print(get_text('error_sorting_list', lang).format(e), file=sys.stderr)
-        return firmware_list
+    start, end = download.chunks[index]
+    headers = {'Range': f"bytes={start}-{end}"} if end is not None else {}
+    if download.etag and end is not None:
+        headers['If-Range'] = download.etag # Datei inzwischen ersetzt -> 200 statt 206
+    for attempt in range(DOWNLOAD_CHUNK_RETRIES + 1):
+        if download.failed:
+            return 0
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            with sessions.get().get(download.url, headers=headers, timeout=settings['timeout'], stream=True) as response:
+                if end is not None and response.status_code != 206:
+                    raise requests.exceptions.HTTPError(f"HTTP {response.status_code} statt 206 für Bytes {start}-{end}", response=response)
+                response.raise_for_status()
+                written = 0
+                with open(download.part_path, 'r+b' if end is not None else 'wb') as f:
+                    f.seek(start)
+                    for block in response.iter_content(DOWNLOAD_BLOCK_SIZE):
+                        if download.failed:
+                            return written
+                        if bandwidth is not None:
+                            bandwidth.acquire(len(block))
+                        f.write(block)
+                        written += len(block)
+            if end is not None and written != end - start + 1:
+                raise requests.exceptions.ChunkedEncodingError(f"{written} von {end - start + 1} Bytes erhalten")
+            return written
+        except requests.exceptions.RequestException:
+            if attempt >= DOWNLOAD_CHUNK_RETRIES:
+                raise
+            time.sleep(min(ConcurrencyController.BACKOFF_MAX, ConcurrencyController.BACKOFF_BASE * 2 ** attempt))
 
-# --- Suchfunktionen ---
 
-def check_firmware_version(base_url, filename_pattern, version_range, settings):
+def download_firmware(urls, directory, settings, sessions=None, limiter=None):
     """
-    Überprüft *sequenziell*, ob Firmware-Dateien existieren.
+    Lädt Firmware-Dateien nach `directory`: Jede Datei wird in Range-Abschnitte geteilt,
+    die `download_connections` Threads über alle Dateien hinweg parallel laden
+    (`sessions` und `limiter` der Suche, sonst eigene; `download_bandwidth` begrenzt die
+    Bytes pro Sekunde insgesamt). Abschnitte werden über ein begrenztes Fenster vergeben;
+    scheitert ein Abschnitt, werden die übrigen Abschnitte derselben Datei verworfen.
+    Teildateien werden fortgesetzt, vollständige Dateien gleicher Größe nicht erneut geladen.
+    SHA-256 wird blockweise berechnet; bei S3-ETags aus einem Stück wird zusätzlich die
+    MD5-Prüfsumme verglichen (auch bei bereits vorhandenen Dateien, die sonst neu geladen werden).
+
+    Gibt je URL ein Dictionary zurück: {'url', 'path', 'size', 'sha256', 'status'
+    ('downloaded', 'resumed', 'exists' oder 'failed'), 'error'}.
     """
     lang = settings['language']
-    verbose = settings['verbose']
-    possible_delays = settings['possible_delays']
-    delay_probability = settings['delay_probability']
-    timeout = settings['timeout']
+    quiet = settings.get('quiet', False)
+    os.makedirs(directory, exist_ok=True)
+    owns_sessions = sessions is None
+    sessions = sessions if sessions is not None else create_session_pool(settings)
+    limiter = limiter if limiter is not None else create_rate_limiter(settings)
+    bandwidth_limit = settings.get('download_bandwidth', DEFAULT_DOWNLOAD_BANDWIDTH)
+    bandwidth = TokenBucket(bandwidth_limit) if bandwidth_limit and bandwidth_limit > 0 else None
+    results = {url: {'url': url, 'path': None, 'size': None, 'sha256': None, 'status': 'failed', 'error': None} for url in urls}
+    start_time = time.monotonic()
+    transferred = 0
 
-    found_files = []
-    total_checks = calculate_total_checks(version_range)
-    if total_checks == 0:
-        print(get_text('no_versions_to_check', lang))
-        return []
-    checks_done = 0
+    def fail(url, error):
+        results[url].update(status='failed', error=str(error))
+        if not quiet:
+            print(get_text('download_failed', lang).format(url, error), file=sys.stderr)
 
-    print(get_text('starting_sequential_search', lang).format(total_checks))
+    def complete(download):
+        sha256, md5 = download.finish()
+        expected_md5 = _etag_md5(download.etag)
+        if expected_md5 and expected_md5 != md5:
+            os.remove(download.path)
+            fail(download.url, get_text('download_checksum_mismatch', lang).format(md5, expected_md5))
+            return
+        results[download.url].update(path=download.path, size=os.path.getsize(download.path), sha256=sha256,
+                                     status='resumed' if download.resumed else 'downloaded')
+        if not quiet:
+            print(get_text('download_complete', lang).format(download.filename, _format_bytes(results[download.url]['size']), sha256))
 
-    for full_url in generate_firmware_urls(base_url, filename_pattern, version_range, lang):
-        result = check_url(full_url, possible_delays, delay_probability, timeout)
-        checks_done += 1
-        progress = (checks_done / total_checks) * 100 if total_checks > 0 else 100
+    try:
+        downloads = {}
+        for url in dict.fromkeys(urls):
+            try:
+                download = plan_download(url, directory, settings, sessions, limiter)
+            except requests.exceptions.RequestException as e:
+                fail(url, e)
+                continue
+            if download.size and not os.path.exists(download.part_path) and os.path.exists(download.path) \
+                    and os.path.getsize(download.path) == download.size:
+                sha256, md5 = hashlib.sha256(), hashlib.md5()
+                with open(download.path, 'rb') as f:
+                    for block in iter(lambda: f.read(DOWNLOAD_BLOCK_SIZE), b''):
+                        sha256.update(block)
+                        md5.update(block)
+                expected_md5 = _etag_md5(download.etag)
+                if not expected_md5 or expected_md5 == md5.hexdigest():
+                    results[url].update(path=download.path, size=download.size, sha256=sha256.hexdigest(), status='exists')
+                    continue
+                # Gleich groß, aber beschädigt oder ersetzt: neu laden
+            try:
+                downloads[url] = (download, download.prepare())
+            except OSError as e:
+                fail(url, e)
 
-        if isinstance(result, str): # Gefunden
-            found_files.append(result)
-            if not verbose: sys.stdout.write("\r" + " " * 80 + "\r")
-            print(get_text('found_url', lang).format(full_url))
-            if not verbose:
-                 sys.stdout.write(get_text('progress_update', lang).format(checks_done, total_checks, progress, len(found_files)))
-                 sys.stdout.flush()
-        elif isinstance(result, int): # Nicht gefunden
-            if verbose:
-                print(get_text('not_found_url_status', lang).format(full_url, result))
-            elif not verbose:
-                sys.stdout.write(get_text('progress_update', lang).format(checks_done, total_checks, progress, len(found_files)))
-                sys.stdout.flush()
-        elif result is None: # Fehler
-            if not verbose:
-                sys.stdout.write(get_text('progress_update', lang).format(checks_done, total_checks, progress, len(found_files)))
-                sys.stdout.flush()
-        else: # Unerwartet
-             if not verbose: sys.stdout.write("\r" + " " * 80 + "\r")
-             print(get_text('error_unexpected_return_type', lang).format(full_url, type(result)), file=sys.stderr)
-             if not verbose:
-                sys.stdout.write(get_text('progress_update', lang).format(checks_done, total_checks, progress, len(found_files)))
-                sys.stdout.flush()
-
-    if not verbose:
-        sys.stdout.write("\r" + " " * 80 + "\r")
-    print(get_text('sequential_search_complete', lang))
-    return found_files
+        for download, pending in downloads.values():
+            if not pending: complete(download) # Beim letzten Mal schon vollständig geladen
+        chunks = ((download, index) for download, pending in downloads.values() for index in pending
+                  if not download.failed) # Abschnitte gescheiterter Dateien überspringen
+        connections = max(1, settings.get('download_connections', DEFAULT_DOWNLOAD_CONNECTIONS))
+        window = connections * THREAD_QUEUE_FACTOR
+        futures = {}
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            def fill_window():
+                while len(futures) < window:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        return
+                    download, index = chunk
+                    futures[executor.submit(_download_chunk, download, index, settings, sessions, limiter, bandwidth)] = chunk
 
+            try:
+                fill_window()
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        download, index = futures.pop(future)
+                        try:
+                            written = future.result()
+                        except (requests.exceptions.RequestException, OSError) as e:
+                            written = 0
+                            if not download.failed:
+                                download.failed = True
+                                fail(download.url, e)
+                        transferred += written
+                        if not download.failed and download.mark_done(index):
+                            complete(download)
+                    fill_window()
+            finally:
+                for future in futures:
+                    future.cancel()
+    finally:
+        if owns_sessions:
+            sessions.close()
+
+    duration = time.monotonic() - start_time
+    if not quiet and transferred:
+        print(get_text('download_summary', lang).format(
+            sum(1 for entry in results.values() if entry['status'] in ('downloaded', 'resumed')),
+            _format_bytes(transferred), duration, _format_bytes(transferred / max(duration, 1e-9))))
+    return [results[url] for url in urls]
 
-def check_firmware_version_threaded(base_url, filename_pattern, version_range, settings):
+
+def create_shared_resources(settings):
     """
-    Überprüft *parallel* mit Threads, ob Firmware-Dateien existieren.
+    SessionPool und Ratenbegrenzer, die eine Suche mit dem anschließenden Download teilt.
+    Der Pool wird nur mit `download_dir` vorab angelegt (sonst None: SearchContext legt dann
+    einen eigenen mit Verbindungsmetriken an); der Token-Bucket ist None ohne Ratenlimit.
     """
-    lang = settings['language']
-    verbose = settings['verbose']
-    possible_delays = settings['possible_delays']
-    delay_probability = settings['delay_probability']
-    timeout = settings['timeout']
-    max_threads = settings['max_threads']
+    sessions = create_session_pool(settings) if settings.get('download_dir') else None
+    return sessions, create_rate_limiter(settings)
+
+
+def _download_results(results, settings, sessions=None, limiter=None):
+    """Download-Stufe nach search_firmware: lädt alle gefundenen Dateien und ergänzt 'downloads' je Modell."""
+    directory = settings.get('download_dir')
+    if not directory:
+        return results
+    urls = [url for entry in results for url in entry['urls']]
+    downloads = {entry['url']: entry for entry in download_firmware(urls, directory, settings, sessions, limiter)}
+    for entry in results:
+        entry['downloads'] = [downloads[url] for url in entry['urls']]
+    return results
+
+
+# --- Nicht-interaktive Schnittstelle (Kommandozeile / Bibliothek) ---
+
+def default_settings(**overrides):
+    """
+    Gibt ein vollständiges Einstellungs-Dictionary mit den Standardwerten zurück.
+    Einzelne Werte können als Schlüsselwortargumente überschrieben werden;
+    unbekannte Schlüssel führen zu einem ValueError.
+    """
+    settings = {
+        'language': DEFAULT_LANGUAGE, # Starte mit Deutsch
+        'search_mode': DEFAULT_SEARCH_MODE,
+        'rate_limit': DEFAULT_RATE_LIMIT,
+        'rate_burst': DEFAULT_RATE_BURST,
+        'adaptive_concurrency': DEFAULT_ADAPTIVE_CONCURRENCY,
+        'throttle_retries': DEFAULT_THROTTLE_RETRIES,
+        'timeout': DEFAULT_TIMEOUT,
+        'verbose': DEFAULT_VERBOSE,
+        'quiet': False, # Keine Konsolenausgabe (CLI/Bibliothek)
+        'max_threads': DEFAULT_MAX_THREADS,
+        'pool_size': DEFAULT_POOL_SIZE,
+        'http_retries': DEFAULT_HTTP_RETRIES,
+        'max_concurrency': DEFAULT_MAX_CONCURRENCY,
+        'use_http2': DEFAULT_USE_HTTP2,
+        'http_engine': DEFAULT_HTTP_ENGINE,
+        'pipeline_connections': DEFAULT_PIPELINE_CONNECTIONS,
+        'pipeline_depth': DEFAULT_PIPELINE_DEPTH,
+        'search_strategy': DEFAULT_SEARCH_STRATEGY,
+        'probe_budget': DEFAULT_PROBE_BUDGET,
+        'time_budget': DEFAULT_TIME_BUDGET,
+        'discovery': DEFAULT_DISCOVERY,
+        'prune_probe_patches': DEFAULT_PRUNE_PROBE_PATCHES,
+        'prune_max_misses': DEFAULT_PRUNE_MAX_MISSES,
+        'prune_max_empty_minors': DEFAULT_PRUNE_MAX_EMPTY_MINORS,
+        'max_version_depth': DEFAULT_MAX_VERSION_DEPTH,
+        'max_build': DEFAULT_MAX_BUILD,
+        'build_hints': [],
+        'cache_file': DEFAULT_CACHE_FILE,
+        'cache_hit_ttl': DEFAULT_CACHE_HIT_TTL,
+        'cache_miss_ttl': DEFAULT_CACHE_MISS_TTL,
+        'revalidate': DEFAULT_REVALIDATE,
+        'checkpoint_file': DEFAULT_CHECKPOINT_FILE,
+        'resume': False, # Vorhandenen Checkpoint fortsetzen statt neu zu beginnen
+        'output_file': DEFAULT_OUTPUT_FILE,
+        'output_format': None, # None = anhand der Dateiendung
+        'metrics_listen': DEFAULT_METRICS_LISTEN,
+        'metrics_file': DEFAULT_METRICS_FILE,
+        'metrics_interval': DEFAULT_METRICS_INTERVAL,
+        'download_dir': DEFAULT_DOWNLOAD_DIR,
+        'download_connections': DEFAULT_DOWNLOAD_CONNECTIONS,
+        'download_chunk_size': DEFAULT_DOWNLOAD_CHUNK_SIZE,
+        'download_bandwidth': DEFAULT_DOWNLOAD_BANDWIDTH
+    }
+    unknown = set(overrides) - set(settings)
+    if unknown:
+        raise ValueError(f"Unbekannte Einstellungen: {', '.join(sorted(unknown))}")
+    settings.update(overrides)
+    return settings
+
+
+def parse_version_string(version_str, lang):
+    """
+    Wandelt eine Version 'M.m.p' (fehlende Teile = 0) in ein Tupel (M, m, p) um.
+    Wirft ValueError bei ungültiger Eingabe.
+    """
+    parsed_version = pkg_version.parse(version_str) # InvalidVersion ist ein ValueError
+    version_parts = parsed_version.release[:3]
+    while len(version_parts) < 3: version_parts += (0,)
+    if any(v < 0 for v in version_parts):
+        raise ValueError(get_text('error_version_negative', lang))
+    return version_parts
+
+
+def search_firmware(models, start_version=None, end_version=None, settings=None, kindle_models=None, **overrides):
+    """
+    Nicht-interaktive Firmware-Suche für Skripte, Cron-Jobs und CI: keine Eingabeaufforderungen,
+    keine Konsolenausgabe (Netzwerkfehler landen weiterhin auf stderr).
+
+    `models` ist ein Modellschlüssel, eine kommagetrennte Liste, 'all' oder eine Liste von Schlüsseln.
+    `start_version`/`end_version` (Tupel oder 'M.m.p') ersetzen den Standard-Versionsbereich
+    der dynamischen Modelle. Weitere Einstellungen (z.B. search_mode='async', max_threads=16,
+    timeout=5) können über `settings` oder als Schlüsselwortargumente übergeben werden.
+
+    Gibt je Modell ein Dictionary zurück:
+    {'model', 'base_url', 'static', 'version_range', 'found' (sortierte Dateinamen), 'urls',
+    'unresolved' (Liste {'url', 'error'} der URLs ohne endgültige Antwort),
+    'changed' (seit der letzten Prüfung ersetzte Dateien mit alten und neuen ETag/Größe/Last-Modified,
+    nur mit Ergebnis-Cache)}. Mit der Einstellung `download_dir` werden alle gefundenen Dateien
+    anschließend heruntergeladen (siehe download_firmware) und je Modell unter 'downloads' gemeldet.
+    Wirft ValueError bei unbekannten Modellen, Einstellungen oder ungültigen Versionen.
+    """
+    kindle_models = kindle_models or KINDLE_MODELS
+    settings = _headless_settings(settings, overrides)
+    model_keys, version_ranges = resolve_search_request(models, start_version, end_version, kindle_models, settings['language'])
+    sessions, limiter = create_shared_resources(settings)
+    try:
+        return _search_and_download(model_keys, kindle_models, version_ranges, settings, sessions, limiter)
+    finally:
+        if sessions is not None:
+            sessions.close()
+
+
+def _search_and_download(model_keys, kindle_models, version_ranges, settings, sessions=None, limiter=None):
+    """Suche und Download-Stufe von search_firmware mit gemeinsamem SessionPool und Ratenbegrenzer."""
+    unresolved, changed = {}, {}
+    found = check_firmware_batch(model_keys, kindle_models, settings, version_ranges, unresolved, changed, sessions, limiter)
+    results = _search_results(model_keys, kindle_models, version_ranges, found, unresolved, settings['language'], changed)
+    return _download_results(results, settings, sessions, limiter)
+
+
+def _headless_settings(settings, overrides):
+    """Einstellungen für die nicht-interaktive Suche (standardmäßig ohne Konsolenausgabe)."""
+    merged = dict(settings or {})
+    merged.update(overrides)
+    merged.setdefault('quiet', True)
+    return default_settings(**merged)
+
+
+def resolve_search_request(models, start_version, end_version, kindle_models, lang):
+    """
+    Prüft Modelle und Versionen einer nicht-interaktiven Suche (siehe search_firmware).
+    Gibt (Modellschlüssel, Modell -> Versionsbereich der dynamischen Modelle) zurück.
+    """
+    model_input = models if isinstance(models, str) else ",".join(models)
+    model_keys = resolve_model_keys(model_input, kindle_models)
+    if model_keys is None:
+        raise ValueError(get_text('cli_error_model_invalid', lang).format(model_input))
+    if isinstance(start_version, str): start_version = parse_version_string(start_version, lang)
+    if isinstance(end_version, str): end_version = parse_version_string(end_version, lang)
+
+    version_ranges = {}
+    for model_key in model_keys:
+        default_version_range = kindle_models[model_key].get("default_version_range")
+        if kindle_models[model_key].get("static_version") or not default_version_range:
+            continue
+        version_range = (tuple(start_version or default_version_range[0]), tuple(end_version or default_version_range[1]))
+        if version_range[0] > version_range[1]:
+            raise ValueError(get_text('error_start_version_greater', lang))
+        version_ranges[model_key] = version_range
+    return model_keys, version_ranges
+
+
+def _search_results(model_keys, kindle_models, version_ranges, found, unresolved, lang, changed=None):
+    """Baut die Rückgabe von search_firmware aus den gefundenen und ungeklärten Dateien je Modell."""
+    results = []
+    for model_key in model_keys:
+        base_url = kindle_models[model_key].get("base_url") or ""
+        if base_url and not base_url.endswith('/'): base_url += '/'
+        sorted_firmwares = sort_firmwares_by_version(found.get(model_key, []), lang) if found.get(model_key) else []
+        version_range = version_ranges.get(model_key)
+        results.append({
+            'model': model_key,
+            'base_url': base_url,
+            'static': bool(kindle_models[model_key].get("static_version")),
+            'version_range': ['.'.join(map(str, v)) for v in version_range] if version_range else None,
+            'found': sorted_firmwares,
+            'urls': [f"{base_url}{filename}" for filename in sorted_firmwares],
+            'unresolved': [{'url': url, 'error': error_class} for url, error_class in unresolved.get(model_key, [])],
+            'changed': [
+                {'url': url, 'old_etag': known.etag, 'etag': probe.etag, 'old_size': known.content_length,
+                 'size': probe.content_length, 'old_last_modified': known.last_modified, 'last_modified': probe.last_modified}
+                for url, known, probe in (changed or {}).get(model_key, [])
+            ],
+        })
+    return results
+
+
+def build_arg_parser(lang=DEFAULT_LANGUAGE):
+    """Erstellt den Argument-Parser für die nicht-interaktive Nutzung."""
+    parser = argparse.ArgumentParser(description=get_text('cli_description', lang))
+    parser.add_argument('-m', '--model', help=get_text('cli_help_model', lang))
+    parser.add_argument('--start', help=get_text('cli_help_start', lang))
+    parser.add_argument('--end', help=get_text('cli_help_end', lang))
+    parser.add_argument('--mode', choices=SEARCH_MODES, default=DEFAULT_SEARCH_MODE,
+                        help=get_text('cli_help_mode', lang).format(DEFAULT_SEARCH_MODE))
+    parser.add_argument('-c', '--concurrency', type=int, help=get_text('cli_help_concurrency', lang))
+    parser.add_argument('--no-adaptive', action='store_true', help=get_text('cli_help_no_adaptive', lang))
+    parser.add_argument('--throttle-retries', type=int, default=DEFAULT_THROTTLE_RETRIES,
+                        help=get_text('cli_help_throttle_retries', lang).format(DEFAULT_THROTTLE_RETRIES))
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=get_text('cli_help_timeout', lang).format(DEFAULT_TIMEOUT))
+    parser.add_argument('--rate-limit', type=float, default=DEFAULT_RATE_LIMIT, metavar='RPS', help=get_text('cli_help_rate_limit', lang))
+    parser.add_argument('--burst', type=int, default=DEFAULT_RATE_BURST, help=get_text('cli_help_burst', lang))
+    parser.add_argument('--strategy', choices=SEARCH_STRATEGIES, default=DEFAULT_SEARCH_STRATEGY,
+                        help=get_text('cli_help_strategy', lang).format(DEFAULT_SEARCH_STRATEGY))
+    parser.add_argument('--budget', type=int, default=DEFAULT_PROBE_BUDGET, metavar='N', help=get_text('cli_help_budget', lang))
+    parser.add_argument('--deadline', type=float, default=DEFAULT_TIME_BUDGET, metavar='SECONDS', help=get_text('cli_help_deadline', lang))
+    parser.add_argument('--max-depth', type=int, default=DEFAULT_MAX_VERSION_DEPTH, metavar='N', help=get_text('cli_help_max_depth', lang))
+    parser.add_argument('--discovery', choices=DISCOVERY_MODES, default=DEFAULT_DISCOVERY,
+                        help=get_text('cli_help_discovery', lang).format(DEFAULT_DISCOVERY))
+    parser.add_argument('--cache', metavar='FILE', help=get_text('cli_help_cache', lang))
+    parser.add_argument('--revalidate', action='store_true', help=get_text('cli_help_revalidate', lang))
+    parser.add_argument('--http2', action='store_true', help=get_text('cli_help_http2', lang))
+    parser.add_argument('--engine', choices=HTTP_ENGINES, default=DEFAULT_HTTP_ENGINE,
+                        help=get_text('cli_help_engine', lang).format(DEFAULT_HTTP_ENGINE))
+    parser.add_argument('--pipeline-depth', type=int, default=DEFAULT_PIPELINE_DEPTH, metavar='N',
+                        help=get_text('cli_help_pipeline_depth', lang).format(DEFAULT_PIPELINE_DEPTH))
+    parser.add_argument('--format', choices=('text', 'json'), default='text', help=get_text('cli_help_format', lang))
+    parser.add_argument('--checkpoint', metavar='FILE', help=get_text('cli_help_checkpoint', lang))
+    parser.add_argument('--resume', action='store_true', help=get_text('cli_help_resume', lang))
+    parser.add_argument('-o', '--output', metavar='FILE', help=get_text('cli_help_output', lang))
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, help=get_text('cli_help_output_format', lang))
+    parser.add_argument('--metrics-listen', metavar='[HOST:]PORT', help=get_text('cli_help_metrics_listen', lang))
+    parser.add_argument('--metrics-file', metavar='FILE', help=get_text('cli_help_metrics_file', lang))
+    parser.add_argument('--metrics-interval', type=float, default=DEFAULT_METRICS_INTERVAL,
+                        help=get_text('cli_help_metrics_interval', lang).format(DEFAULT_METRICS_INTERVAL))
+    parser.add_argument('--workers', type=int, metavar='N', help=get_text('cli_help_workers', lang))
+    parser.add_argument('--queue', metavar='FILE', help=get_text('cli_help_queue', lang))
+    parser.add_argument('--serve-queue', metavar='[HOST:]PORT', help=get_text('cli_help_serve_queue', lang))
+    parser.add_argument('--worker', metavar='QUEUE', help=get_text('cli_help_worker', lang))
+    parser.add_argument('--download', metavar='DIR', help=get_text('cli_help_download', lang))
+    parser.add_argument('--download-connections', type=int, default=DEFAULT_DOWNLOAD_CONNECTIONS, metavar='N',
+                        help=get_text('cli_help_download_connections', lang).format(DEFAULT_DOWNLOAD_CONNECTIONS))
+    parser.add_argument('--download-limit', metavar='RATE', help=get_text('cli_help_download_limit', lang))
+    parser.add_argument('--chunk-size', metavar='SIZE', help=get_text('cli_help_chunk_size', lang))
+    parser.add_argument('--latest', action='store_true', help=get_text('cli_help_latest', lang))
+    parser.add_argument('--watch', action='store_true', help=get_text('cli_help_watch', lang))
+    parser.add_argument('--watch-interval', type=float, default=DEFAULT_WATCH_INTERVAL,
+                        help=get_text('cli_help_watch_interval', lang).format(DEFAULT_WATCH_INTERVAL))
+    parser.add_argument('--watch-state', metavar='FILE', default=DEFAULT_WATCH_STATE_FILE,
+                        help=get_text('cli_help_watch_state', lang).format(DEFAULT_WATCH_STATE_FILE))
+    parser.add_argument('--watch-cycles', type=int, metavar='N', help=get_text('cli_help_watch_cycles', lang))
+    parser.add_argument('--webhook', metavar='URL', help=get_text('cli_help_webhook', lang))
+    parser.add_argument('--exit-on-new', action='store_true', help=get_text('cli_help_exit_on_new', lang))
+    parser.add_argument('--language', choices=tuple(TRANSLATIONS), default=lang, help=get_text('cli_help_language', lang))
+    parser.add_argument('--list-models', action='store_true', help=get_text('cli_help_list_models', lang))
+    return parser
 
-    found_files = []
-    futures = {}
-    total_checks = calculate_total_checks(version_range)
-    if total_checks == 0:
-        print(get_text('no_versions_to_check', lang))
-        return []
-    checks_done = 0
 
-    print(get_text('starting_threaded_search', lang).format(total_checks, max_threads))
+def run_cli(argv):
+    """
+    Einstiegspunkt für die Kommandozeile. Gibt den Exit-Code zurück:
+    0 = Suche durchgeführt, 1 = Abbruch/Fehler während der Suche oder beim Download, 2 = ungültige Argumente,
+    3 = Suche durchgeführt, aber einzelne URLs blieben trotz Wiederholungen ungeklärt,
+    4 = Watch-Modus hat neue Firmware gefunden.
+    """
+    # Sprache vorab bestimmen, damit schon die Hilfetexte übersetzt sind
+    pre_parser = argparse.ArgumentParser(add_help=False)
+    pre_parser.add_argument('--language', choices=tuple(TRANSLATIONS), default=DEFAULT_LANGUAGE)
+    lang = pre_parser.parse_known_args(argv)[0].language
 
-    with ThreadPoolExecutor(max_workers=max_threads) as executor:
-        for url in generate_firmware_urls(base_url, filename_pattern, version_range, lang):
-            future = executor.submit(check_url, url, possible_delays, delay_probability, timeout)
-            futures[future] = url
+    parser = build_arg_parser(lang)
+    args = parser.parse_args(argv)
+
+    if args.list_models:
+        display_kindle_models(KINDLE_MODELS, lang)
+        return 0
+    if args.worker:
+        try:
+            run_shard_worker(args.worker)
+        except KeyboardInterrupt:
+            return 1
+        return 0
+    if not args.model:
+        parser.error(get_text('cli_error_model_required', lang))
+    if args.resume and not args.checkpoint:
+        parser.error(get_text('cli_error_resume_requires_checkpoint', lang))
 
-        for future in as_completed(futures):
-            url = futures[future]
+    overrides = {
+        'language': lang,
+        'search_mode': args.mode,
+        'timeout': args.timeout,
+        'adaptive_concurrency': not args.no_adaptive,
+        'throttle_retries': max(0, args.throttle_retries),
+        'rate_limit': args.rate_limit,
+        'rate_burst': args.burst,
+        'search_strategy': args.strategy,
+        'probe_budget': max(0, args.budget),
+        'time_budget': max(0.0, args.deadline),
+        'max_version_depth': args.max_depth,
+        'discovery': args.discovery,
+        'cache_file': args.cache,
+        'revalidate': args.revalidate,
+        'use_http2': args.http2,
+        'http_engine': args.engine,
+        'pipeline_depth': max(1, args.pipeline_depth),
+        'checkpoint_file': args.checkpoint,
+        'resume': args.resume,
+        'output_file': args.output,
+        'output_format': args.output_format,
+        'metrics_listen': args.metrics_listen,
+        'metrics_file': args.metrics_file,
+        'metrics_interval': args.metrics_interval,
+        'download_dir': args.download,
+        'download_connections': max(1, args.download_connections),
+    }
+    for option, key in ((args.download_limit, 'download_bandwidth'), (args.chunk_size, 'download_chunk_size')):
+        if option is not None:
             try:
-                result = future.result()
-            except Exception as exc:
-                 print(f"\nFehler beim Abrufen des Ergebnisses für {url}: {exc}", file=sys.stderr) # Bleibt Englisch für Debugging
-                 result = None
-
-            checks_done += 1
-            progress = (checks_done / total_checks) * 100 if total_checks > 0 else 100
-
-            if isinstance(result, str): # Gefunden
-                found_files.append(result)
-                if not verbose: sys.stdout.write("\r" + " " * 80 + "\r")
-                print(get_text('found_url', lang).format(url))
-                if not verbose:
-                    sys.stdout.write(get_text('progress_update', lang).format(checks_done, total_checks, progress, len(found_files)))
-                    sys.stdout.flush()
-            elif isinstance(result, int): # Nicht gefunden
-                if verbose:
-                    print(get_text('not_found_url_status', lang).format(url, result))
-                elif not verbose:
-                    sys.stdout.write(get_text('progress_update', lang).format(checks_done, total_checks, progress, len(found_files)))
-                    sys.stdout.flush()
-            elif result is None: # Fehler
-                 if not verbose:
-                    sys.stdout.write(get_text('progress_update', lang).format(checks_done, total_checks, progress, len(found_files)))
-                    sys.stdout.flush()
-            else: # Unerwartet
-                 if not verbose: sys.stdout.write("\r" + " " * 80 + "\r")
-                 print(get_text('error_unexpected_return_type', lang).format(url, type(result)), file=sys.stderr)
-                 if not verbose:
-                    sys.stdout.write(get_text('progress_update', lang).format(checks_done, total_checks, progress, len(found_files)))
-                    sys.stdout.flush()
+                overrides[key] = parse_byte_size(option)
+            except ValueError:
+                parser.error(get_text('error_invalid_size', lang).format(option))
+    if args.concurrency is not None:
+        if args.concurrency < 1:
+            parser.error(get_text('error_concurrency_must_be_positive', lang))
+        overrides['max_threads'] = overrides['max_concurrency'] = args.concurrency
+    if args.timeout <= 0:
+        parser.error(get_text('error_timeout_must_be_positive', lang))
+    if args.max_depth < 3:
+        parser.error(get_text('error_max_depth_min', lang))
+    if args.rate_limit < 0:
+        parser.error(get_text('error_rate_limit_negative', lang))
+    if args.metrics_interval <= 0:
+        parser.error(get_text('error_metrics_interval_positive', lang))
+    distributed = args.workers is not None or args.queue or args.serve_queue
+    if args.workers is not None and args.workers < 0:
+        parser.error(get_text('error_workers_negative', lang))
+    if args.workers == 0 and not args.serve_queue:
+        parser.error(get_text('error_no_workers', lang))
+    if distributed:
+        unsupported = [option for key, option in DISTRIBUTED_UNSUPPORTED_SETTINGS.items() if overrides.get(key)]
+        if unsupported:
+            parser.error(get_text('error_distributed_unsupported', lang).format(", ".join(unsupported)))
+    try:
+        # Modelle/Versionen vorab prüfen: Fehler hier sind Bedienfehler (Exit-Code 2), spätere nicht
+        resolve_search_request(args.model, args.start, args.end, KINDLE_MODELS, lang)
+    except ValueError as e:
+        parser.error(str(e))
 
-    if not verbose:
-        sys.stdout.write("\r" + " " * 80 + "\r")
-    print(get_text('threaded_search_complete', lang))
-    return found_files
+    if args.watch:
+        if args.watch_interval <= 0:
+            parser.error(get_text('error_watch_interval_positive', lang))
+        return _run_watch_cli(args, overrides)
+    if args.latest:
+        return _run_latest_cli(args, overrides)
+
+    start_time = time.time()
+    try:
+        if distributed:
+            workers = os.cpu_count() if args.workers is None else args.workers
+            results = search_firmware_distributed(args.model, args.start, args.end, workers, args.queue, args.serve_queue, **overrides)
+        else:
+            results = search_firmware(args.model, args.start, args.end, **overrides)
+    except KeyboardInterrupt:
+        print(get_text('search_aborted_by_user', lang), file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(get_text('error_unexpected_search', lang).format(e), file=sys.stderr)
+        return 1
+    duration = time.time() - start_time
+
+    if args.format == 'json':
+        print(json.dumps({'duration': round(duration, 3), 'results': results}, indent=2))
+    else:
+        for entry in results:
+            if entry['found']:
+                print(get_text('batch_model_found_count', lang).format(entry['model'], len(entry['found'])).lstrip("\n"))
+                for url in entry['urls']: print(f"- {url}")
+            else:
+                print(get_text('batch_model_none_found', lang).format(entry['model']).lstrip("\n"))
+            if entry['unresolved']:
+                print(get_text('unresolved_model_count', lang).format(entry['model'], len(entry['unresolved'])))
+                for item in entry['unresolved']: print(f"- {item['url']} ({item['error']})")
+            if entry['changed']:
+                print(get_text('changed_model_count', lang).format(entry['model'], len(entry['changed'])))
+                for item in entry['changed']:
+                    print(f"- {item['url']} (ETag {item['old_etag']} -> {item['etag']}, {item['old_size']} -> {item['size']} Bytes)")
+            if entry.get('downloads'):
+                print(get_text('download_model_files', lang).format(entry['model']))
+                for item in entry['downloads']:
+                    print(f"- {item['path']} (SHA-256 {item['sha256']})" if item['sha256'] else f"- {item['url']} ({item['error']})")
+        print(get_text('search_duration', lang).format(duration).lstrip("\n"))
+    if any(item['status'] == 'failed' for entry in results for item in entry.get('downloads', [])):
+        return 1
+    return 3 if any(entry['unresolved'] for entry in results) else 0
+
+
+def _run_watch_cli(args, overrides):
+    """Watch-Modus der Kommandozeile: meldet neue Firmware als Text- oder JSON-Zeilen."""
+    lang = overrides['language']
+
+    def on_new(model_key, filenames, urls):
+        if args.format == 'json':
+            print(json.dumps({'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'model': model_key, 'files': filenames, 'urls': urls}), flush=True)
+        else:
+            for url in urls:
+                print(get_text('watch_new_firmware', lang).format(time.strftime('%Y-%m-%d %H:%M:%S'), model_key, url), flush=True)
+
+    if args.format == 'text':
+        print(get_text('watch_started', lang).format(args.model, args.watch_interval, args.watch_state), flush=True)
+    try:
+        new_files = watch_firmware(args.model, state_file=args.watch_state, interval=args.watch_interval,
+                                   cycles=args.watch_cycles, on_new=on_new, webhook=args.webhook,
+                                   stop_on_new=args.exit_on_new, **overrides)
+    except KeyboardInterrupt:
+        print(get_text('watch_stopped', lang), file=sys.stderr)
+        return 0
+    except Exception as e:
+        print(get_text('error_unexpected_search', lang).format(e), file=sys.stderr)
+        return 1
+    return 4 if new_files else 0
+
+
+def _run_latest_cli(args, overrides):
+    """Neueste Version je Modell (find_latest_firmware) auf der Kommandozeile ausgeben."""
+    lang = overrides['language']
+    start_time = time.time()
+    try:
+        results = find_latest_firmware(args.model, args.start, args.end, **overrides)
+    except KeyboardInterrupt:
+        print(get_text('search_aborted_by_user', lang), file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(get_text('error_unexpected_search', lang).format(e), file=sys.stderr)
+        return 1
+    duration = time.time() - start_time
+
+    if args.format == 'json':
+        print(json.dumps({'duration': round(duration, 3), 'results': results}, indent=2))
+    else:
+        for entry in results:
+            if entry['latest']:
+                print(get_text('latest_model_found', lang).format(entry['model'], entry['url'], entry['probes'], entry['full_checks']))
+            else:
+                print(get_text('latest_model_none_found', lang).format(entry['model'], entry['probes']))
+            if entry['lower_bound']:
+                print(get_text('latest_lower_bound', lang))
+            for item in entry['unresolved']: print(f"- {item['url']} ({item['error']})")
+        print(get_text('search_duration', lang).format(duration).lstrip("\n"))
+    return 3 if any(entry['unresolved'] for entry in results) else 0
 
 
 # --- UI / Menü Funktionen ---
@@ -502,12 +4995,7 @@ def get_version_input(prompt_key, default_version_tuple, lang):
                  print(get_text('using_default_version', lang).format(default_version_str))
                  return default_version_tuple
             try:
-                parsed_version = pkg_version.parse(version_input)
-                version_parts = parsed_version.release[:3]
-                while len(version_parts) < 3: version_parts += (0,)
-                if any(v < 0 for v in version_parts):
-                     raise ValueError(get_text('error_version_negative', lang))
-                return version_parts
+                return parse_version_string(version_input, lang)
             except (ValueError, pkg_version.InvalidVersion) as e:
                 print(get_text('error_version_format', lang).format(e))
         except EOFError:
@@ -518,9 +5006,10 @@ def get_version_input(prompt_key, default_version_tuple, lang):
              sys.exit(0)
 
 
-def get_filename_pattern_simple(example_filename, lang):
+def get_filename_pattern_simple(example_filename, lang, quiet=False):
     """
     Versucht, das Versionsmuster (*) aus einem Beispiel-Dateinamen zu extrahieren.
+    Mit `quiet` wird das abgeleitete Muster nicht ausgegeben (Warnungen schon).
     """
     if not example_filename or '.' not in example_filename:
         print(get_text('warning_pattern_generic', lang).format(example_filename), file=sys.stderr)
@@ -532,7 +5021,7 @@ def get_filename_pattern_simple(example_filename, lang):
         suffix_after_version = match.group(3)
         extension = match.group(4)
         pattern = f"{prefix}*{suffix_after_version}{extension}"
-        print(get_text('derived_pattern_regex', lang).format(pattern))
+        if not quiet: print(get_text('derived_pattern_regex', lang).format(pattern))
         return pattern
     else:
         base, ext = os.path.splitext(example_filename)
@@ -540,7 +5029,7 @@ def get_filename_pattern_simple(example_filename, lang):
         if len(parts) > 1:
             prefix = "_".join(parts[:-1]) + "_"
             pattern = prefix + "*" + ext
-            print(get_text('derived_pattern_fallback', lang).format(pattern))
+            if not quiet: print(get_text('derived_pattern_fallback', lang).format(pattern))
             return pattern
         else:
             print(get_text('warning_pattern_generic', lang).format(example_filename), file=sys.stderr)
@@ -565,7 +5054,12 @@ def start_search(kindle_models, settings):
 
         if kindle_input == "EXIT":
             return
-        elif kindle_input in kindle_models:
+        model_keys = resolve_model_keys(kindle_input, kindle_models)
+        if model_keys is not None and len(model_keys) > 1:
+            run_batch_search(model_keys, kindle_models, settings)
+            continue
+        elif model_keys is not None:
+            kindle_input = model_keys[0]
             selected_model = kindle_models[kindle_input]
             base_url = selected_model.get("base_url")
             example_filename = selected_model.get("example_filename")
@@ -582,7 +5076,15 @@ def start_search(kindle_models, settings):
                 print(get_text('searching_static_title', lang).format(kindle_input))
                 print(get_text('checking_url', lang).format(static_version_filename))
                 full_url = f"{base_url}{static_version_filename}"
-                result = check_url(full_url, settings['possible_delays'], settings['delay_probability'], settings['timeout'])
+                # Über den Ergebnis-Cache: bekannte Datei wird bedingt angefragt, Ersetzungen gemeldet
+                context = SearchContext(dict(settings, checkpoint_file=None))
+                try:
+                    result = probe_outcome(probe_for_search(full_url, context))
+                finally:
+                    context.close()
+                for url, known, probe in context.changed:
+                    print(get_text('changed_summary', lang).format(1))
+                    print(f"- {url} ({describe_change(known, probe)})")
 
                 if isinstance(result, str):
                     print(get_text('found_url', lang).format(full_url))
@@ -596,6 +5098,8 @@ def start_search(kindle_models, settings):
 
             elif example_filename and default_version_range:
                 filename_pattern = get_filename_pattern_simple(example_filename, lang)
+                build_hints = list(selected_model.get("build_hints", [])) + get_build_hints(example_filename)
+                anchors = get_version_anchors(example_filename)
                 print(get_text('searching_dynamic_title', lang).format(kindle_input))
                 start_version = get_version_input('prompt_enter_start_version', default_version_range[0], lang)
                 end_version = get_version_input('prompt_enter_end_version', default_version_range[1], lang)
@@ -608,23 +5112,34 @@ def start_search(kindle_models, settings):
                 print(get_text('search_summary_base_url', lang).format(base_url))
                 print(get_text('search_summary_pattern', lang).format(filename_pattern))
                 print(get_text('search_summary_range', lang).format('.'.join(map(str, start_version)), '.'.join(map(str, end_version))))
-                if settings['use_threads']:
+                if settings['search_mode'] == 'threaded':
                     print(get_text('search_summary_threads', lang).format(get_text('yes', lang), settings['max_threads']))
+                elif settings['search_mode'] == 'async':
+                    print(get_text('search_summary_async', lang).format(settings['max_concurrency'], "HTTP/2" if settings['use_http2'] else "HTTP/1.1"))
                 else:
                     print(get_text('search_summary_threads_no', lang).format(get_text('no', lang)))
                 print(get_text('search_summary_timeout', lang).format(settings['timeout']))
-                print(get_text('search_summary_delay', lang).format(settings['possible_delays'], settings['delay_probability'] * 100))
+                print(get_text('search_summary_rate_limit', lang).format(settings['rate_limit'] or get_text('rate_limit_off', lang)))
+                print(get_text('search_summary_strategy', lang).format(get_text('strategy_' + settings['search_strategy'], lang), calculate_total_checks((start_version, end_version))))
+                hints_str = ", ".join(".".join(map(str, hint)) for hint in build_hints + settings['build_hints'])
+                if settings['max_version_depth'] > 3:
+                    print(get_text('search_summary_build_hints', lang).format(settings['max_version_depth'], hints_str or "-"))
+                elif hints_str:
+                    print(get_text('search_summary_build_hints_only', lang).format(hints_str))
                 print(get_text('search_summary_verbose', lang).format(get_text('yes', lang) if settings['verbose'] else get_text('no', lang)))
                 print("-" * 30)
 
                 version_range_to_search = (start_version, end_version)
                 start_time = time.time()
                 found_firmwares = []
+                # Ohne eigenen Pool: SearchContext legt in jedem Modus einen gemessenen SessionPool an
                 try:
-                    if settings['use_threads']:
-                        found_firmwares = check_firmware_version_threaded(base_url, filename_pattern, version_range_to_search, settings)
+                    if settings['search_mode'] == 'async':
+                        found_firmwares = check_firmware_version_async(base_url, filename_pattern, version_range_to_search, settings, build_hints, anchors)
+                    elif settings['search_mode'] == 'threaded':
+                        found_firmwares = check_firmware_version_threaded(base_url, filename_pattern, version_range_to_search, settings, build_hints=build_hints, anchors=anchors)
                     else:
-                        found_firmwares = check_firmware_version(base_url, filename_pattern, version_range_to_search, settings)
+                        found_firmwares = check_firmware_version(base_url, filename_pattern, version_range_to_search, settings, build_hints=build_hints, anchors=anchors)
                 except KeyboardInterrupt:
                      print(get_text('search_aborted_by_user', lang))
                 except Exception as e:
@@ -650,6 +5165,33 @@ def start_search(kindle_models, settings):
             print("-" * 30)
 
 
+def run_batch_search(model_keys, kindle_models, settings):
+    """Startet die Batch-Suche für mehrere Modelle und gibt die Ergebnisse je Modell aus."""
+    lang = settings['language']
+    print(get_text('batch_summary_title', lang).format(", ".join(model_keys)))
+    print("-" * 30)
+    start_time = time.time()
+    results = {}
+    try:
+        results = check_firmware_batch(model_keys, kindle_models, settings)
+    except KeyboardInterrupt:
+        print(get_text('search_aborted_by_user', lang))
+    except Exception as e:
+        print(get_text('error_unexpected_search', lang).format(e), file=sys.stderr)
+    end_time = time.time()
+    print("-" * 30)
+
+    for model_key, found_firmwares in results.items():
+        if found_firmwares:
+            sorted_firmwares = sort_firmwares_by_version(found_firmwares, lang)
+            print(get_text('batch_model_found_count', lang).format(model_key, len(sorted_firmwares)))
+            for file in sorted_firmwares: print(f"- {file}")
+        else:
+            print(get_text('batch_model_none_found', lang).format(model_key))
+    print(get_text('search_duration', lang).format(end_time - start_time))
+    print("-" * 30)
+
+
 def configure_settings(settings):
     """
     Lässt den Benutzer die Skripteinstellungen ändern.
@@ -660,50 +5202,69 @@ def configure_settings(settings):
 
     while True:
         print(f"\n{get_text('settings_menu_title', lang)}")
-        print(get_text('setting_option_1', lang).format(settings['possible_delays']))
-        print(get_text('setting_option_2', lang).format(settings['delay_probability'] * 100))
-        print(get_text('setting_option_3', lang).format(yes_str if settings['use_threads'] else no_str))
-        if settings['use_threads']:
+        print(get_text('setting_option_1', lang).format(settings['rate_limit'] or get_text('rate_limit_off', lang)))
+        print(get_text('setting_option_2', lang).format(settings['rate_burst'] or get_text('rate_burst_default', lang)))
+        print(get_text('setting_option_3', lang).format(get_text('mode_' + settings['search_mode'], lang)))
+        if settings['search_mode'] == 'threaded':
             print(get_text('setting_option_4_on', lang).format(settings['max_threads']))
+        elif settings['search_mode'] == 'async':
+            print(get_text('setting_option_4_async', lang).format(settings['max_concurrency']))
         else:
              print(get_text('setting_option_4_off', lang))
         print(get_text('setting_option_5', lang).format(settings['timeout']))
         print(get_text('setting_option_6', lang).format(yes_str if settings['verbose'] else no_str))
-        print(get_text('setting_option_7', lang))
+        print(get_text('setting_option_7', lang).format(settings['pool_size']))
+        print(get_text('setting_option_8', lang).format(settings['http_retries']))
+        print(get_text('setting_option_9', lang).format(yes_str if settings['use_http2'] else no_str))
+        print(get_text('setting_option_10', lang).format(get_text('strategy_' + settings['search_strategy'], lang)))
+        print(get_text('setting_option_11', lang).format(settings['cache_file'] or get_text('cache_disabled', lang)))
+        output_state = f"{settings['output_file']} ({output_format_for(settings['output_file'], settings['output_format'])})" if settings['output_file'] else get_text('cache_disabled', lang)
+        print(get_text('setting_option_12', lang).format(output_state))
+        print(get_text('setting_option_13', lang).format(settings['checkpoint_file'] or get_text('cache_disabled', lang)))
+        print(get_text('setting_option_14', lang).format(yes_str if settings['adaptive_concurrency'] else no_str))
+        print(get_text('setting_option_15', lang))
         print("-" * 30)
 
         try:
             choice = input(get_text('prompt_select_setting', lang))
 
             if choice == "1":
-                delays_input = input(get_text('prompt_enter_delays', lang))
+                rate_input = input(get_text('prompt_enter_rate_limit', lang).format(settings['rate_limit']))
                 try:
-                    if not delays_input.strip(): new_delays = []
-                    else: new_delays = [float(delay.strip()) for delay in delays_input.split(",") if delay.strip()]
-                    if not all(delay >= 0 for delay in new_delays): raise ValueError(get_text('error_delays_must_be_positive', lang))
-                    settings['possible_delays'] = new_delays
-                    print(get_text('setting_delays_set', lang).format(settings['possible_delays']))
+                    new_rate = float(rate_input)
+                    if new_rate < 0: raise ValueError(get_text('error_rate_limit_negative', lang))
+                    settings['rate_limit'] = new_rate
+                    print(get_text('setting_rate_limit_set', lang).format(settings['rate_limit'] or get_text('rate_limit_off', lang)))
                 except ValueError as e:
                     print(get_text('error_invalid_delays_format', lang).format(e), file=sys.stderr)
             elif choice == "2":
-                prob_input = input(get_text('prompt_enter_delay_probability', lang))
+                burst_input = input(get_text('prompt_enter_rate_burst', lang).format(settings['rate_burst']))
                 try:
-                    new_prob = float(prob_input)
-                    if not 0 <= new_prob <= 1: raise ValueError(get_text('error_probability_range', lang))
-                    settings['delay_probability'] = new_prob
-                    print(get_text('setting_probability_set', lang).format(settings['delay_probability'] * 100))
+                    new_burst = int(burst_input)
+                    if new_burst < 0: raise ValueError(get_text('error_rate_burst_negative', lang))
+                    settings['rate_burst'] = new_burst
+                    print(get_text('setting_rate_burst_set', lang).format(settings['rate_burst'] or get_text('rate_burst_default', lang)))
                 except ValueError as e:
                     print(get_text('error_invalid_delays_format', lang).format(e), file=sys.stderr)
             elif choice == "3":
-                threads_input = input(get_text('prompt_use_threads', lang)).lower()
-                if threads_input == yes_str.lower():
-                    settings['use_threads'] = True; print(get_text('setting_threads_enabled', lang))
-                elif threads_input == no_str.lower():
-                    settings['use_threads'] = False; print(get_text('setting_threads_disabled', lang))
+                mode_input = input(get_text('prompt_select_search_mode', lang)).strip()
+                if mode_input in ("1", "2", "3"):
+                    settings['search_mode'] = SEARCH_MODES[int(mode_input) - 1]
+                    print(get_text('setting_search_mode_set', lang).format(get_text('mode_' + settings['search_mode'], lang)))
                 else: print(get_text('invalid_input_settings', lang))
             elif choice == "4":
-                if not settings['use_threads']:
+                if settings['search_mode'] == 'sequential':
                     print(get_text('setting_threads_not_relevant', lang)); continue
+                if settings['search_mode'] == 'async':
+                    concurrency_input = input(get_text('prompt_enter_max_concurrency', lang).format(settings['max_concurrency']))
+                    try:
+                        new_max_concurrency = int(concurrency_input)
+                        if new_max_concurrency <= 0: raise ValueError(get_text('error_concurrency_must_be_positive', lang))
+                        settings['max_concurrency'] = new_max_concurrency
+                        print(get_text('setting_max_concurrency_set', lang).format(settings['max_concurrency']))
+                    except ValueError as e:
+                        print(get_text('error_invalid_delays_format', lang).format(e), file=sys.stderr)
+                    continue
                 threads_input = input(get_text('prompt_enter_max_threads', lang).format(settings['max_threads']))
                 try:
                     new_max_threads = int(threads_input)
@@ -729,6 +5290,66 @@ def configure_settings(settings):
                     settings['verbose'] = False; print(get_text('setting_verbose_disabled', lang))
                 else: print(get_text('invalid_input_settings', lang))
             elif choice == "7":
+                pool_input = input(get_text('prompt_enter_pool_size', lang).format(settings['pool_size']))
+                try:
+                    new_pool_size = int(pool_input)
+                    if new_pool_size <= 0: raise ValueError(get_text('error_pool_size_must_be_positive', lang))
+                    settings['pool_size'] = new_pool_size
+                    print(get_text('setting_pool_size_set', lang).format(settings['pool_size']))
+                except ValueError as e:
+                    print(get_text('error_invalid_delays_format', lang).format(e), file=sys.stderr)
+            elif choice == "8":
+                retries_input = input(get_text('prompt_enter_http_retries', lang).format(settings['http_retries']))
+                try:
+                    new_retries = int(retries_input)
+                    if new_retries < 0: raise ValueError(get_text('error_retries_must_be_non_negative', lang))
+                    settings['http_retries'] = new_retries
+                    print(get_text('setting_http_retries_set', lang).format(settings['http_retries']))
+                except ValueError as e:
+                    print(get_text('error_invalid_delays_format', lang).format(e), file=sys.stderr)
+            elif choice == "9":
+                http2_input = input(get_text('prompt_use_http2', lang)).lower()
+                if http2_input == yes_str.lower():
+                    settings['use_http2'] = True; print(get_text('setting_http2_enabled', lang))
+                elif http2_input == no_str.lower():
+                    settings['use_http2'] = False; print(get_text('setting_http2_disabled', lang))
+                else: print(get_text('invalid_input_settings', lang))
+            elif choice == "10":
+                strategy_input = input(get_text('prompt_select_search_strategy', lang)).strip()
+                if strategy_input in ("1", "2", "3"):
+                    settings['search_strategy'] = SEARCH_STRATEGIES[int(strategy_input) - 1]
+                    print(get_text('setting_search_strategy_set', lang).format(get_text('strategy_' + settings['search_strategy'], lang)))
+                else: print(get_text('invalid_input_settings', lang))
+            elif choice == "11":
+                cache_input = input(get_text('prompt_enter_cache_file', lang)).strip()
+                if cache_input:
+                    settings['cache_file'] = cache_input; print(get_text('setting_cache_enabled', lang).format(cache_input))
+                else:
+                    settings['cache_file'] = None; print(get_text('setting_cache_disabled', lang))
+            elif choice == "12":
+                output_input = input(get_text('prompt_enter_output_file', lang)).strip()
+                if output_input:
+                    settings['output_file'] = output_input
+                    settings['output_format'] = None
+                    print(get_text('setting_output_enabled', lang).format(output_input, output_format_for(output_input)))
+                else:
+                    settings['output_file'] = None; print(get_text('setting_output_disabled', lang))
+            elif choice == "13":
+                checkpoint_input = input(get_text('prompt_enter_checkpoint_file', lang)).strip()
+                if checkpoint_input:
+                    settings['checkpoint_file'] = checkpoint_input
+                    settings['resume'] = True # Im Menü wird eine vorhandene Datei immer fortgesetzt
+                    print(get_text('setting_checkpoint_enabled', lang).format(checkpoint_input))
+                else:
+                    settings['checkpoint_file'] = None; print(get_text('setting_checkpoint_disabled', lang))
+            elif choice == "14":
+                adaptive_input = input(get_text('prompt_use_adaptive', lang)).lower()
+                if adaptive_input == yes_str.lower():
+                    settings['adaptive_concurrency'] = True; print(get_text('setting_adaptive_enabled', lang))
+                elif adaptive_input == no_str.lower():
+                    settings['adaptive_concurrency'] = False; print(get_text('setting_adaptive_disabled', lang))
+                else: print(get_text('invalid_input_settings', lang))
+            elif choice == "15":
                 print(get_text('setting_returning_to_main', lang)); break
             else: print(get_text('invalid_input_settings', lang))
         except EOFError:
@@ -767,37 +5388,9 @@ def select_language(settings):
 
 def main():
     """Hauptfunktion des Skripts, die das Menü steuert."""
-    # Kindle Modelldaten mit übersetzten Beschreibungen
-    kindle_models = {
-        "K5": {"description": {"de": "Kindle 5 (Touch)", "en": "Kindle 5 (Touch)"}, "base_url": "https://s3.amazonaws.com/G7G_FirmwareUpdates_WebDownloads/", "example_filename": "update_kindle_5.6.1.1.bin", "default_version_range": ((5, 3, 0), (5, 6, 25))},
-        "K4": {"description": {"de": "Kindle 4 (ohne Touch, Silber/Graphit)", "en": "Kindle 4 (Non-Touch, Silver/Graphite)"}, "base_url": "https://s3.amazonaws.com/firmwareupdates/", "static_version": "update_kindle_4.1.4.bin"},
-        "K4B": {"description": {"de": "Kindle 4 (ohne Touch, Schwarz)", "en": "Kindle 4 (Non-Touch, Black)"}, "base_url": "https://s3.amazonaws.com/firmwareupdates/", "static_version": "update_kindle_4.1.4.bin"},
-        "PW": {"description": {"de": "Kindle Paperwhite 1 (2012)", "en": "Kindle Paperwhite 1 (2012)"}, "base_url": "https://s3.amazonaws.com/G7G_FirmwareUpdates_WebDownloads/", "example_filename": "update_kindle_5.6.1.1.bin", "default_version_range": ((5, 0, 0), (5, 6, 25))},
-        "PW2": {"description": {"de": "Kindle Paperwhite 2 (2013)", "en": "Kindle Paperwhite 2 (2013)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_paperwhite_v2_5.12.2.2.bin", "default_version_range": ((5, 4, 0), (5, 12, 25))},
-        "KT2": {"description": {"de": "Kindle 7 (Basis, 2014)", "en": "Kindle 7 (Basic, 2014)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_5.12.2.2.bin", "default_version_range": ((5, 6, 0), (5, 12, 25))},
-        "KV": {"description": {"de": "Kindle Voyage (2014)", "en": "Kindle Voyage (2014)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "static_version": "update_kindle_voyage_5.13.6.bin"},
-        "PW3": {"description": {"de": "Kindle Paperwhite 3 (2015)", "en": "Kindle Paperwhite 3 (2015)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_paperwhite_5.14.2.bin", "default_version_range": ((5, 7, 0), (5, 15, 25))},
-        "KOA1": {"description": {"de": "Kindle Oasis 1 (2016)", "en": "Kindle Oasis 1 (2016)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_oasis_5.14.2.bin", "default_version_range": ((5, 8, 0), (5, 15, 25))},
-        "KT3": {"description": {"de": "Kindle 8 (Basis, 2016)", "en": "Kindle 8 (Basic, 2016)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_8th_5.14.2.bin", "default_version_range": ((5, 8, 0), (5, 15, 25))},
-        "KOA2": {"description": {"de": "Kindle Oasis 2 (2017)", "en": "Kindle Oasis 2 (2017)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_oasis_5.14.2.bin", "default_version_range": ((5, 9, 0), (5, 16, 25))},
-        "PW4": {"description": {"de": "Kindle Paperwhite 4 (2018)", "en": "Kindle Paperwhite 4 (2018)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_paperwhite_v2_5.14.2.bin", "default_version_range": ((5, 10, 0), (5, 16, 25))},
-        "KT4": {"description": {"de": "Kindle 10 (Basis, 2019)", "en": "Kindle 10 (Basic, 2019)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_10th_5.14.2.bin", "default_version_range": ((5, 11, 0), (5, 16, 25))},
-        "KOA3": {"description": {"de": "Kindle Oasis 3 (2019)", "en": "Kindle Oasis 3 (2019)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_oasis_v2_5.14.2.bin", "default_version_range": ((5, 12, 0), (5, 16, 25))},
-        "PW5": {"description": {"de": "Kindle Paperwhite 5 (11. Gen, 2021)", "en": "Kindle Paperwhite 5 (11th Gen, 2021)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_paperwhite_11th_5.16.8.bin", "default_version_range": ((5, 14, 0), (5, 17, 25))},
-        "PW5SE": {"description": {"de": "Kindle Paperwhite 5 SE (11. Gen, 2021)", "en": "Kindle Paperwhite 5 Signature Edition (11th Gen, 2021)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_all_new_paperwhite_11th_5.16.8.bin", "default_version_range": ((5, 14, 0), (5, 17, 25))},
-        "K11": {"description": {"de": "Kindle 11 (Basis, 2022)", "en": "Kindle 11 (Basic, 2022)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_11th_5.16.8.bin", "default_version_range": ((5, 15, 0), (5, 17, 25))},
-        "Scribe": {"description": {"de": "Kindle Scribe (2022)", "en": "Kindle Scribe (2022)"}, "base_url": "https://s3.amazonaws.com/firmwaredownloads/", "example_filename": "update_kindle_scribe_5.16.8.bin", "default_version_range": ((5, 16, 0), (5, 17, 25))},
-    }
+    kindle_models = KINDLE_MODELS
 
-    settings = {
-        'language': DEFAULT_LANGUAGE, # Starte mit Deutsch
-        'possible_delays': DEFAULT_DELAYS,
-        'use_threads': True,
-        'delay_probability': DEFAULT_DELAY_PROBABILITY,
-        'timeout': DEFAULT_TIMEOUT,
-        'verbose': DEFAULT_VERBOSE,
-        'max_threads': DEFAULT_MAX_THREADS
-    }
+    settings = default_settings()
 
     while True:
         lang = settings['language'] # Aktuelle Sprache für Menü holen
@@ -848,4 +5441,6 @@ if __name__ == "__main__":
         print(get_text('error_library_missing', lang).format(lib_str, pip_str), file=sys.stderr)
         sys.exit(1)
 
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     main()
@@ -0,0 +1,48 @@
+"""
+Gemeinsame Fixtures der Tests: der Checker als Modul und der Mock-S3-Server aus
+benchmarks/ - ohne eine einzige Anfrage an Amazon.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+sys.path.insert(0, BENCHMARK_DIR)
+
+from mock_s3_server import MockS3Server # noqa: E402
+from run_benchmarks import load_checker, mock_models # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def checker():
+    return load_checker()
+
+
+@pytest.fixture
+def s3():
+    """Startet Mock-Server; `s3(existing, **optionen)` gibt den laufenden Server zurück."""
+    servers = []
+
+    def start(existing=(), **options):
+        server = MockS3Server(existing=existing, **options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def settings(checker):
+    """Stille Einstellungen ohne Ratenlimit, Cache und Checkpoint."""
+    return checker.default_settings(language='en', quiet=True, rate_limit=0, discovery='probe', timeout=5)
+
+
+@pytest.fixture
+def models(checker):
+    """`models(server, *keys)`: Modelldefinitionen, deren Basis-URLs auf den Mock-Server zeigen."""
+    return lambda server, *keys: mock_models(checker, keys, server)
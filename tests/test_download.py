@@ -0,0 +1,61 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+NAME = "update_kindle_scribe_5.16.8.bin"
+CHUNK = 64 * 1024
+SIZE = 3 * CHUNK + 100
+
+
+@pytest.fixture
+def download_settings(settings):
+    settings.update(download_chunk_size=CHUNK, download_connections=2)
+    return settings
+
+
+def download(checker, server, directory, settings):
+    (result,) = checker.download_firmware([server.base_url() + NAME], str(directory), settings)
+    return result
+
+
+def test_download_in_chunks(checker, s3, download_settings, tmp_path):
+    server = s3([NAME], file_size=SIZE)
+    result = download(checker, server, tmp_path, download_settings)
+    content = server.httpd.content(NAME)
+    assert result['status'] == 'downloaded'
+    assert result['sha256'] == hashlib.sha256(content).hexdigest()
+    assert (tmp_path / NAME).read_bytes() == content
+    assert not os.path.exists(tmp_path / f"{NAME}.part.json")
+    assert server.stats.requests == 1 + 4 # HEAD und vier Range-Abschnitte
+
+
+def test_resume_loads_only_missing_chunks(checker, s3, download_settings, tmp_path):
+    server = s3([NAME], file_size=SIZE)
+    content = server.httpd.content(NAME)
+    part = tmp_path / f"{NAME}.part"
+    part.write_bytes(content[:2 * CHUNK] + b'\0' * (SIZE - 2 * CHUNK)) # Abbruch nach zwei Abschnitten
+    (tmp_path / f"{NAME}.part.json").write_text(json.dumps({
+        'url': server.base_url() + NAME, 'size': SIZE, 'etag': server.httpd.etag(NAME), 'chunk_size': CHUNK, 'done': [0, 1]}))
+    result = download(checker, server, tmp_path, download_settings)
+    assert result['status'] == 'resumed'
+    assert (tmp_path / NAME).read_bytes() == content
+    assert server.stats.requests == 1 + 2
+
+
+def test_existing_file_is_verified_against_etag(checker, s3, download_settings, tmp_path):
+    server = s3([NAME], file_size=SIZE)
+    target = tmp_path / NAME
+    target.write_bytes(server.httpd.content(NAME))
+    assert download(checker, server, tmp_path, download_settings)['status'] == 'exists'
+    target.write_bytes(b'x' * SIZE) # Gleich groß, aber beschädigt
+    assert download(checker, server, tmp_path, download_settings)['status'] == 'downloaded'
+    assert target.read_bytes() == server.httpd.content(NAME)
+
+
+def test_checksum_mismatch_fails(checker, s3, download_settings, tmp_path):
+    server = s3([NAME], file_size=SIZE, etags={NAME: '"' + '0' * 32 + '"'})
+    result = download(checker, server, tmp_path, download_settings)
+    assert result['status'] == 'failed'
+    assert not os.path.exists(tmp_path / NAME)
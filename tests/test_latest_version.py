@@ -0,0 +1,36 @@
+import pytest
+
+PATTERN = "update_kindle_all_new_paperwhite_11th_{}.bin"
+CATALOGUE = ["5.16.2", "5.16.8", "5.17.0", "5.18.3"]
+
+
+def latest(checker, s3, settings, models, versions):
+    server = s3([PATTERN.format(version) for version in versions])
+    (entry,) = checker.find_latest_firmware('PW5', '5.14.0', '7.99.25', settings=settings,
+                                            kindle_models=models(server, 'PW5'))
+    return entry
+
+
+def test_contiguous_catalogue(checker, s3, settings, models):
+    entry = latest(checker, s3, settings, models, CATALOGUE)
+    assert entry['latest'] == "5.18.3"
+    assert entry['lower_bound']
+    assert entry['probes'] < 72
+
+
+@pytest.mark.parametrize('after_gap', ["5.24.2", "5.34.0", "6.0.3"])
+def test_gap_of_several_minors(checker, s3, settings, models, after_gap):
+    # Regression: Lücken von mehr als LATEST_TOLERANCE Minors beendeten die Suche bei 5.18.3
+    entry = latest(checker, s3, settings, models, CATALOGUE + [after_gap])
+    assert entry['latest'] == after_gap
+    assert entry['probes'] < 100
+    assert entry['probes'] * 20 < entry['full_checks']
+
+
+def test_listing_is_exact(checker, s3, settings, models):
+    server = s3([PATTERN.format(version) for version in CATALOGUE + ["5.40.2"]], listing=True)
+    settings['discovery'] = 'auto'
+    (entry,) = checker.find_latest_firmware('PW5', '5.14.0', '7.99.25', settings=settings,
+                                            kindle_models=models(server, 'PW5'))
+    assert entry['latest'] == "5.40.2"
+    assert not entry['lower_bound']
@@ -0,0 +1,52 @@
+import pytest
+
+PATTERN = "update_kindle_scribe_*.bin"
+VERSION_RANGE = ((5, 16, 0), (5, 17, 25))
+NAMES = ["update_kindle_scribe_5.16.8.bin", "update_kindle_scribe_5.17.1.bin"]
+
+
+@pytest.fixture
+def pipelined(checker, settings, monkeypatch):
+    def unpooled(*args, **kwargs):
+        raise AssertionError("probe_url außerhalb des Pipelining-Pools")
+
+    monkeypatch.setattr(checker, 'probe_url', unpooled)
+    settings.update(http_engine='pipelined', search_mode='threaded')
+    return settings
+
+
+def test_finds_all_files(checker, s3, pipelined):
+    server = s3(NAMES)
+    found = checker.check_firmware_version_threaded(server.base_url(), PATTERN, VERSION_RANGE, pipelined)
+    assert sorted(found) == NAMES
+    assert server.stats.requests == 52
+
+
+def test_follows_redirects_on_pooled_connections(checker, s3, pipelined):
+    target = s3(NAMES)
+    origin = s3(redirect_to=target.base_url())
+    found = checker.check_firmware_version_threaded(origin.base_url(), PATTERN, VERSION_RANGE, pipelined)
+    assert sorted(found) == NAMES
+    assert origin.stats.requests == target.stats.requests == 52
+
+
+def test_redirect_loop_fails(checker, s3, settings):
+    server = s3()
+    server.httpd.redirect_to = server.base_url()
+    pool = checker.PipelinedHeadPool(5)
+    try:
+        (probe,) = pool.probe_many([server.base_url() + NAMES[0]])
+    finally:
+        pool.close()
+    assert probe.error == 'TooManyRedirects'
+    assert server.stats.requests == checker.PIPELINE_MAX_REDIRECTS + 1
+
+
+def test_dropped_connections_are_resent(checker, s3, pipelined):
+    server = s3(NAMES, error_rate=0.2, seed=3)
+    unresolved = {}
+    found = checker.check_firmware_batch(['Scribe'], {'Scribe': {
+        'base_url': server.base_url(), 'example_filename': NAMES[0], 'description': {'en': "", 'de': ""},
+        'default_version_range': VERSION_RANGE}}, pipelined, unresolved=unresolved)
+    assert sorted(found['Scribe']) == NAMES
+    assert unresolved == {'Scribe': []}
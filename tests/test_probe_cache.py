@@ -0,0 +1,60 @@
+import pytest
+
+URL = "https://example.invalid/firmwaredownloads/update_kindle_scribe_5.16.8.bin"
+
+
+def probe(checker, status, url=URL, error=None):
+    return checker.ProbeResult(url, status, '"etag"' if status == 200 else None, 1024 if status == 200 else None, error=error)
+
+
+@pytest.fixture
+def cache(checker, tmp_path):
+    cache = checker.ProbeCache(str(tmp_path / "cache.sqlite"), hit_ttl=100, miss_ttl=10)
+    yield cache
+    cache.close()
+
+
+@pytest.mark.parametrize('status', [200, 403, 404])
+def test_hits_and_misses_are_served(checker, cache, status):
+    cache.store(probe(checker, status))
+    cached = cache.lookup(URL)
+    assert cached.status == status and cached.cached
+    assert cache.served == 1
+
+
+@pytest.mark.parametrize('status', [None, 408, 429, 500, 503])
+def test_transient_answers_are_not_stored(checker, cache, status):
+    cache.store(probe(checker, status, error='ConnectTimeout' if status is None else None))
+    assert cache.lookup(URL) is None
+
+
+def test_hit_and_miss_ttl(checker, cache, monkeypatch):
+    miss_url = URL.replace("5.16.8", "5.16.9")
+    cache.store(probe(checker, 200))
+    cache.store(probe(checker, 403, miss_url))
+    now = checker.time.time()
+    monkeypatch.setattr(checker.time, 'time', lambda: now + 50)
+    assert cache.lookup(URL).status == 200
+    assert cache.lookup(miss_url) is None # Fehlanzeige abgelaufen
+    monkeypatch.setattr(checker.time, 'time', lambda: now + 150)
+    assert cache.lookup(URL) is None
+    assert cache.validators(URL).etag == '"etag"' # Abgelaufener Treffer bleibt Validator
+
+
+def test_not_modified_renews_hit(checker, cache):
+    cache.store(probe(checker, 304))
+    assert cache.lookup(URL).status == 200
+
+
+def test_search_serves_from_cache(checker, s3, settings, tmp_path):
+    server = s3(["update_kindle_scribe_5.16.8.bin"])
+    settings.update(cache_file=str(tmp_path / "cache.sqlite"), search_mode='sequential')
+    version_range = ((5, 16, 0), (5, 16, 25))
+    base_url = server.base_url()
+    pattern = "update_kindle_scribe_*.bin"
+    first = checker.check_firmware_version(base_url, pattern, version_range, settings)
+    requests_first = server.stats.requests
+    second = checker.check_firmware_version(base_url, pattern, version_range, settings)
+    assert first == second == ["update_kindle_scribe_5.16.8.bin"]
+    assert requests_first == 26
+    assert server.stats.requests == requests_first # Treffer und 403 kamen aus dem Cache
@@ -0,0 +1,13 @@
+import pytest
+
+PATTERN = "update_kindle_all_new_paperwhite_11th_*.bin"
+VERSION_RANGE = ((5, 16, 0), (5, 16, 5))
+
+
+@pytest.mark.parametrize('search', ['check_firmware_version', 'check_firmware_version_threaded',
+                                    'check_firmware_version_async'])
+def test_quiet_search_prints_nothing(checker, s3, settings, capsys, search):
+    server = s3([PATTERN.replace('*', "5.16.2")])
+    found = getattr(checker, search)(server.base_url(), PATTERN, VERSION_RANGE, settings)
+    assert found == [PATTERN.replace('*', "5.16.2")]
+    assert capsys.readouterr().out == ""
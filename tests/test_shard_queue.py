@@ -0,0 +1,79 @@
+import pytest
+
+SHARDS = [{'base_url': "http://example.invalid/", 'filename_pattern': "update_kindle_scribe_*.bin",
+           'version_range': [[5, 16, 0], [5, 16, 25]], 'build_hints': [], 'anchors': [], 'models': ['Scribe']},
+          {'base_url': "http://example.invalid/", 'filename_pattern': "update_kindle_scribe_*.bin",
+           'version_range': [[5, 17, 0], [5, 17, 25]], 'build_hints': [], 'anchors': [], 'models': ['Scribe']}]
+
+
+@pytest.fixture
+def queue(checker, tmp_path):
+    queue = checker.ShardQueue(str(tmp_path / "queue.sqlite"), lease=60)
+    queue.prepare("search", SHARDS, checker.default_settings(cache_file="local.sqlite"))
+    yield queue
+    queue.close()
+
+
+def test_claim_complete_and_results(checker, queue):
+    assert 'cache_file' not in queue.settings() # Lokale Einstellungen bleiben beim Koordinator
+    first, second = queue.claim("a"), queue.claim("b")
+    assert (first['id'], second['id']) == (1, 2)
+    assert queue.claim("c") is None
+    queue.complete(first['id'], ["update_kindle_scribe_5.16.8.bin"], [])
+    queue.complete(second['id'], [], [("http://example.invalid/x", 'timeout')])
+    queue.complete(first['id'], ["duplicate.bin"], []) # Zweiter Abschluss wird ignoriert
+    assert queue.status() == (2, 2, 1)
+    found, unresolved = queue.results()
+    assert found == {'Scribe': ["update_kindle_scribe_5.16.8.bin"]}
+    assert unresolved == {'Scribe': [("http://example.invalid/x", 'timeout')]}
+
+
+def test_expired_lease_is_reassigned(checker, queue, monkeypatch):
+    now = checker.time.time()
+    shard = queue.claim("crashed")
+    queue.claim("slow")
+    monkeypatch.setattr(checker.time, 'time', lambda: now + 30)
+    assert queue.claim("other") is None # Leases noch gültig
+    monkeypatch.setattr(checker.time, 'time', lambda: now + 61)
+    reassigned = queue.claim("other")
+    assert reassigned['id'] == shard['id']
+    queue.complete(reassigned['id'], [], [])
+    assert queue.status()[0] == 1
+
+
+def test_prepare_resumes_same_search(checker, queue):
+    queue.complete(queue.claim("a")['id'], [], [])
+    assert queue.prepare("search", SHARDS, {})
+    assert queue.status()[:2] == (1, 2)
+    assert not queue.prepare("other search", SHARDS, {})
+    assert queue.status()[:2] == (0, 2)
+
+
+def test_renew_extends_only_own_lease(checker, queue, monkeypatch):
+    now = checker.time.time()
+    shard, idle = queue.claim("worker"), queue.claim("idle")
+    monkeypatch.setattr(checker.time, 'time', lambda: now + 50)
+    assert queue.renew(shard['id'], "worker")
+    assert not queue.renew(shard['id'], "someone else")
+    monkeypatch.setattr(checker.time, 'time', lambda: now + 70)
+    assert queue.claim("other")['id'] == idle['id'] # Nur der nicht verlängerte Lease ist abgelaufen
+    assert queue.claim("other") is None
+    queue.complete(shard['id'], [], [])
+    assert not queue.renew(shard['id'], "worker")
+
+
+def test_run_shard_sends_heartbeats(checker, s3, settings, monkeypatch):
+    server = s3()
+    monkeypatch.setattr(checker, 'SHARD_RENEW_SECONDS', 0)
+    beats = []
+    shard = dict(SHARDS[0], base_url=server.base_url())
+    assert checker.run_shard(shard, settings, heartbeat=lambda: beats.append(1)) == ([], [])
+    assert len(beats) == 26
+
+
+def test_coordinator_takes_over_without_remote_workers(checker, s3, settings, models, monkeypatch):
+    server = s3(["update_kindle_scribe_5.16.8.bin", "update_kindle_scribe_5.17.1.bin"])
+    monkeypatch.setattr(checker, 'SHARD_LEASE_SECONDS', 0) # Kein entfernter Worker meldet sich
+    (result,) = checker.search_firmware_distributed('Scribe', '5.16.0', '5.17.25', workers=0, serve='127.0.0.1:0',
+                                                    settings=settings, kindle_models=models(server, 'Scribe'))
+    assert result['found'] == ["update_kindle_scribe_5.16.8.bin", "update_kindle_scribe_5.17.1.bin"]
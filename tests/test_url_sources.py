@@ -0,0 +1,79 @@
+import pytest
+
+BASE_URL = "https://example.invalid/firmwaredownloads/"
+PATTERN = "update_kindle_scribe_*.bin"
+
+
+def url(version):
+    return BASE_URL + PATTERN.replace('*', version)
+
+
+def drain(source, existing):
+    """Liefert alle URLs der Quelle und meldet Treffer für `existing` zurück; gibt die Reihenfolge zurück."""
+    issued = []
+    for candidate in source:
+        issued.append(candidate)
+        source.record(candidate, candidate.rsplit('/', 1)[-1] if candidate in existing else 403)
+    return issued
+
+
+def test_pruned_walker_follows_hits_and_skips_empty_minors(checker):
+    walker = checker.PrunedVersionWalker(BASE_URL, PATTERN, ((5, 14, 0), (5, 99, 25)),
+                                         probe_patches=4, max_misses=4, max_empty_minors=3)
+    existing = {url("5.14.1"), url("5.14.5"), url("5.15.2"), url("5.16.8")}
+    issued = drain(walker, existing)
+    assert existing - {url("5.16.8")} <= set(issued) # .8 liegt hinter dem Fenster .0 - .3 einer leeren Minor
+    assert url("5.14.9") in issued and url("5.14.10") not in issued # 4 Fehlanzeigen hinter 5.14.5
+    assert url("5.18.0") in issued and url("5.19.0") not in issued # nach 3 leeren Minors beendet
+    assert len(issued) == walker.probes_issued < 60
+
+
+def test_build_level_expander_expands_hits(checker):
+    version_range = ((5, 16, 0), (5, 16, 25))
+    base = checker.generate_firmware_urls(BASE_URL, PATTERN, version_range, 'en')
+    expander = checker.BuildLevelExpander(base, None, BASE_URL, PATTERN, version_range, [(5, 16, 20)],
+                                          max_build=3, max_depth=5)
+    existing = {url("5.16.2"), url("5.16.2.1"), url("5.16.2.1.3"), url("5.16.20.2")}
+    issued = drain(expander, existing)
+    assert existing <= set(issued)
+    assert url("5.16.2.1.0") in issued and url("5.16.2.0.0") not in issued # nur unter Treffern aufgeklappt
+    assert expander.added_checks == 4 * 4 # 5.16.20 (Hinweis), 5.16.2, 5.16.2.1, 5.16.20.2
+    assert len(issued) == 26 + expander.added_checks
+
+
+def test_build_level_expander_respects_max_depth(checker):
+    version_range = ((5, 16, 0), (5, 16, 25))
+    base = checker.generate_firmware_urls(BASE_URL, PATTERN, version_range, 'en')
+    expander = checker.BuildLevelExpander(base, None, BASE_URL, PATTERN, version_range, [], max_build=3, max_depth=3)
+    assert drain(expander, {url("5.16.2")}) == [url(f"5.16.{patch}") for patch in range(26)]
+
+
+@pytest.mark.parametrize('strategy', ['pruned', 'likely'])
+def test_strategies_find_build_levels_on_mock_server(checker, s3, settings, strategy):
+    names = ["update_kindle_scribe_5.16.2.bin", "update_kindle_scribe_5.16.2.1.bin", "update_kindle_scribe_5.17.0.bin"]
+    server = s3(names)
+    settings.update(search_strategy=strategy, search_mode='threaded', max_version_depth=4)
+    found = checker.check_firmware_version_threaded(server.base_url(), PATTERN, ((5, 16, 0), (5, 17, 25)), settings)
+    assert sorted(found) == sorted(names)
+
+
+def test_batch_source_checks_shared_urls_once(checker):
+    batch = checker.BatchUrlSource()
+    shared = [url(f"5.16.{patch}") for patch in range(4)]
+    batch.add_source('PW5', shared)
+    batch.add_source('PW5SE', shared + [url("5.17.0")])
+    issued = drain(batch, {url("5.16.2")})
+    assert issued == shared + [url("5.17.0")]
+    assert batch.duplicates == 4
+    assert batch.candidates_done == 9
+    assert batch.results == {'PW5': ["update_kindle_scribe_5.16.2.bin"], 'PW5SE': ["update_kindle_scribe_5.16.2.bin"]}
+
+
+def test_batch_search_on_mock_server(checker, s3, settings, models):
+    server = s3(["update_kindle_all_new_paperwhite_11th_5.16.8.bin"])
+    version_range = ((5, 16, 0), (5, 16, 25))
+    found = checker.check_firmware_batch(['PW5', 'PW5SE'], models(server, 'PW5', 'PW5SE'), settings,
+                                         {'PW5': version_range, 'PW5SE': version_range})
+    assert found == {'PW5': ["update_kindle_all_new_paperwhite_11th_5.16.8.bin"],
+                     'PW5SE': ["update_kindle_all_new_paperwhite_11th_5.16.8.bin"]}
+    assert server.stats.requests == 26 # Gemeinsame URLs nur einmal geprüft
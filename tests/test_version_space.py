@@ -0,0 +1,31 @@
+import itertools
+
+
+def test_order_length_and_index(checker):
+    version_range = ((5, 16, 20), (6, 1, 3))
+    space = checker.VersionSpace(version_range)
+    expected = [(major, minor, patch)
+                for major, minor, patch in itertools.product((5, 6), range(checker.MAX_MINOR + 1), range(checker.MAX_PATCH + 1))
+                if version_range[0] <= (major, minor, patch) <= version_range[1]]
+    assert list(space) == expected
+    assert len(space) == len(expected) == checker.calculate_total_checks(version_range)
+    for index in (0, 5, 6, len(expected) // 2, len(expected) - 1):
+        assert space[index] == expected[index]
+        assert space.index(expected[index]) == index
+    assert space[-1] == (6, 1, 3)
+
+
+def test_slices_and_shards_cover_the_space(checker):
+    space = checker.VersionSpace(((5, 14, 0), (5, 17, 25)))
+    assert list(space[30:40]) == list(space)[30:40]
+    shards = space.shards(33)
+    assert [version for shard in shards for version in shard] == list(space)
+    assert all(len(shard) <= 33 for shard in shards)
+
+
+def test_membership_and_empty_range(checker):
+    space = checker.VersionSpace(((5, 16, 0), (5, 17, 25)))
+    assert (5, 16, 8) in space
+    assert (5, 18, 0) not in space
+    assert (5, 16, checker.MAX_PATCH + 1) not in space
+    assert len(checker.VersionSpace(((5, 17, 0), (5, 16, 0)))) == 0